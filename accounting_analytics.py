@@ -0,0 +1,107 @@
+"""
+Accounting Analytics — Columnar Invoice / Expense Metrics
+Loads the invoice and expense lists (accounting_status.json shape) into
+pandas frames once and derives every figure from vectorized group-bys:
+status totals, receivables aging, expense categories and per-client
+exposure. odoo_mcp_bridge (audit) and app.py (dashboard) both call
+summarize(), so the two always agree on a number.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+STATUSES = ["paid", "pending", "overdue", "draft"]
+OPEN_STATUSES = ["pending", "overdue"]
+INVOICE_COLUMNS = ["id", "client", "description", "amount", "status", "issue_date", "due_date", "paid_date"]
+EXPENSE_COLUMNS = ["id", "vendor", "description", "category", "amount", "date", "status"]
+
+# Days past due → bucket; open invoices not yet due are "Not due"
+AGING_BINS = [-np.inf, -1, 30, 60, 90, np.inf]
+AGING_LABELS = ["Not due", "0-30", "31-60", "61-90", "90+"]
+
+
+# ──────────────────────────────────────────────
+# FRAMES
+# ──────────────────────────────────────────────
+def invoice_frame(invoices, today=None):
+    """Invoices as a frame with parsed dates (issued / due / paid), days past
+    due and aging bucket."""
+    today = pd.Timestamp(today or date.today())
+    df = pd.DataFrame(invoices, columns=INVOICE_COLUMNS)
+    df["amount"] = pd.to_numeric(df["amount"], errors="coerce").fillna(0.0)
+    df[["id", "client", "description", "status"]] = df[["id", "client", "description", "status"]].fillna("")
+    for col, parsed in (("issue_date", "issued"), ("due_date", "due"), ("paid_date", "paid")):
+        df[parsed] = pd.to_datetime(df[col], errors="coerce", format="ISO8601")
+    df["days_past_due"] = (today - df["due"]).dt.days
+    is_open = df["status"].isin(OPEN_STATUSES)
+    # An open invoice without a due date ages as "Not due"
+    df["aging"] = pd.cut(df["days_past_due"].fillna(-1), AGING_BINS, labels=AGING_LABELS).where(is_open)
+    return df
+
+
+def expense_frame(expenses):
+    df = pd.DataFrame(expenses, columns=EXPENSE_COLUMNS)
+    df["amount"] = pd.to_numeric(df["amount"], errors="coerce").fillna(0.0)
+    df[["id", "vendor", "description", "status"]] = df[["id", "vendor", "description", "status"]].fillna("")
+    df["category"] = df["category"].fillna("Uncategorized")
+    df["day"] = pd.to_datetime(df["date"], errors="coerce", format="ISO8601")
+    return df
+
+
+# ──────────────────────────────────────────────
+# SUMMARY
+# ──────────────────────────────────────────────
+def client_exposure(inv):
+    """Open receivables per client (outstanding, past due, invoice count,
+    oldest days past due), largest exposure first."""
+    open_inv = inv[inv["status"].isin(OPEN_STATUSES)]
+    return (
+        open_inv.assign(overdue=open_inv["amount"].where(open_inv["days_past_due"] > 0, 0.0))
+        .groupby("client")
+        .agg(outstanding=("amount", "sum"), overdue=("overdue", "sum"),
+             invoices=("id", "count"), oldest_days=("days_past_due", "max"))
+        .sort_values("outstanding", ascending=False)
+    )
+
+
+def past_due(inv):
+    """Open invoices whose due date has passed, whatever their stored status."""
+    return inv[inv["status"].isin(OPEN_STATUSES) & (inv["days_past_due"] > 0)]
+
+
+def summarize(data, today=None):
+    """Every accounting figure the audit and the dashboard show, in one pass
+    over each list. The frames are included for row-level listings."""
+    inv = invoice_frame(data.get("invoices", []), today)
+    exp = expense_frame(data.get("expenses", []))
+
+    by_status = inv.groupby("status")["amount"].agg(["sum", "count"]).reindex(STATUSES, fill_value=0)
+    total_revenue = float(inv["amount"].sum())
+    collected = float(by_status.at["paid", "sum"])
+    pending_total = float(by_status.at["pending", "sum"])
+    overdue_total = float(by_status.at["overdue", "sum"])
+
+    aging = inv.groupby("aging", observed=False)["amount"].sum().reindex(AGING_LABELS, fill_value=0.0)
+    by_category = exp.groupby("category")["amount"].sum().sort_values(ascending=False)
+    expense_total = float(exp["amount"].sum())
+    net_profit = collected - expense_total
+
+    return {
+        "invoices": inv,
+        "expenses": exp,
+        "total_revenue": total_revenue,
+        "collected": collected,
+        "pending_total": pending_total,
+        "overdue_total": overdue_total,
+        "outstanding": pending_total + overdue_total,
+        "counts": {status: int(n) for status, n in by_status["count"].items()},
+        "collection_rate": (collected / total_revenue * 100) if total_revenue > 0 else 0,
+        "aging": {label: float(amount) for label, amount in aging.items()},
+        "clients": client_exposure(inv),
+        "expense_total": expense_total,
+        "by_category": {cat: float(amount) for cat, amount in by_category.items()},
+        "net_profit": net_profit,
+        "profit_margin": (net_profit / collected * 100) if collected > 0 else 0,
+    }
@@ -4,17 +4,24 @@ Scans Readings/ emails and CEO_Briefing for HIGH priority items,
 then creates actionable task files in Needs_Action/ and plans in Plans/.
 """
 
+import json
+import os
 import re
 import sys
 import time
 from pathlib import Path
 from datetime import datetime
 
+import vault_index
+from keyword_matcher import KeywordMatcher
+from vault_record import read_record
+
 BASE_DIR = Path(__file__).resolve().parent
 READINGS_DIR = BASE_DIR / "Readings"
 BRIEFING_FILE = BASE_DIR / "CEO_Briefing_Feb_17.md"
 TASKS_DIR = BASE_DIR / "Needs_Action"
 PLANS_DIR = BASE_DIR / "Plans"
+STATE_FILE = BASE_DIR / ".agent_brain_state.json"
 POLL_INTERVAL = 300  # seconds (5 minutes)
 
 # Suggested actions keyed by lowercase keyword found in subject/summary
@@ -60,14 +67,23 @@ PLAN_TEMPLATES = {
     ],
 }
 
+DEFAULT_ACTION = "Review this item immediately and take appropriate action"
+DEFAULT_PLAN = [
+    "Review the original email and understand the full context",
+    "Identify the key decision or action required",
+    "Gather any additional information needed",
+    "Execute the action or delegate appropriately",
+    "Confirm completion and update the task status",
+]
+
+# Compiled once at startup — table order is match priority
+ACTION_MATCHER = KeywordMatcher(ACTION_HINTS.items())
+PLAN_MATCHER = KeywordMatcher(PLAN_TEMPLATES.items())
+
 
 def get_action_hint(subject, summary):
     """Return a suggested action based on keywords in subject/summary."""
-    text = f"{subject} {summary}".lower()
-    for keyword, action in ACTION_HINTS.items():
-        if keyword in text:
-            return action
-    return "Review this item immediately and take appropriate action"
+    return ACTION_MATCHER.first(f"{subject} {summary}", DEFAULT_ACTION)
 
 
 def parse_briefing_priorities():
@@ -90,30 +106,129 @@ def parse_briefing_priorities():
     return high_items
 
 
+def _parse_email(filepath):
+    rec = read_record(filepath, sections=("Summary",))
+    return {
+        "subject": rec.heading("Email:"),
+        "from": rec.get("From", "Unknown"),
+        "date": rec.get("Date", ""),
+        "summary": rec.first_line("Summary"),
+        "file": filepath.name,
+    }
+
+
 def parse_email_files():
-    """Parse all email markdown files in Readings/ and return a lookup by subject."""
+    """Return a lookup by subject of all Readings/ emails (including per-account sub-folders).
+    Served from the vault index — only new or modified files are re-parsed."""
     emails = {}
-    if not READINGS_DIR.exists():
-        return emails
-
-    for f in READINGS_DIR.glob("EMAIL_*.md"):
-        text = f.read_text(encoding="utf-8")
-        subject_match = re.search(r"^#\s*Email:\s*(.+)", text, re.MULTILINE)
-        sender_match = re.search(r"\*\*From:\*\*\s*(.+)", text)
-        date_match = re.search(r"\*\*Date:\*\*\s*(.+)", text)
-        summary_match = re.search(r"## Summary\n(.+)", text)
-
-        subject = subject_match.group(1).strip() if subject_match else f.stem
-        emails[subject.lower()] = {
-            "subject": subject,
-            "from": sender_match.group(1).strip() if sender_match else "Unknown",
-            "date": date_match.group(1).strip() if date_match else "",
-            "summary": summary_match.group(1).strip() if summary_match else "",
-            "file": f.name,
-        }
+    for _, email in vault_index.load_records(
+        READINGS_DIR, "EMAIL_*.md", _parse_email, "brain_email", recursive=True
+    ):
+        emails[email["subject"].lower()] = email
     return emails
 
 
+# ──────────────────────────────────────────────
+# SUBJECT INDEX (briefing row -> source email)
+# ──────────────────────────────────────────────
+class SubjectIndex:
+    """Resolves a briefing subject to its email without scanning every email.
+
+    A briefing subject matches an email subject when one contains the other
+    (case-insensitive). Containment is answered from two indexes:
+      - subject inside email subject: intersect the trigram posting lists of
+        the subject, rarest first, then verify the few survivors;
+      - email subject inside subject: look up every substring of the subject
+        whose length is a known email-subject length.
+    Both cost depends on the subject's length, not on the number of emails.
+    """
+
+    def __init__(self, emails):
+        self.emails = emails  # lowercase subject -> email detail
+        self._grams = {}
+        self._by_len = {}
+        for key in emails:
+            self._by_len.setdefault(len(key), set()).add(key)
+            for gram in self._trigrams(key):
+                self._grams.setdefault(gram, set()).add(key)
+
+    @staticmethod
+    def _trigrams(text):
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def _containing(self, subject):
+        """Email keys that contain subject."""
+        grams = self._trigrams(subject)
+        if not grams:  # under 3 chars — too short to index, check directly
+            return {key for key in self.emails if subject in key}
+        postings = sorted((self._grams.get(g, set()) for g in grams), key=len)
+        found = set(postings[0])
+        for posting in postings[1:]:
+            if len(found) <= 8:
+                break  # few enough to verify directly
+            found &= posting
+        return {key for key in found if subject in key}
+
+    def _contained(self, subject):
+        """Email keys that are substrings of subject."""
+        found = set()
+        for length, keys in self._by_len.items():
+            for i in range(len(subject) - length + 1):
+                part = subject[i:i + length]
+                if part in keys:
+                    found.add(part)
+        return found
+
+    def candidates(self, subject):
+        """All matching emails, best first: exact, then the closest-length
+        email containing the subject, then emails contained in it."""
+        subject = subject.lower()
+        ranked = []
+        for key in self._containing(subject) | self._contained(subject):
+            kind = 0 if key == subject else (1 if subject in key else 2)
+            ranked.append((kind, abs(len(key) - len(subject)), key))
+        ranked.sort()
+        return [self.emails[key] for _, _, key in ranked]
+
+    def best(self, subject):
+        matches = self.candidates(subject)
+        return matches[0] if matches else None
+
+
+# ──────────────────────────────────────────────
+# SCAN STATE (persisted cursor between cycles)
+# ──────────────────────────────────────────────
+def _file_signature(path):
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_state():
+    """Load the persisted scan state; an unreadable file means a fresh scan."""
+    try:
+        state = json.loads(STATE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        state = {}
+    state.setdefault("briefing", None)
+    state.setdefault("high_items", [])
+    state.setdefault("processed", [])
+    return state
+
+
+def save_state(state, loaded=None):
+    """Write the scan state atomically so a crash never leaves half a file.
+    Skipped when it still equals loaded (a copy of what load_state returned)."""
+    if loaded is not None and state == loaded:
+        return
+    tmp = STATE_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    os.replace(tmp, STATE_FILE)
+
+
 def sanitize_filename(name):
     """Remove characters that are invalid in filenames."""
     return re.sub(r'[<>:"/\\|?*]', '', name).strip().replace(' ', '_')[:80]
@@ -159,17 +274,7 @@ AI has detected this as urgent. Suggested action: {action_hint}
 
 def get_plan_steps(subject):
     """Return a list of plan steps based on subject keywords."""
-    text = subject.lower()
-    for keyword, steps in PLAN_TEMPLATES.items():
-        if keyword in text:
-            return steps
-    return [
-        "Review the original email and understand the full context",
-        "Identify the key decision or action required",
-        "Gather any additional information needed",
-        "Execute the action or delegate appropriately",
-        "Confirm completion and update the task status",
-    ]
+    return PLAN_MATCHER.first(subject, DEFAULT_PLAN)
 
 
 def create_plan_file(item, email_detail):
@@ -231,33 +336,52 @@ def create_plan_file(item, email_detail):
     return filename
 
 
-def run_scan():
-    """Run a single scan cycle."""
+def run_scan(full=False):
+    """Run a single scan cycle.
+
+    Only new or modified inputs are touched: the briefing is re-parsed when
+    its mtime/size changed, and HIGH items already turned into task + plan
+    files are remembered in STATE_FILE so an unchanged vault costs one stat.
+    full=True ignores the saved state (same as --rescan).
+    """
     now = datetime.now().strftime("%H:%M:%S")
     print(f"\n[{now}] Scanning for HIGH priority items...")
 
-    # Step 1: Get high-priority items from CEO Briefing
-    high_items = parse_briefing_priorities()
-    print(f"  [SCAN] Found {len(high_items)} HIGH priority items in CEO Briefing")
+    state = load_state()
+    loaded = json.loads(json.dumps(state))  # to skip the write when nothing changed
+    if full:
+        state.update(briefing=None, high_items=[], processed=[])
+
+    # Step 1: Get high-priority items from CEO Briefing (only if it changed)
+    briefing_sig = _file_signature(BRIEFING_FILE)
+    if briefing_sig != state["briefing"]:
+        state["high_items"] = parse_briefing_priorities()
+        state["briefing"] = briefing_sig
+        # Only subjects still in the briefing need remembering — a dropped one
+        # that comes back finds its task/plan files already there
+        current = {i["subject"].lower() for i in state["high_items"]}
+        state["processed"] = [s for s in state["processed"] if s in current]
+        print(f"  [SCAN] Found {len(state['high_items'])} HIGH priority items in CEO Briefing")
+
+    processed = set(state["processed"])
+    high_items = [i for i in state["high_items"] if i["subject"].lower() not in processed]
 
     if not high_items:
+        save_state(state, loaded)
         print("  [OK] No new high-priority items to process.")
         return 0
 
     # Step 2: Load email details for cross-referencing
     email_lookup = parse_email_files()
+    subject_index = SubjectIndex(email_lookup)
     print(f"  [SCAN] Loaded {len(email_lookup)} emails from Readings/")
 
     # Step 3: Create task files + plan files
     created_tasks = []
     created_plans = []
     for item in high_items:
-        email_detail = None
         subject_lower = item["subject"].lower()
-        for key, val in email_lookup.items():
-            if subject_lower in key or key in subject_lower:
-                email_detail = val
-                break
+        email_detail = subject_index.best(subject_lower)
 
         task_result = create_task_file(item, email_detail)
         if task_result:
@@ -269,6 +393,11 @@ def run_scan():
             created_plans.append(plan_result)
             print(f"  [PLAN]  {plan_result}")
 
+        processed.add(subject_lower)
+
+    state["processed"] = sorted(processed)
+    save_state(state, loaded)
+
     total = len(created_tasks) + len(created_plans)
     if total == 0:
         print("  [OK] All tasks & plans already exist. Nothing new.")
@@ -286,9 +415,12 @@ def main():
     print(f"  Tasks:    {TASKS_DIR}")
     print()
 
+    # Ignore the saved scan state once and re-check every item
+    full = "--rescan" in sys.argv
+
     # Single-run mode
     if "--once" in sys.argv:
-        run_scan()
+        run_scan(full=full)
         print("\nDone (single run).")
         return
 
@@ -296,7 +428,8 @@ def main():
     print(f"[LOOP] Scanning every {POLL_INTERVAL}s (5 min). Press Ctrl+C to stop.\n")
     while True:
         try:
-            run_scan()
+            run_scan(full=full)
+            full = False
         except KeyboardInterrupt:
             print("\n[STOP] Stopped by user.")
             break
@@ -1,7 +1,6 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import json
 import re
 import subprocess
 import threading
@@ -10,10 +9,23 @@ import os
 import sys
 import signal
 import shutil
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 from streamlit_autorefresh import st_autorefresh
 
+import accounting_analytics
+import approval_queue
+import odoo_store
+import receivables
+import supervisor
+import vault_events
+import vault_index
+import vault_json
+import vault_logs
+import whatsapp_sender
+from vault_record import read_record
+
 # Always use the same Python interpreter that is running this script
 _PY = sys.executable
 
@@ -28,9 +40,36 @@ st.set_page_config(
 )
 
 # ──────────────────────────────────────────────
-# AUTO-REFRESH every 30 seconds
+# VAULT CHANGE FEED — rerun only when the vault changes
 # ──────────────────────────────────────────────
-st_autorefresh(interval=30000, key="datarefresh")
+# Sources whose changes warrant a full rerun (logs/ alone does not — the
+# Agent Console refreshes itself in its own fragment)
+RERUN_SOURCES = vault_events.WORKFLOW_DIRS + [vault_events.ROOT_KEY]
+VAULT_POLL_SECONDS = 3
+
+
+@st.cache_resource
+def get_change_feed():
+    """One watchdog/polling feed per server process, shared by all sessions."""
+    return vault_events.VaultChangeFeed().start()
+
+
+_change_feed = get_change_feed()
+vault_gens = _change_feed.generations()
+st.session_state["vault_gens"] = vault_gens
+
+if hasattr(st, "fragment"):
+    @st.fragment(run_every=VAULT_POLL_SECONDS)
+    def _watch_vault():
+        """Tiny fragment tick: compares counters, reruns the app only on change."""
+        seen = st.session_state.get("vault_gens", {})
+        if _change_feed.changed_since(seen, RERUN_SOURCES):
+            st.rerun()
+
+    _watch_vault()
+else:
+    # Older Streamlit without fragments — fall back to the 30s full refresh
+    st_autorefresh(interval=30000, key="datarefresh")
 
 # ──────────────────────────────────────────────
 # CLEAN CSS — Professional SaaS Theme
@@ -442,13 +481,7 @@ COMMANDS_DIR.mkdir(exist_ok=True)
 LOGS_DIR.mkdir(exist_ok=True)
 APPROVED_DIR.mkdir(exist_ok=True)
 
-WATCHERS = {
-    "Gmail Bridge": "watchers/gmail_bridge.py",
-    "Desktop Watcher": "watchers/desktop_watcher.py",
-    "Agent Brain": "agent_brain.py",
-    "Social Media Agent": "social_media_agent.py",
-    "Odoo Bridge": "odoo_mcp_bridge.py",
-}
+WATCHERS = supervisor.WATCHERS  # supervisor.py owns the watcher processes
 
 
 # ──────────────────────────────────────────────
@@ -532,64 +565,282 @@ def _safe_popen(cmd, cwd=None, stdout=None, stderr=None, detach=False):
         )
 
 
-def start_watcher(name, script_path):
-    """Start a background watcher process, redirect output to log file."""
-    full_path = BASE_DIR / script_path
-    if not full_path.exists():
-        st.toast(f"{name}: script not found ({script_path})", icon="\u274c")
-        return
-    # Log the launch event — then close handle before Popen to avoid WinError 87
-    with open(LOG_FILE, "a", encoding="utf-8") as _lf:
-        _lf.write(f"\n[{datetime.now():%Y-%m-%d %H:%M:%S}] Starting {name}...\n")
-    proc = _safe_popen(
-        [_PY, str(full_path)],
-        cwd=str(BASE_DIR),
-    )
-    st.session_state[f"watcher_{name}_pid"] = proc.pid
-    st.session_state[f"watcher_{name}_proc"] = proc
+def ensure_supervisor():
+    """Start supervisor.py in the background if it is not answering yet."""
+    if supervisor.request("ping") is not None:
+        return True
+    _safe_popen([_PY, str(BASE_DIR / "supervisor.py")], cwd=str(BASE_DIR), detach=True)
+    for _ in range(20):
+        time.sleep(0.25)
+        if supervisor.request("ping") is not None:
+            return True
+    return False
+
+
+def watcher_status():
+    """{name: status dict} from the supervisor — {} when it is not running.
+    Only asks over the socket when the state file says a supervisor is alive."""
+    if not supervisor.is_alive():
+        return {}
+    reply = supervisor.request("status")
+    return reply["watchers"] if reply and reply.get("ok") else {}
+
+
+def start_watcher(name):
+    """Ask the supervisor to start (and keep restarting) a watcher."""
+    if not ensure_supervisor():
+        st.toast("Supervisor did not start — see logs/agent_activity.log", icon="\u274c")
+        return False
+    reply = supervisor.request("start", name)
+    if not reply or not reply.get("ok"):
+        st.toast(f"{name}: {reply.get('error') if reply else 'supervisor not responding'}", icon="\u274c")
+        return False
+    return True
 
 
 def stop_watcher(name):
-    """Stop a running watcher process."""
-    proc = st.session_state.get(f"watcher_{name}_proc")
-    if proc:
-        try:
-            proc.terminate()
-            proc.wait(timeout=5)
-        except Exception:
-            # Windows fallback
-            try:
-                pid = st.session_state.get(f"watcher_{name}_pid")
-                if pid:
-                    subprocess.run(["taskkill", "/F", "/PID", str(pid)],
-                                   capture_output=True, timeout=10)
-            except Exception:
-                pass
-    # Clean up log handle
-    log_handle = st.session_state.get(f"watcher_{name}_log")
-    if log_handle:
-        try:
-            log_handle.write(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] Stopped {name}.\n")
-            log_handle.flush()
-            log_handle.close()
-        except Exception:
-            pass
-    for key in [f"watcher_{name}_pid", f"watcher_{name}_proc", f"watcher_{name}_log"]:
-        st.session_state.pop(key, None)
+    """Ask the supervisor to stop a watcher (no restart until started again)."""
+    reply = supervisor.request("stop", name)
+    return bool(reply and reply.get("ok"))
+
+
+def is_watcher_running(name, status=None):
+    """Check if a watcher process is alive (status: a watcher_status() snapshot)."""
+    status = watcher_status() if status is None else status
+    return bool(status.get(name, {}).get("running"))
+
+
+def watcher_caption(info):
+    """One-line pid / CPU / RSS / restart summary for a watcher status dict."""
+    if info.get("running"):
+        parts = [f"pid {info['pid']}"]
+        if info.get("cpu") is not None:
+            parts.append(f"CPU {info['cpu']:.0f}%")
+        if info.get("rss") is not None:
+            parts.append(f"{info['rss'] / 1048576:.0f} MB")
+        if info.get("restarts"):
+            parts.append(f"{info['restarts']} restart(s)")
+        return " · ".join(parts)
+    if info.get("restart_in") is not None:
+        return f"crashed (exit {info['last_exit']}) — restarting in {info['restart_in']}s"
+    return ""
+
 
 
-def is_watcher_running(name):
-    """Check if a watcher process is still alive."""
-    proc = st.session_state.get(f"watcher_{name}_proc")
-    if proc and proc.poll() is None:
+# ──────────────────────────────────────────────
+# BACKGROUND EXECUTOR — Execute All Approved without blocking the UI
+# ──────────────────────────────────────────────
+EXEC_LOG_DIR = LOGS_DIR / "executor"
+EXEC_TAGS = {"[LI]": "linkedin", "[WA]": "whatsapp"}  # browser_pool.py line prefixes
+EXEC_ITEM_RE = re.compile(r"--- (.+) ---\s*$")
+EXEC_DONE_RE = re.compile(r"\[DONE\] (?:(\w+): (\d+) done, (\d+) failed|Batch: (\d+) posted, (\d+) failed)")
+EXEC_SKIPPED_RE = re.compile(r"\[SKIPPED\] (.+)")  # the browser profile was busy — nothing attempted
+EXEC_REFRESH_SECONDS = 2
+
+
+class ChannelProgress:
+    """Live state of one channel (linkedin / whatsapp) inside an executor run."""
+
+    def __init__(self, name, due):
+        self.name = name
+        self.due = due
+        self.state = "running"  # running | done | skipped | failed
+        self.started = 0  # items begun so far
+        self.done = None
+        self.failed = None
+        self.current = ""
+        self.error = ""
+        self.skipped = ""  # reason from a [SKIPPED] line
+        self.lines = deque(maxlen=8)
+
+    def fraction(self):
+        if self.state != "running":
+            return 1.0
+        return min(self.started / self.due, 0.99) if self.due else 0.0
+
+
+class ChannelExecutor:
+    """Runs channel jobs as background subprocesses and collects their progress.
+
+    Each job's output goes to logs/executor/<label>.log; a thread per job
+    tails that file, routes lines to channels and updates ChannelProgress.
+    The Streamlit script only reads snapshots, so the UI never waits on a run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.channels = {}  # name -> ChannelProgress
+        self.started = None
+        self.finished = None
+        self._running = 0  # jobs not yet finished
+
+    def busy(self):
+        return self._running > 0
+
+    def start(self, jobs):
+        """jobs: [(label, cmd, {channel: due}, timeout)] — launched concurrently.
+        Returns False if a run is already in progress."""
+        with self._lock:
+            if self.busy():
+                return False
+            EXEC_LOG_DIR.mkdir(parents=True, exist_ok=True)
+            self.channels = {}
+            self.started, self.finished = datetime.now(), None
+            threads = []
+            for label, cmd, channels, timeout in jobs:
+                progress = {name: ChannelProgress(name, due) for name, due in channels.items()}
+                self.channels.update(progress)
+                t = threading.Thread(target=self._run, args=(label, cmd, progress, timeout),
+                                     daemon=True, name=f"execute_{label}")
+                threads.append(t)
+            self._running = len(threads)
+            for t in threads:
+                t.start()
         return True
-    return False
 
+    def _run(self, label, cmd, progress, timeout):
+        log_path = EXEC_LOG_DIR / f"{label}.log"
+        env = dict(os.environ, PYTHONUNBUFFERED="1")  # stream lines as they happen
+        rc, error = None, ""
+        try:
+            with open(log_path, "w", encoding="utf-8") as out_f:
+                if os.name == "nt":
+                    proc = subprocess.Popen(cmd, cwd=str(BASE_DIR), stdout=out_f, stderr=out_f,
+                                            env=env, creationflags=_CREATE_NEW_CONSOLE)
+                else:
+                    proc = subprocess.Popen(cmd, cwd=str(BASE_DIR), stdout=out_f, stderr=subprocess.STDOUT,
+                                            env=env, start_new_session=True)
+            deadline = time.monotonic() + timeout
+            buf = ""
+            with open(log_path, encoding="utf-8", errors="replace") as f:
+                while True:
+                    finished = proc.poll() is not None
+                    buf += f.read()
+                    *lines, buf = buf.split("\n")
+                    for line in lines:
+                        self._route(line, progress)
+                    if finished:
+                        break
+                    if time.monotonic() > deadline:
+                        proc.terminate()
+                        proc.wait(timeout=10)
+                        error = f"Timed out after {timeout}s"
+                        break
+                    time.sleep(0.5)
+            self._route(buf, progress)
+            rc = proc.returncode
+        except Exception as e:
+            error = str(e)
 
-def load_briefing():
-    if BRIEFING_FILE.exists():
-        return BRIEFING_FILE.read_text(encoding="utf-8")
-    return ""
+        with self._lock:
+            for ch in progress.values():
+                if ch.state != "running":
+                    continue
+                if ch.skipped and not error:
+                    ch.state = "skipped"
+                    continue
+                # Judged by the channel's own [DONE] counts — without them the outcome is unknown
+                ok = not error and ch.done is not None and not ch.failed
+                ch.state = "done" if ok else "failed"
+                if not ok:
+                    reason = error or (f"no [DONE] line (exit code {rc}) — outcome unknown, check the queue"
+                                       if ch.done is None else "")
+                    ch.error = "\n".join([*ch.lines, reason]).strip() or f"exit code {rc}"  # the tail is shown
+            self._running -= 1
+            if not self._running:
+                self.finished = datetime.now()
+
+    def _route(self, line, progress):
+        """Attribute one output line to its channel(s) and update their counters."""
+        line = line.rstrip()
+        if not line.strip():
+            return
+        targets = list(progress.values())
+        for tag, name in EXEC_TAGS.items():
+            if line.startswith(tag) and name in progress:
+                targets = [progress[name]]
+                line = line[len(tag):].strip()
+                break
+        done = EXEC_DONE_RE.search(line)
+        if done and done.group(1) in progress:
+            targets = [progress[done.group(1)]]
+        with self._lock:
+            for ch in targets:
+                ch.lines.append(line)
+                item = EXEC_ITEM_RE.search(line)
+                if item:
+                    ch.started += 1
+                    ch.current = item.group(1)
+                if done:
+                    ch.done = int(done.group(2) or done.group(4))
+                    ch.failed = int(done.group(3) or done.group(5))
+                skipped = EXEC_SKIPPED_RE.search(line)
+                if skipped:
+                    ch.skipped = skipped.group(1)
+
+    def snapshot(self):
+        """Copy of the current run for rendering: (channels, started, finished) or None."""
+        with self._lock:
+            if self.started is None:
+                return None
+            channels = []
+            for ch in self.channels.values():
+                copy = ChannelProgress(ch.name, ch.due)
+                copy.__dict__.update(ch.__dict__, lines=list(ch.lines))
+                channels.append(copy)
+            return channels, self.started, self.finished
+
+    def clear(self):
+        with self._lock:
+            if not self.busy():
+                self.channels, self.started, self.finished = {}, None, None
+
+
+@st.cache_resource
+def get_executor():
+    """One executor per server process — every session sees (and cannot double-start) the same run."""
+    return ChannelExecutor()
+
+
+def render_executor_progress(executor):
+    """Per-channel progress bars for the current / last Execute All Approved run."""
+    run = executor.snapshot()
+    if run is None:
+        return
+    channels, started, finished = run
+    for ch in channels:
+        title = ch.name.title()
+        if ch.state == "running":
+            text = f"{title}: {ch.started}/{ch.due} — {ch.current}" if ch.current else f"{title}: starting..."
+        elif ch.state == "done":
+            text = f"{title}: {ch.done} done" + (f", {ch.failed} failed" if ch.failed else "")
+        elif ch.state == "skipped":
+            text = f"{title}: skipped"
+        else:
+            text = f"{title}: failed"
+        st.progress(ch.fraction(), text=text)
+        if ch.state == "failed":
+            st.error(ch.error[-300:])
+        elif ch.state == "skipped":
+            st.warning(ch.skipped)
+    if finished is None:
+        st.caption(f"Running since {started:%H:%M:%S} — the dashboard stays usable.")
+    else:
+        st.caption(f"Finished at {finished:%H:%M:%S} ({(finished - started).seconds}s)")
+        st.button("Dismiss", key="execute_dismiss_btn", on_click=executor.clear)
+
+
+def _parse_briefing(filepath):
+    text = filepath.read_text(encoding="utf-8")
+    return {"text": text, "inbox": parse_inbox_intelligence(text).to_dict("records")}
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def load_briefing(gen=None):
+    """Return (raw briefing text, Inbox Intelligence DataFrame) from the vault index."""
+    for _, data in vault_index.load_records(BASE_DIR, BRIEFING_FILE.name, _parse_briefing, "briefing"):
+        return data["text"], pd.DataFrame(data["inbox"])
+    return "", pd.DataFrame()
 
 
 def _mock_accounting():
@@ -621,41 +872,57 @@ def _mock_accounting():
     }
 
 
+@st.cache_data(show_spinner=False, max_entries=2)
+def _load_odoo_store(synced, day):
+    """Odoo mirror contents — cached until the bridge records a newer sync
+    (or the date changes, which turns pending invoices overdue)."""
+    return odoo_store.load()
+
+
 def load_accounting():
-    if ACCOUNTING_FILE.exists():
-        try:
-            with open(ACCOUNTING_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            # Validate it has the keys we need; fall back to mock if not
-            if "invoices" in data and "expenses" in data:
-                return data
-        except Exception:
-            pass
+    # Local Odoo mirror first (kept fresh by odoo_mcp_bridge) — never waits on the network
+    synced = odoo_store.last_synced()
+    if synced:
+        data = _load_odoo_store(synced, datetime.now().date().isoformat())
+        if data:
+            return data
+    try:
+        # accounting_status.json / .jsonl — streamed, and only re-parsed when the file changes
+        data = vault_json.load(ACCOUNTING_FILE)
+        # Validate it has the keys we need; fall back to mock if not
+        if data and "invoices" in data and "expenses" in data:
+            return data
+    except Exception:
+        pass
     return _mock_accounting()
 
 
+@st.cache_data(show_spinner=False, max_entries=4)
+def _accounting_figures(key, _accounting):
+    """accounting_analytics summary + receivables report for one state of the
+    data (key: receivables.cache_key). The report is read from the copy
+    odoo_mcp_bridge saved for this sync when there is one."""
+    summary = accounting_analytics.summarize(_accounting)
+    return summary, receivables.cached(_accounting, summary, write=False)
+
+
 def parse_email_file(filepath):
-    text = filepath.read_text(encoding="utf-8")
-    subject = re.search(r"^#\s*Email:\s*(.+)", text, re.MULTILINE)
-    sender = re.search(r"\*\*From:\*\*\s*(.+)", text)
-    date = re.search(r"\*\*Date:\*\*\s*(.+)", text)
-    status = re.search(r"\*\*Status:\*\*\s*(.+)", text)
-    summary = re.search(r"## Summary\n(.+)", text)
+    rec = read_record(filepath, sections=("Summary",))
+    summary = rec.first_line("Summary")
     return {
-        "Subject": subject.group(1).strip() if subject else filepath.stem,
-        "From": sender.group(1).strip() if sender else "Unknown",
-        "Date": date.group(1).strip() if date else "",
-        "Status": status.group(1).strip() if status else "Unknown",
-        "Summary": summary.group(1).strip()[:120] + "..." if summary else "",
+        "Subject": rec.heading("Email:"),
+        "From": rec.get("From", "Unknown"),
+        "Date": rec.get("Date", ""),
+        "Status": rec.get("Status", "Unknown"),
+        "Summary": summary[:120] + "..." if summary else "",
     }
 
 
-def load_emails():
-    emails = []
-    if READINGS_DIR.exists():
-        for f in sorted(READINGS_DIR.glob("EMAIL_*.md")):
-            emails.append(parse_email_file(f))
-    return pd.DataFrame(emails)
+@st.cache_data(show_spinner=False, max_entries=2)
+def load_emails(gen=None):
+    # recursive: multi-account gmail_bridge writes to Readings/<account>/
+    rows = vault_index.load_records(READINGS_DIR, "EMAIL_*.md", parse_email_file, "email", recursive=True)
+    return pd.DataFrame([data for _, data in rows])
 
 
 def parse_inbox_intelligence(briefing_text):
@@ -671,58 +938,82 @@ def parse_inbox_intelligence(briefing_text):
     return pd.DataFrame(rows)
 
 
-def load_kanban_files(directory):
+def _parse_title(filepath):
+    return {"title": read_record(filepath).heading()}
+
+
+@st.cache_data(show_spinner=False, max_entries=6)
+def load_kanban_files(directory, gen=None):
     items = []
-    if not directory.exists():
-        return items
-    for f in sorted(directory.glob("*.md")):
-        if f.name == ".gitkeep":
-            continue
-        text = f.read_text(encoding="utf-8")
-        title_match = re.search(r"^#\s*(.+)", text, re.MULTILINE)
-        title = title_match.group(1).strip() if title_match else f.stem
+    for f, data in vault_index.load_records(directory, "*.md", _parse_title, "kanban", recursive=True):
+        rel = f.relative_to(directory).as_posix()
         tag = ""
-        if f.name.startswith("AI_TASK"):
+        if "/" in rel:
+            tag = "social" if f.name.startswith("SOCIAL") else ""
+        elif f.name.startswith("AI_TASK"):
             tag = "ai"
         elif f.name.startswith("SOCIAL_TASK"):
             tag = "social"
         elif f.name.startswith("ACCT_TASK"):
             tag = "finance"
-        items.append({"title": title, "file": f.name, "tag": tag})
-    for sub in directory.iterdir():
-        if sub.is_dir():
-            for f in sorted(sub.glob("*.md")):
-                if f.name == ".gitkeep":
-                    continue
-                text = f.read_text(encoding="utf-8")
-                title_match = re.search(r"^#\s*(.+)", text, re.MULTILINE)
-                title = title_match.group(1).strip() if title_match else f.stem
-                tag = "social" if f.name.startswith("SOCIAL") else ""
-                items.append({"title": title, "file": f"{sub.name}/{f.name}", "tag": tag})
+        items.append({"title": data["title"], "file": rel, "tag": tag})
     return items
 
 
-def load_plans():
-    plans = []
-    if not PLANS_DIR.exists():
-        return plans
-    for f in sorted(PLANS_DIR.glob("PLAN_*.md")):
-        text = f.read_text(encoding="utf-8")
-        title_match = re.search(r"^#\s*Execution Plan:\s*(.+)", text, re.MULTILINE)
-        sender_match = re.search(r"\*\*Sender:\*\*\s*(.+)", text)
-        status_match = re.search(r"\*\*Status:\*\*\s*(.+)", text)
-        steps = re.findall(r"^\d+\.\s*(.+)", text, re.MULTILINE)
-        plans.append({
-            "title": title_match.group(1).strip() if title_match else f.stem,
-            "sender": sender_match.group(1).strip() if sender_match else "",
-            "status": status_match.group(1).strip() if status_match else "Not Started",
-            "steps": steps[:5],
-            "file": f.name,
-        })
-    return plans
+def _parse_plan(filepath):
+    rec = read_record(filepath, sections=("Step-by-Step Plan",))
+    return {
+        "title": rec.heading("Execution Plan:"),
+        "sender": rec.get("Sender", ""),
+        "status": rec.get("Status", "Not Started"),
+        "steps": rec.steps("Step-by-Step Plan")[:5],
+        "file": filepath.name,
+    }
+
 
+@st.cache_data(show_spinner=False, max_entries=2)
+def load_plans(gen=None):
+    return [data for _, data in vault_index.load_records(PLANS_DIR, "PLAN_*.md", _parse_plan, "plan")]
 
-def load_social_summary():
+
+def _parse_task(filepath):
+    rec = read_record(filepath)
+    return {
+        "title": rec.heading("AI Task:", "ACCT Task:"),
+        "priority": rec.get("Priority", "\u2014"),
+        "sender": rec.get("Sender", "\u2014"),
+        "status": rec.get("Status", "Pending"),
+        "file": filepath.name,
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def load_tasks(gen=None):
+    """Needs_Action/ top-level tasks with priority/sender/status for the WhatsApp hub."""
+    return [data for _, data in vault_index.load_records(NEEDS_ACTION_DIR, "*.md", _parse_task, "task")]
+
+
+def _parse_draft(filepath):
+    rec = read_record(filepath)
+    return {
+        "brand": rec.get("Brand", "\u2014"),
+        "generated": rec.get("Generated", "\u2014"),
+        "status": rec.get("Status", "\u2014"),
+        "mtime": filepath.stat().st_mtime,
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def load_drafts(gen=None):
+    rows = [
+        dict(data, file=f.name, path=f)
+        for f, data in vault_index.load_records(DRAFTS_DIR, "*.md", _parse_draft, "draft")
+    ]
+    return sorted(rows, key=lambda r: r["mtime"], reverse=True)
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def load_social_summary(gen=None):
     path = READINGS_DIR / "Social_Summary.md"
     if path.exists():
         return path.read_text(encoding="utf-8")
@@ -734,16 +1025,17 @@ def fmt_pkr(amount):
 
 
 # ── Load all data ──
-briefing_raw = load_briefing()
+# Each loader is cached on its source's change-feed generation, so a rerun
+# only re-reads the sections whose directories actually changed.
+briefing_raw, df_inbox = load_briefing(vault_gens[vault_events.ROOT_KEY])
 accounting = load_accounting()
-df_emails = load_emails()
-df_inbox = parse_inbox_intelligence(briefing_raw)
+df_emails = load_emails(vault_gens["Readings"])
 
-kanban_todo = load_kanban_files(NEEDS_ACTION_DIR)
-kanban_doing = load_kanban_files(IN_PROGRESS_DIR)
-kanban_done = load_kanban_files(DONE_DIR)
-plans = load_plans()
-social_summary = load_social_summary()
+kanban_todo = load_kanban_files(NEEDS_ACTION_DIR, vault_gens["Needs_Action"])
+kanban_doing = load_kanban_files(IN_PROGRESS_DIR, vault_gens["In_Progress"])
+kanban_done = load_kanban_files(DONE_DIR, vault_gens["Done"])
+plans = load_plans(vault_gens["Plans"])
+social_summary = load_social_summary(vault_gens["Readings"])
 
 total_emails = len(df_emails)
 unread_count = (df_emails["Status"].str.lower() == "unread").sum() if not df_emails.empty else 0
@@ -752,14 +1044,17 @@ high_priority = (df_inbox["Priority"] == "HIGH").sum() if not df_inbox.empty els
 # load_accounting() always returns data (real JSON or inline mock)
 invoices = accounting.get("invoices", [])
 expenses = accounting.get("expenses", [])
-total_invoiced = sum(i["amount"] for i in invoices)
-collected = sum(i["amount"] for i in invoices if i["status"] == "paid")
-total_expenses = sum(e["amount"] for e in expenses)
-net_profit = collected - total_expenses
+# Same figures as the Accounting Audit, computed once per sync (not per render)
+acct, ar = _accounting_figures(receivables.cache_key(accounting), accounting)
+total_invoiced = acct["total_revenue"]
+collected = acct["collected"]
+total_expenses = acct["expense_total"]
+net_profit = acct["net_profit"]
 bank_balance = accounting.get("bank_balance", {}).get("balance", 0)
-overdue_count = sum(1 for i in invoices if i["status"] == "overdue")
-outstanding = sum(i["amount"] for i in invoices if i["status"] in ("pending", "overdue"))
-_data_source = "Live JSON" if ACCOUNTING_FILE.exists() else "Mock Data"
+overdue_count = acct["counts"]["overdue"]
+past_due = ar["past_due"]
+outstanding = acct["outstanding"]
+_data_source = "Odoo" if accounting.get("source", "").startswith("odoo") else "Live JSON" if vault_json.source_path(ACCOUNTING_FILE) else "Mock Data"
 
 # ──────────────────────────────────────────────
 # SIDEBAR — Minimalist
@@ -779,18 +1074,23 @@ with st.sidebar:
 
     # ── Background Watchers ──
     with st.expander("Background Watchers"):
-        for watcher_name, watcher_script in WATCHERS.items():
-            running = is_watcher_running(watcher_name)
+        _wstatus = watcher_status()
+        for watcher_name in WATCHERS:
+            running = is_watcher_running(watcher_name, _wstatus)
             badge = '<span class="status-running">RUNNING</span>' if running else '<span class="status-stopped">STOPPED</span>'
             st.markdown(f'<span class="sb-value" style="font-size:0.76rem;">{watcher_name}</span> {badge}', unsafe_allow_html=True)
+            _winfo = _wstatus.get(watcher_name, {})
+            _wcap = watcher_caption(_winfo)
+            if _wcap:
+                st.caption(_wcap)
             w_col1, w_col2 = st.columns(2)
             with w_col1:
                 if st.button("Start", key=f"start_{watcher_name}", disabled=running, use_container_width=True):
-                    start_watcher(watcher_name, watcher_script)
-                    st.toast(f"{watcher_name} started", icon="\u2705")
+                    if start_watcher(watcher_name):
+                        st.toast(f"{watcher_name} started", icon="\u2705")
                     st.rerun()
             with w_col2:
-                if st.button("Stop", key=f"stop_{watcher_name}", disabled=not running, use_container_width=True):
+                if st.button("Stop", key=f"stop_{watcher_name}", disabled=not (running or _winfo.get("wanted")), use_container_width=True):
                     stop_watcher(watcher_name)
                     st.toast(f"{watcher_name} stopped", icon="\u26d4")
                     st.rerun()
@@ -799,18 +1099,15 @@ with st.sidebar:
         sa_col1, sa_col2 = st.columns(2)
         with sa_col1:
             if st.button("Start All", key="start_all_watchers", use_container_width=True):
-                for wn, ws in WATCHERS.items():
-                    if not is_watcher_running(wn):
-                        start_watcher(wn, ws)
-                st.toast("All watchers started", icon="\u2705")
+                if start_watcher("all"):
+                    st.toast("All watchers started", icon="\u2705")
                 st.rerun()
         with sa_col2:
             if st.button("Stop All", key="stop_all_watchers", use_container_width=True):
-                for wn in WATCHERS:
-                    if is_watcher_running(wn):
-                        stop_watcher(wn)
+                stop_watcher("all")
                 st.toast("All watchers stopped", icon="\u26d4")
                 st.rerun()
+        st.caption("Watchers run under supervisor.py — they survive dashboard restarts and are restarted if they crash.")
 
     # ── Quick Actions ──
     with st.expander("Quick Actions"):
@@ -853,38 +1150,41 @@ with st.sidebar:
 
         st.markdown("---")
 
-        if st.button("Execute All Approved", key="execute_approved_btn", use_container_width=True):
-            with st.spinner("Running LinkedIn poster and WhatsApp sender..."):
-                errors = []
-                try:
-                    rc, out = _safe_run(
-                        [_PY, str(BASE_DIR / "linkedin_poster.py")],
-                        timeout=120,
-                    )
-                    if rc == 0:
-                        st.success("LinkedIn: Post submitted")
-                    else:
-                        errors.append(f"LinkedIn: {out[-300:] if out else 'Unknown error'}")
-                except subprocess.TimeoutExpired:
-                    errors.append("LinkedIn: Timed out after 120s")
-                except Exception as e:
-                    errors.append(f"LinkedIn: {e}")
-                try:
-                    rc, out = _safe_run(
-                        [_PY, str(BASE_DIR / "whatsapp_sender.py")],
-                        timeout=120,
-                    )
-                    if rc == 0:
-                        st.success("WhatsApp: Messages sent")
-                    else:
-                        errors.append(f"WhatsApp: {out[-300:] if out else 'Unknown error'}")
-                except subprocess.TimeoutExpired:
-                    errors.append("WhatsApp: Timed out after 120s")
-                except Exception as e:
-                    errors.append(f"WhatsApp: {e}")
-                for err in errors:
-                    st.error(err)
-            st.toast("Execute All Approved completed", icon="\u2705")
+        _executor = get_executor()
+        if st.button("Execute All Approved", key="execute_approved_btn", use_container_width=True,
+                     disabled=_executor.busy()):
+            _li_due = len(approval_queue.pending("LinkedIn_Post*.md", source=APPROVED_DIR))
+            _wa_due = len(approval_queue.pending("WA_*.md", source=APPROVED_DIR))
+            if not whatsapp_sender.daemon_status():
+                # One shared browser drains both channels concurrently; allow time per job
+                _due = {name: n for name, n in (("linkedin", _li_due), ("whatsapp", _wa_due)) if n}
+                _jobs = [("browser_pool", [_PY, str(BASE_DIR / "browser_pool.py")], _due,
+                          max(150, 90 * _li_due + 30 * _wa_due))] if _due else []
+            else:
+                # The daemon holds the browser profile for its whole lifetime — a
+                # second browser on it can't start, so LinkedIn waits for it to stop
+                _jobs = []
+                st.success("WhatsApp: Sender daemon is delivering approved messages")
+                if _li_due:
+                    st.warning(f"LinkedIn skipped ({_li_due} due): the WhatsApp daemon owns the browser profile. "
+                               "Stop the daemon to post.")
+            if not _jobs:
+                if not _li_due and not _wa_due:
+                    st.info("Nothing approved is due.")
+            elif _executor.start(_jobs):
+                st.toast("Execute All Approved started in the background", icon="\u25b6\ufe0f")
+
+        if _executor.busy() and hasattr(st, "fragment"):
+            @st.fragment(run_every=EXEC_REFRESH_SECONDS)
+            def _execute_progress_live():
+                """Refresh only the progress bars until the run ends, then rerun the app once."""
+                if not _executor.busy():
+                    st.rerun()
+                render_executor_progress(_executor)
+
+            _execute_progress_live()
+        else:
+            render_executor_progress(_executor)
 
         if st.button("Run Full Audit", key="run_audit_btn", use_container_width=True):
             with st.status("Running Odoo Audit...", expanded=True) as status:
@@ -911,7 +1211,7 @@ with st.sidebar:
         if st.button("System Health Check", key="health_check_btn", use_container_width=True):
             with st.status("Running Health Check...", expanded=True) as status:
                 st.write("Checking scripts...")
-                all_scripts = list(WATCHERS.values()) + [
+                all_scripts = [w.split()[0] for w in WATCHERS.values()] + [
                     "linkedin_poster.py", "whatsapp_sender.py",
                     "linkedin_agent.py", "vault_sync.py",
                 ]
@@ -925,8 +1225,9 @@ with st.sidebar:
                         missing.append(s)
 
                 st.write("Checking watchers...")
+                _wstatus = watcher_status()
                 for wn in WATCHERS:
-                    r = is_watcher_running(wn)
+                    r = is_watcher_running(wn, _wstatus)
                     icon = "\u2705" if r else "\u26aa"
                     st.write(f"  {icon} {wn}: {'Running' if r else 'Stopped'}")
 
@@ -967,7 +1268,7 @@ with st.sidebar:
 
     st.markdown('<hr class="sb-divider">', unsafe_allow_html=True)
     st.markdown(
-        f'<p class="sb-footer">Auto-refresh 30s &middot; {datetime.now().strftime("%H:%M:%S")}</p>',
+        f'<p class="sb-footer">Live ({_change_feed.mode}) &middot; {datetime.now().strftime("%H:%M:%S")}</p>',
         unsafe_allow_html=True,
     )
 
@@ -1010,7 +1311,7 @@ st.markdown(f"""
     </div>
 </div>
 """, unsafe_allow_html=True)
-_src_color = "#3FB950" if _data_source == "Live JSON" else "#F0883E"
+_src_color = "#3FB950" if _data_source != "Mock Data" else "#F0883E"
 st.markdown(
     f'<p style="color:{_src_color};font-size:0.62rem;text-align:right;margin:-6px 0 4px;'
     f'letter-spacing:0.04em;">&#9679; Accounting: {_data_source} &middot; '
@@ -1033,18 +1334,39 @@ o5.metric("In Progress", len(kanban_doing))
 # ──────────────────────────────────────────────
 # AGENT CONSOLE — Live Logs
 # ──────────────────────────────────────────────
-st.markdown('<div class="section-header">Agent Console</div>', unsafe_allow_html=True)
-with st.expander("Live Agent Logs", expanded=False):
+@st.cache_data(show_spinner=False, max_entries=2)
+def load_log_tail(gen=None):
+    """Return (last 50 log lines as text, rotated archive names) for one logs/ generation."""
     if LOG_FILE.exists():
         try:
-            log_lines = LOG_FILE.read_text(encoding="utf-8", errors="replace").splitlines()
-            last_50 = log_lines[-50:] if len(log_lines) > 50 else log_lines
-            log_content = "\n".join(last_50)
+            # Seek from the end — cost depends on the 50 lines, not the log size
+            log_content = "\n".join(vault_logs.tail_lines(LOG_FILE, 50))
         except Exception:
             log_content = "Error reading log file."
     else:
         log_content = "No log entries yet. Start a watcher to generate logs."
+    return log_content, [p.name for p in vault_logs.archives(LOG_FILE)]
+
+
+def render_agent_console():
+    log_content, archives = load_log_tail(_change_feed.generations().get("logs"))
     st.markdown(f'<div class="console-log">{log_content}</div>', unsafe_allow_html=True)
+    if archives:
+        st.caption(f"{len(archives)} rotated archive(s) in logs/ ({', '.join(archives)})")
+
+
+st.markdown('<div class="section-header">Agent Console</div>', unsafe_allow_html=True)
+with st.expander("Live Agent Logs", expanded=False):
+    if hasattr(st, "fragment"):
+        # logs/ is not in RERUN_SOURCES — the console refreshes on its own,
+        # re-reading the tail only when the logs generation moved
+        @st.fragment(run_every=VAULT_POLL_SECONDS)
+        def _agent_console_live():
+            render_agent_console()
+
+        _agent_console_live()
+    else:
+        render_agent_console()
     if st.button("Clear Logs", key="clear_logs_btn"):
         try:
             LOG_FILE.write_text("", encoding="utf-8")
@@ -1160,25 +1482,29 @@ with ch_wa:
     )
     if st.button("▶ Run WhatsApp Sender", key="run_wa_sender_btn",
                  use_container_width=True, disabled=not _wa_ready):
-        with st.status("Running WhatsApp Sender...", expanded=True) as _wa_st:
-            st.write("Launching isolated process (opens WhatsApp Web)...")
-            try:
-                _rc, _out = _safe_run(
-                    [_PY, str(BASE_DIR / "whatsapp_sender.py")],
-                    timeout=150,
-                )
-                if _rc == 0:
-                    st.write(_out[-400:] if len(_out) > 400 else (_out or "Done."))
-                    _wa_st.update(label="WhatsApp messages sent!", state="complete")
-                    st.toast("WhatsApp messages sent!", icon="\U0001f4f1")
-                else:
-                    st.write(_out[-300:] if _out else "Unknown error")
-                    _wa_st.update(label="WhatsApp sender failed", state="error")
-            except subprocess.TimeoutExpired:
-                _wa_st.update(label="Timed out after 150s", state="error")
-            except Exception as _e:
-                st.write(str(_e))
-                _wa_st.update(label="Failed", state="error")
+        if whatsapp_sender.daemon_status():
+            # The daemon keeps WhatsApp Web open and sends Approved/ files itself
+            st.success("Sender daemon is running — approved messages are sent as they arrive.")
+        else:
+            with st.status("Running WhatsApp Sender...", expanded=True) as _wa_st:
+                st.write("Launching isolated process (opens WhatsApp Web)...")
+                try:
+                    _rc, _out = _safe_run(
+                        [_PY, str(BASE_DIR / "whatsapp_sender.py")],
+                        timeout=150,
+                    )
+                    if _rc == 0:
+                        st.write(_out[-400:] if len(_out) > 400 else (_out or "Done."))
+                        _wa_st.update(label="WhatsApp messages sent!", state="complete")
+                        st.toast("WhatsApp messages sent!", icon="\U0001f4f1")
+                    else:
+                        st.write(_out[-300:] if _out else "Unknown error")
+                        _wa_st.update(label="WhatsApp sender failed", state="error")
+                except subprocess.TimeoutExpired:
+                    _wa_st.update(label="Timed out after 150s", state="error")
+                except Exception as _e:
+                    st.write(str(_e))
+                    _wa_st.update(label="Failed", state="error")
 
 st.markdown("<br>", unsafe_allow_html=True)
 
@@ -1205,24 +1531,8 @@ with hub_inbox:
 
 with hub_wa:
     st.markdown("**💬 WhatsApp Tasks**")
-    # Scan Needs_Action for WhatsApp/messaging tasks
-    _wa_tasks = []
-    if NEEDS_ACTION_DIR.exists():
-        for _f in sorted(NEEDS_ACTION_DIR.glob("*.md")):
-            if _f.name == ".gitkeep":
-                continue
-            _txt = _f.read_text(encoding="utf-8", errors="replace")
-            _pri_m = re.search(r"\*\*Priority:\*\*\s*(.+)", _txt)
-            _src_m = re.search(r"\*\*Sender:\*\*\s*(.+)", _txt)
-            _stat_m = re.search(r"\*\*Status:\*\*\s*(.+)", _txt)
-            _title_m = re.search(r"^#\s*(?:AI Task:|ACCT Task:)?\s*(.+)", _txt, re.MULTILINE)
-            _wa_tasks.append({
-                "title": _title_m.group(1).strip() if _title_m else _f.stem,
-                "priority": _pri_m.group(1).strip() if _pri_m else "—",
-                "sender": _src_m.group(1).strip() if _src_m else "—",
-                "status": _stat_m.group(1).strip() if _stat_m else "Pending",
-                "file": _f,
-            })
+    # Needs_Action tasks come pre-parsed from the vault index
+    _wa_tasks = load_tasks(vault_gens["Needs_Action"])
 
     if _wa_tasks:
         for _t in _wa_tasks:
@@ -1267,7 +1577,13 @@ with hub_wa:
             f"## Message\n\n{_reply_msg.strip()}\n\n"
             f"---\n*Queued via CEO Dashboard*\n"
         )
-        _msg_file.write_text(_msg_content, encoding="utf-8")
+        # Atomic write — a running sender can never claim a half-written file
+        approval_queue.enqueue(_msg_file.name, _msg_content, source=APPROVED_DIR)
+        if whatsapp_sender.daemon_status():
+            # Warm daemon picks the file up within a couple of seconds — no browser startup
+            st.success(f"WhatsApp reply queued for the sender daemon ({_reply_contact.strip()})")
+            st.toast(f"Reply queued for {_reply_contact.strip()}", icon="\U0001f4f1")
+            st.rerun()
         # Launch sender immediately in isolated process
         try:
             _safe_popen(
@@ -1307,23 +1623,9 @@ with hub_social:
 # ──────────────────────────────────────────────
 st.markdown('<div class="section-header">Draft Management</div>', unsafe_allow_html=True)
 if DRAFTS_DIR.exists():
-    draft_files = sorted(DRAFTS_DIR.glob("*.md"), key=lambda f: f.stat().st_mtime, reverse=True)
-    draft_files = [f for f in draft_files if f.name != ".gitkeep"]
-    if draft_files:
+    all_rows = load_drafts(vault_gens["Drafts"])
+    if all_rows:
         # Summary row
-        all_rows = []
-        for f in draft_files:
-            text = f.read_text(encoding="utf-8")
-            brand_m = re.search(r"\*\*Brand:\*\*\s*(.+)", text)
-            gen_m = re.search(r"\*\*Generated:\*\*\s*(.+)", text)
-            stat_m = re.search(r"\*\*Status:\*\*\s*(.+)", text)
-            all_rows.append({
-                "brand": brand_m.group(1).strip() if brand_m else "\u2014",
-                "generated": gen_m.group(1).strip() if gen_m else "\u2014",
-                "status": stat_m.group(1).strip() if stat_m else "\u2014",
-                "file": f.name,
-                "path": f,
-            })
         posted_count = sum(1 for r in all_rows if r["status"] == "Posted")
         draft_count = sum(1 for r in all_rows if r["status"] == "Draft")
         st.markdown(
@@ -1407,6 +1709,22 @@ if APPROVED_DIR.exists():
             for af in approved_files:
                 st.markdown(f'<div class="card"><div class="card-title">{af.name}</div></div>', unsafe_allow_html=True)
 
+# Jobs that exhausted their send attempts (see approval_queue.py)
+_dead = approval_queue.dead_letters()
+if _dead:
+    with st.expander(f"Dead Letter ({len(_dead)})"):
+        for _di, (_dp, _drec) in enumerate(_dead):
+            st.markdown(
+                f'<div class="card"><div class="card-title">{_dp.name}</div>'
+                f'<div class="card-body">{_drec.get("Attempts", "?")} attempt(s) &middot; '
+                f'{_drec.get("Last-Error", "unknown error")}</div></div>',
+                unsafe_allow_html=True,
+            )
+            if st.button("Requeue", key=f"requeue_dead_{_di}"):
+                approval_queue.requeue(_dp.name)
+                st.toast(f"{_dp.name} returned to Approved/", icon="\u21a9")
+                st.rerun()
+
 # ──────────────────────────────────────────────
 # AI POST CREATOR
 # ──────────────────────────────────────────────
@@ -1586,10 +1904,7 @@ with chart_left:
 with chart_right:
     st.markdown('<div class="section-header">Expense Breakdown</div>', unsafe_allow_html=True)
     if expenses:
-        by_cat = {}
-        for e in expenses:
-            by_cat[e["category"]] = by_cat.get(e["category"], 0) + e["amount"]
-        cat_df = pd.DataFrame(list(by_cat.items()), columns=["Category", "Amount"])
+        cat_df = pd.DataFrame(list(acct["by_category"].items()), columns=["Category", "Amount"])
         cat_df = cat_df.sort_values("Amount", ascending=True)
         fig_exp = px.bar(
             cat_df, x="Amount", y="Category", orientation="h", text="Amount",
@@ -1610,6 +1925,61 @@ with chart_right:
     else:
         st.info("No accounting data.")
 
+# ──────────────────────────────────────────────
+# RECEIVABLES & CASH FLOW
+# ──────────────────────────────────────────────
+st.markdown('<div class="section-header">Receivables &amp; Cash Flow</div>', unsafe_allow_html=True)
+ar_left, ar_right = st.columns(2)
+
+with ar_left:
+    aging_df = pd.DataFrame(list(ar["aging"].items()), columns=["Days Past Due", "Amount"])
+    fig_aging = px.bar(
+        aging_df, x="Days Past Due", y="Amount", text="Amount",
+        color_discrete_sequence=["#8B949E"],
+    )
+    fig_aging.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+        font_color="#8B949E", font_size=11, showlegend=False,
+        xaxis=dict(showgrid=False), yaxis=dict(showgrid=True, gridcolor="#1C2028"),
+        margin=dict(t=10, b=10, l=10, r=10), height=300,
+    )
+    fig_aging.update_traces(
+        texttemplate="PKR %{y:,.0f}", textposition="outside",
+        marker_line_color="#0D1117", marker_line_width=1,
+    )
+    st.plotly_chart(fig_aging, use_container_width=True)
+    _dso = f"{ar['dso']:.0f} days" if ar["dso"] is not None else "—"
+    st.caption(f"DSO ({ar['dso_window']}-day): {_dso} · Past due: {fmt_pkr(past_due)} of {fmt_pkr(ar['outstanding'])}")
+
+with ar_right:
+    proj_df = pd.DataFrame(ar["projection"])
+    fig_cash = px.line(
+        proj_df, x="week", y="balance", markers=True,
+        hover_data={"inflow": ":,.0f", "outflow": ":,.0f", "balance": ":,.0f"},
+        color_discrete_sequence=["#58A6FF"],
+    )
+    fig_cash.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+        font_color="#8B949E", font_size=11, showlegend=False,
+        xaxis=dict(showgrid=False, title=None), yaxis=dict(showgrid=True, gridcolor="#1C2028", title=None),
+        margin=dict(t=10, b=10, l=10, r=10), height=300,
+    )
+    st.plotly_chart(fig_cash, use_container_width=True)
+    st.caption(
+        f"13-week cash projection from {fmt_pkr(ar['opening_balance'])} — open invoices by due date "
+        f"+ client delay, {len(ar['recurring'])} recurring expense(s)"
+    )
+
+if ar["clients"]:
+    with st.expander(f"Client exposure ({len(ar['clients'])})"):
+        st.dataframe(
+            pd.DataFrame(ar["clients"]).rename(columns={
+                "client": "Client", "outstanding": "Outstanding", "overdue": "Past Due",
+                "invoices": "Open", "oldest_days": "Oldest (days)", "dso": "DSO", "avg_delay": "Avg. Days Late",
+            }),
+            hide_index=True, use_container_width=True,
+        )
+
 # ──────────────────────────────────────────────
 # AI STRATEGY
 # ──────────────────────────────────────────────
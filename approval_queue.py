@@ -0,0 +1,341 @@
+"""
+Approval Queue — Claim / Retry / Dead-Letter Layer over Approved/
+Turns the Approved → Done workflow into a job queue that several workers
+(dashboard buttons, watch loops, the WhatsApp daemon) can drain at once
+without double-sending:
+
+  claim     Approved/X  → In_Progress/X   atomic rename; only one worker wins
+  complete  In_Progress/X → Done/X
+  fail      In_Progress/X → Approved/X    with **Attempts:** and a backed-off
+                                           **Next-Attempt:** time, or
+            In_Progress/X → Dead_Letter/X once MAX_ATTEMPTS is reached
+
+Queue state lives in the job file's own header fields, so the folders stay
+plain markdown that the dashboard and Obsidian can show as-is.
+"""
+
+import os
+import re
+import shutil
+import socket
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from vault_record import FIELD_RE, RULE_RE, SECTION_RE, TITLE_RE, read_record
+
+try:
+    import psutil
+except ImportError:  # optional — os.kill(pid, 0) below (POSIX only)
+    psutil = None
+
+BASE_DIR = Path(__file__).resolve().parent
+APPROVED_DIR = BASE_DIR / "Approved"
+IN_PROGRESS_DIR = BASE_DIR / "In_Progress"
+DONE_DIR = BASE_DIR / "Done"
+DEAD_LETTER_DIR = BASE_DIR / "Dead_Letter"
+
+MAX_ATTEMPTS = 5
+RETRY_BASE = 60  # seconds — delay after the first failure, doubled each time
+RETRY_MAX = 3600  # seconds — ceiling for the retry delay
+CLAIM_TIMEOUT = 900  # seconds — a claim older than this belongs to a dead worker
+CLAIMING = ".claiming."  # In_Progress/ name prefix until the claim fields are written
+TIME_FMT = "%Y-%m-%d %H:%M:%S"
+
+
+class Job:
+    """A claimed Approved/ file, now sitting in In_Progress/."""
+
+    __slots__ = ("path", "attempts", "worker")
+
+    def __init__(self, path, attempts=0, worker=None):
+        self.path = Path(path)
+        self.attempts = attempts
+        self.worker = worker
+
+    @property
+    def name(self):
+        return self.path.name
+
+    def __repr__(self):
+        return f"Job({self.name!r}, attempts={self.attempts})"
+
+
+def worker_id():
+    """Identify this process in **Claimed-By:** (host:pid)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def worker_alive(worker):
+    """True / False for a host:pid worker on this machine, None when it can't
+    be told (another host, or Windows without psutil)."""
+    host, _, pid = (worker or "").rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return None
+    if psutil is not None:
+        return psutil.pid_exists(int(pid))
+    if os.name != "posix":
+        return None  # os.kill on Windows terminates the process
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists, owned by another user
+    return True
+
+
+# ──────────────────────────────────────────────
+# HEADER FIELDS
+# ──────────────────────────────────────────────
+def set_fields(path, fields):
+    """Set `**Name:** value` header fields in place (None removes a field).
+
+    Existing fields are rewritten where they stand; new ones are appended to
+    the end of the header block (before the first `---` rule or `## `
+    section), so body parsers that split on `---` are unaffected.
+    """
+    path = Path(path)
+    lines = path.read_text(encoding="utf-8").split("\n")
+    todo = dict(fields)
+    last_header = 0  # index after which new fields go
+    bullet = None  # follow the file's own style: "- **X:**" or "**X:**"
+    out = []
+    in_header = True
+    for i, line in enumerate(lines):
+        if in_header and (RULE_RE.match(line) or SECTION_RE.match(line)):
+            in_header = False
+        if in_header:
+            m = FIELD_RE.match(line)
+            if m and bullet is None:
+                bullet = "- " if line.lstrip().startswith(("-", "*  ", "* ")) else ""
+            if m and m.group(1).strip() in todo:
+                value = todo.pop(m.group(1).strip())
+                if value is not None:
+                    out.append(f"{bullet}**{m.group(1).strip()}:** {value}")
+                    last_header = len(out)
+                continue
+            if m or (i == 0 and TITLE_RE.match(line)):
+                last_header = len(out) + 1
+        out.append(line)
+    bullet = "- " if bullet is None else bullet
+    new = [f"{bullet}**{k}:** {v}" for k, v in todo.items() if v is not None]
+    out[last_header:last_header] = new
+    _atomic_write(path, "\n".join(out))
+
+
+def _atomic_write(path, text):
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=".", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def _parse_time(value):
+    """Parse a header timestamp; **Scheduled:** may also be minute- or day-precision."""
+    for fmt in (TIME_FMT, "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime((value or "").strip(), fmt)
+        except ValueError:
+            continue
+    return None
+
+
+# ──────────────────────────────────────────────
+# PRODUCER SIDE
+# ──────────────────────────────────────────────
+def enqueue(name, content, source=APPROVED_DIR):
+    """Write a new job file atomically, so no worker ever claims it half-written."""
+    source.mkdir(parents=True, exist_ok=True)
+    path = source / name
+    _atomic_write(path, content)
+    return path
+
+
+def requeue(name):
+    """Move a dead-lettered job back to Approved/ with a fresh attempt count."""
+    path = DEAD_LETTER_DIR / name
+    set_fields(path, {"Attempts": None, "Next-Attempt": None, "Last-Error": None, "Claimed": None, "Claimed-By": None})
+    dest = APPROVED_DIR / name
+    os.replace(path, dest)
+    return dest
+
+
+# ──────────────────────────────────────────────
+# WORKER SIDE
+# ──────────────────────────────────────────────
+def is_due(path, now=None):
+    """True unless the file carries a **Next-Attempt:** retry time or a
+    **Scheduled:** publish time that is still in the future."""
+    rec = read_record(path)
+    now = now or datetime.now()
+    for field in ("Next-Attempt", "Scheduled"):
+        at = _parse_time(rec.get(field))
+        if at is not None and at > now:
+            return False
+    return True
+
+
+def pending(pattern="*.md", source=APPROVED_DIR):
+    """Due job files waiting in source, oldest first (nothing is claimed)."""
+    if not source.exists():
+        return []
+    now = datetime.now()
+    files = []
+    for f in source.glob(pattern):
+        try:
+            if f.name != ".gitkeep" and is_due(f, now):
+                files.append((f.stat().st_mtime, f))
+        except OSError:
+            continue  # claimed by another worker while we looked
+    return [f for _, f in sorted(files)]
+
+
+def claim(pattern="*.md", source=APPROVED_DIR, newest_first=False, worker=None):
+    """Claim one due job matching pattern, or return None.
+
+    The rename into In_Progress/ is atomic: if two workers race for the same
+    file, exactly one rename succeeds and the other moves on to the next file.
+    The file keeps a CLAIMING name until its claim fields are written, so a
+    worker dying in between leaves a file recover_stale() can tell apart.
+    """
+    recover_stale()
+    IN_PROGRESS_DIR.mkdir(parents=True, exist_ok=True)
+    worker = worker or worker_id()
+    candidates = pending(pattern, source)
+    if newest_first:
+        candidates.reverse()
+    for f in candidates:
+        dest = IN_PROGRESS_DIR / f.name
+        claiming = IN_PROGRESS_DIR / f"{CLAIMING}{f.name}"
+        if dest.exists() or claiming.exists():
+            continue  # same name already in flight
+        try:
+            os.utime(f)  # the mtime dates a claim until **Claimed:** is written
+            os.rename(f, claiming)
+        except OSError:
+            continue  # lost the race
+        attempts = _attempts(claiming)
+        set_fields(claiming, {"Claimed": datetime.now().strftime(TIME_FMT), "Claimed-By": worker})
+        os.rename(claiming, dest)
+        return Job(dest, attempts, worker)
+    return None
+
+
+def claim_all(pattern="*.md", source=APPROVED_DIR, limit=None, worker=None):
+    """Claim every due job matching pattern (up to limit)."""
+    jobs = []
+    while limit is None or len(jobs) < limit:
+        job = claim(pattern, source, worker=worker)
+        if job is None:
+            break
+        jobs.append(job)
+    return jobs
+
+
+def clear_claim(job):
+    """Drop the queue bookkeeping fields before a job is archived."""
+    set_fields(job.path, {"Claimed": None, "Claimed-By": None, "Next-Attempt": None, "Last-Error": None})
+
+
+def release(job):
+    """Put a claimed job back in Approved/ untouched — it was never attempted,
+    so no attempt is counted and no retry delay is set."""
+    set_fields(job.path, {"Claimed": None, "Claimed-By": None})
+    os.replace(job.path, APPROVED_DIR / job.name)
+    print(f"  [QUEUE] {job.name} released back to Approved/")
+
+
+def complete(job, dest_dir=DONE_DIR):
+    """Finish a job: clear queue bookkeeping and move it to dest_dir."""
+    clear_claim(job)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    dest = dest_dir / job.name
+    shutil.move(str(job.path), str(dest))
+    return dest
+
+
+def fail(job, error, retry=True):
+    """Record a failed attempt. Returns "retry" or "dead".
+
+    Retries go back to Approved/ with an exponentially growing
+    **Next-Attempt:** delay; after MAX_ATTEMPTS (or retry=False for errors
+    that will never succeed, like a malformed file) the job is dead-lettered.
+    """
+    attempts = job.attempts + 1
+    error = " ".join(str(error).split())[:200]
+    if retry and attempts < MAX_ATTEMPTS:
+        delay = min(RETRY_BASE * 2 ** (attempts - 1), RETRY_MAX)
+        next_at = (datetime.now() + timedelta(seconds=delay)).strftime(TIME_FMT)
+        set_fields(job.path, {
+            "Attempts": attempts, "Next-Attempt": next_at, "Last-Error": error,
+            "Claimed": None, "Claimed-By": None,
+        })
+        os.replace(job.path, APPROVED_DIR / job.name)
+        print(f"  [QUEUE] {job.name} failed (attempt {attempts}/{MAX_ATTEMPTS}) — retry at {next_at}")
+        return "retry"
+
+    set_fields(job.path, {
+        "Attempts": attempts, "Next-Attempt": None, "Last-Error": error,
+        "Claimed": None, "Claimed-By": None,
+    })
+    DEAD_LETTER_DIR.mkdir(parents=True, exist_ok=True)
+    os.replace(job.path, DEAD_LETTER_DIR / job.name)
+    print(f"  [QUEUE] {job.name} moved to Dead_Letter/ after {attempts} attempt(s): {error}")
+    return "dead"
+
+
+def recover_stale(timeout=CLAIM_TIMEOUT):
+    """Return jobs whose worker died mid-claim to the queue as a failed attempt.
+
+    A claim is stale when its worker is known to be dead, or — when that
+    can't be checked — once it is older than timeout. Only files carrying a
+    **Claimed:** field (or a CLAIMING name, dated by mtime) are queue jobs;
+    kanban items are left alone.
+    """
+    if not IN_PROGRESS_DIR.exists():
+        return 0
+    cutoff = datetime.now() - timedelta(seconds=timeout)
+    recovered = 0
+    for f in IN_PROGRESS_DIR.glob("*.md"):
+        try:
+            if f.name.startswith(CLAIMING):
+                # the worker died between the rename and writing **Claimed:**
+                if datetime.fromtimestamp(f.stat().st_mtime) > cutoff:
+                    continue
+                dest = IN_PROGRESS_DIR / f.name[len(CLAIMING):]
+                if dest.exists():
+                    continue
+                os.rename(f, dest)
+                f = dest
+                rec = read_record(f)
+            else:
+                rec = read_record(f)
+                claimed = _parse_time(rec.get("Claimed"))
+                if claimed is None:
+                    continue
+                alive = worker_alive(rec.get("Claimed-By"))
+                if alive or (alive is None and claimed > cutoff):
+                    continue
+        except OSError:
+            continue
+        job = Job(f, _attempts(f), rec.get("Claimed-By"))
+        try:
+            fail(job, f"claim by {job.worker} expired")
+            recovered += 1
+        except OSError:
+            continue  # the worker finished after all
+    return recovered
+
+
+def _attempts(path):
+    value = read_record(path).get("Attempts", "0")
+    return int(value) if re.fullmatch(r"\d+", value or "") else 0
+
+
+def dead_letters():
+    """[(Path, VaultRecord)] of dead-lettered jobs, newest first."""
+    if not DEAD_LETTER_DIR.exists():
+        return []
+    files = sorted(DEAD_LETTER_DIR.glob("*.md"), key=os.path.getmtime, reverse=True)
+    return [(f, read_record(f)) for f in files]
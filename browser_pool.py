@@ -0,0 +1,292 @@
+"""
+Browser Pool — Shared Async Chromium for LinkedIn + WhatsApp
+Owns ONE persistent Chromium context on .playwright_profile (the profile both
+channels are logged in with) and hands out a dedicated page per channel,
+guarded by a per-channel lock. LinkedIn posts and WhatsApp sends therefore
+run concurrently in one browser, instead of each script killing Chrome and
+relaunching the profile in turn.
+
+The browser steps themselves (send a message, open the feed, publish a
+post) are the step generators of whatsapp_sender.py / linkedin_poster.py,
+driven here with browser_steps.run_async() — there is no async copy of them.
+
+Usage:
+    python browser_pool.py                    # drain approved LinkedIn + WhatsApp concurrently
+    python browser_pool.py --only linkedin    # one channel only (linkedin | whatsapp)
+"""
+
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:
+    print("[ERROR] playwright not installed. Run: pip install playwright && playwright install chromium")
+    sys.exit(1)
+
+import approval_queue
+import browser_steps
+import linkedin_poster as li
+import whatsapp_sender as wa
+
+PROFILE_DIR = wa.PROFILE_DIR
+CHANNELS = ("linkedin", "whatsapp")
+EXIT_PROFILE_BUSY = browser_steps.EXIT_PROFILE_BUSY  # the WhatsApp daemon (or another sender) holds the profile
+
+
+# ──────────────────────────────────────────────
+# POOL
+# ──────────────────────────────────────────────
+class BrowserPool:
+    """One Chromium instance, one page + lock per channel.
+
+        async with BrowserPool() as pool:
+            async with pool.channel("linkedin") as page:
+                ...
+    """
+
+    def __init__(self, profile_dir=PROFILE_DIR, headless=False):
+        self.profile_dir = profile_dir
+        self.headless = headless
+        self.context = None
+        self._pw = None
+        self._pages = {}
+        self._locks = {}
+
+    async def start(self):
+        # Remove stale lock files that prevent browser from opening
+        for lf in (self.profile_dir / "lockfile", self.profile_dir / "Default" / "LOCK"):
+            try:
+                lf.unlink()
+            except OSError:
+                pass
+        self._pw = await async_playwright().start()
+        self.context = await self._pw.chromium.launch_persistent_context(
+            user_data_dir=str(self.profile_dir),
+            headless=self.headless,
+            args=[
+                "--disable-blink-features=AutomationControlled",
+                "--no-sandbox",
+                "--disable-dev-shm-usage",
+                "--no-first-run",
+                "--no-default-browser-check",
+            ],
+            viewport={"width": 1280, "height": 900},
+            ignore_default_args=["--enable-automation"],
+        )
+        return self
+
+    async def close(self):
+        if self.context is not None:
+            try:
+                await self.context.close()
+            except Exception:
+                pass
+        if self._pw is not None:
+            await self._pw.stop()
+        self.context = self._pw = None
+        self._pages.clear()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def page(self, channel):
+        """The channel's page, (re)created if it was never opened or has crashed."""
+        page = self._pages.get(channel)
+        if page is None or page.is_closed():
+            # The persistent context opens with one blank tab — give it to the first channel
+            blank = [p for p in self.context.pages if p.url == "about:blank" and p not in self._pages.values()]
+            page = blank[0] if blank else await self.context.new_page()
+            self._pages[channel] = page
+        return page
+
+    @asynccontextmanager
+    async def channel(self, name):
+        """Exclusive use of a channel's page; other channels keep running."""
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            yield await self.page(name)
+
+
+# ──────────────────────────────────────────────
+# WHATSAPP
+# ──────────────────────────────────────────────
+async def wa_open(page):
+    """Navigate to WhatsApp Web and wait for the chat list."""
+    for attempt in range(3):
+        try:
+            print(f"[WA] Navigating to WhatsApp Web (attempt {attempt+1}/3)...")
+            await page.goto(wa.WA_URL, timeout=300000, wait_until="domcontentloaded")
+            break
+        except Exception:
+            if attempt == 2:
+                raise
+            await asyncio.sleep(5)
+    await page.wait_for_selector(wa.CHAT_LIST_READY, timeout=300000)
+    await page.locator(wa.SEARCH_BOX).first.wait_for(state="visible", timeout=wa.WAIT_MS["search"])
+    print("[WA] WhatsApp Web loaded.")
+
+
+def _tagged(tag):
+    return lambda message: print(f"{tag} {message}")
+
+
+async def wa_send(page, contact, message, timer):
+    """whatsapp_sender.send_steps() on the pool's WhatsApp page."""
+    await browser_steps.run_async(wa.send_steps(page, contact, message, timer, log=_tagged("[WA]")))
+
+
+async def drain_whatsapp(pool):
+    """Send every due approved WA_*.md on the WhatsApp page. Returns (sent, failed)."""
+    if not approval_queue.pending("WA_*.md", source=wa.APPROVED_DIR):
+        return 0, 0
+    sent = failed = 0
+    timer = wa.StepTimer()
+    async with pool.channel("whatsapp") as page:
+        await wa_open(page)
+        while True:
+            claimed = wa.claim_next()
+            if claimed is None:
+                break
+            job, contact, message = claimed
+            print(f"[WA] --- Sending to: {contact} ({job.name}) ---")
+            try:
+                await wa_send(page, contact, message, timer)
+                wa.archive(job)
+                sent += 1
+            except Exception as e:
+                print(f"[WA] [ERROR] Failed for {contact}: {e}")
+                approval_queue.fail(job, e)
+                failed += 1
+                try:
+                    await page.keyboard.press("Escape")
+                except Exception:
+                    pass
+    timer.summary()
+    return sent, failed
+
+
+# ──────────────────────────────────────────────
+# LINKEDIN
+# ──────────────────────────────────────────────
+async def li_open_feed(page):
+    """linkedin_poster.feed_steps() on the pool's LinkedIn page."""
+    return await browser_steps.run_async(li.feed_steps(page, log=_tagged("[LI]")))
+
+
+async def li_post(page, content, cache):
+    """linkedin_poster.post_steps() on the pool's LinkedIn page."""
+    return await browser_steps.run_async(li.post_steps(page, content, cache, log=_tagged("[LI]")))
+
+
+async def drain_linkedin(pool, limit=None):
+    """Post every due approved LinkedIn_Post*.md on the LinkedIn page. Returns (posted, failed)."""
+    if not approval_queue.pending("LinkedIn_Post*.md", source=li.APPROVED_DIR):
+        return 0, 0
+    posted = failed = 0
+    cache = li.StrategyCache()
+    async with pool.channel("linkedin") as page:
+        while limit is None or posted + failed < limit:
+            job = approval_queue.claim("LinkedIn_Post*.md", source=li.APPROVED_DIR)
+            if job is None:
+                break
+            print(f"[LI] --- {job.name} ---")
+            if li.read_record(job.path).get("Status") == "Posted":
+                approval_queue.complete(job, li.DONE_DIR)
+                continue
+            content = li.extract_post_content(job.path)
+            if not content:
+                approval_queue.fail(job, "draft format unexpected", retry=False)
+                failed += 1
+                continue
+            try:
+                ok = await li_open_feed(page) and await li_post(page, content, cache)
+            except li.PostUncertain as e:
+                print(f"[LI] [ERROR] {e} — the post may be live.")
+                approval_queue.fail(job, f"{e} — check LinkedIn before re-approving", retry=False)
+                failed += 1
+                continue
+            except Exception as e:
+                print(f"[LI] [ERROR] Failed to post: {e}")
+                ok = False
+            if ok:
+                approval_queue.clear_claim(job)
+                li.mark_as_posted(job.path)
+                posted += 1
+            else:
+                approval_queue.fail(job, "LinkedIn post failed")
+                failed += 1
+                if "/login" in page.url or "/checkpoint" in page.url:
+                    break
+    return posted, failed
+
+
+# ──────────────────────────────────────────────
+# EXECUTE ALL APPROVED
+# ──────────────────────────────────────────────
+async def execute_all(channels=CHANNELS):
+    """Drain the selected channels concurrently in one browser.
+    Returns {channel: (done, failed)} — an exception counts as one failure —
+    or None when another script holds the browser profile."""
+    due = {
+        "linkedin": approval_queue.pending("LinkedIn_Post*.md", source=li.APPROVED_DIR),
+        "whatsapp": approval_queue.pending("WA_*.md", source=wa.APPROVED_DIR),
+    }
+    channels = [c for c in channels if due[c]]
+    if not channels:
+        print("[INFO] Nothing approved is due.")
+        return {}
+
+    print(f"[INFO] Due: {', '.join(f'{c} {len(due[c])}' for c in channels)}")
+    drains = {"linkedin": drain_linkedin, "whatsapp": drain_whatsapp}
+    try:
+        with browser_steps.hold_profile("browser_pool"):
+            browser_steps.close_chrome(PROFILE_DIR)  # orphans only — everything below shares one browser
+            async with BrowserPool() as pool:
+                results = await asyncio.gather(*(drains[c](pool) for c in channels), return_exceptions=True)
+    except browser_steps.ProfileBusy as e:
+        print(f"[SKIPPED] {e} — nothing sent.")
+        return None
+
+    summary = {}
+    for c, res in zip(channels, results):
+        if isinstance(res, Exception):
+            print(f"[ERROR] {c}: {res}")
+            res = (0, 1)
+        summary[c] = res
+        print(f"[DONE] {c}: {res[0]} done, {res[1]} failed")
+    return summary
+
+
+def main():
+    print("=" * 50)
+    print("  Browser Pool — Execute All Approved")
+    print("=" * 50)
+    print()
+
+    if wa.daemon_status():
+        print("[INFO] The WhatsApp daemon holds the browser profile — not starting a second browser.")
+        sys.exit(EXIT_PROFILE_BUSY)
+
+    channels = CHANNELS
+    if "--only" in sys.argv:
+        try:
+            channels = (sys.argv[sys.argv.index("--only") + 1],)
+        except IndexError:
+            channels = ()
+        if not channels or channels[0] not in CHANNELS:
+            print(f"[ERROR] --only needs one of: {', '.join(CHANNELS)}")
+            sys.exit(2)
+
+    summary = asyncio.run(execute_all(channels))
+    if summary is None:
+        sys.exit(EXIT_PROFILE_BUSY)
+    sys.exit(1 if any(failed for _, failed in summary.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
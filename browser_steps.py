@@ -0,0 +1,167 @@
+"""
+Browser Steps — One Implementation for Sync and Async Playwright
+The WhatsApp send and LinkedIn post steps are written once, as generators
+that yield each Playwright call:
+
+    def send_steps(page, ...):
+        yield page.locator(BOX).first.click(timeout=5000)
+        text = yield page.evaluate(JS)
+
+run() drives such a generator with a sync page (the call already ran; its
+result is sent back), run_async() with an async page (the yielded coroutine
+is awaited, and its result or exception is sent / thrown back in). So
+whatsapp_sender / linkedin_poster (sync) and browser_pool (async) execute
+the same steps, and a fix to one is a fix to both.
+
+Also owns the shared .playwright_profile: every script that launches a
+browser on it holds it via hold_profile(), and close_chrome() only kills
+Chromium processes left on that profile — never the user's own Chrome, nor
+a browser another live script is using.
+"""
+
+import inspect
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import approval_queue
+
+try:
+    import psutil
+except ImportError:  # optional — pkill / PowerShell below
+    psutil = None
+
+BASE_DIR = Path(__file__).resolve().parent
+PROFILE_DIR = BASE_DIR / ".playwright_profile"  # logged in to WhatsApp Web and LinkedIn
+OWNER_FILE = BASE_DIR / ".playwright_profile.owner.json"  # who has a browser on the profile
+EXIT_PROFILE_BUSY = 3  # exit code of a script that skipped its work because the profile was busy
+
+
+# ──────────────────────────────────────────────
+# STEP RUNNERS
+# ──────────────────────────────────────────────
+def run(steps):
+    """Drive a step generator against a sync Playwright page. Returns its result."""
+    value = None
+    while True:
+        try:
+            value = steps.send(value)
+        except StopIteration as stop:
+            return stop.value
+
+
+async def run_async(steps):
+    """Drive a step generator against an async Playwright page. Returns its result."""
+    value, error = None, None
+    while True:
+        try:
+            op = steps.throw(error) if error is not None else steps.send(value)
+        except StopIteration as stop:
+            return stop.value
+        value, error = None, None
+        try:
+            value = (await op) if inspect.isawaitable(op) else op
+        except Exception as e:
+            error = e
+
+
+# ──────────────────────────────────────────────
+# PROFILE OWNERSHIP
+# ──────────────────────────────────────────────
+class ProfileBusy(Exception):
+    """Another live script has a browser open on the profile."""
+
+
+def profile_owner():
+    """{"name", "worker", "since"} of the script holding the profile, or None."""
+    try:
+        owner = json.loads(OWNER_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    # a holder that can't be checked (another host, Windows without psutil) counts as alive
+    if approval_queue.worker_alive(owner.get("worker")) is False:
+        return None
+    return owner
+
+
+@contextmanager
+def hold_profile(name):
+    """Hold the profile for this process while the block runs. Raises
+    ProfileBusy if another live script holds it; a dead holder's claim is taken over."""
+    me = {"name": name, "worker": approval_queue.worker_id(), "since": datetime.now().isoformat(timespec="seconds")}
+    for _ in range(2):
+        try:
+            fd = os.open(str(OWNER_FILE), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            owner = profile_owner()
+            if owner is not None:
+                raise ProfileBusy(f"{owner.get('name')} ({owner.get('worker')}) is using the browser profile "
+                                  f"since {owner.get('since')}") from None
+            OWNER_FILE.unlink(missing_ok=True)  # left by a dead holder
+            continue
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(me, f)
+        break
+    else:
+        raise ProfileBusy("the browser profile was claimed by another script just now")
+    try:
+        yield
+    finally:
+        try:
+            if json.loads(OWNER_FILE.read_text(encoding="utf-8")).get("worker") == me["worker"]:
+                OWNER_FILE.unlink()
+        except (OSError, ValueError):
+            pass
+
+
+def _windows_profile_pids(marker):
+    """Pids of Chrome/Chromium processes whose command line contains marker,
+    read through PowerShell (no psutil). [] if they can't be read."""
+    quoted = marker.replace("'", "''")
+    script = ("Get-CimInstance Win32_Process -Filter \"Name='chrome.exe' OR Name='chromium.exe'\" | "
+              f"Where-Object {{ $_.CommandLine -and $_.CommandLine.Contains('{quoted}') }} | "
+              "ForEach-Object { $_.ProcessId }")
+    try:
+        result = subprocess.run(["powershell", "-NoProfile", "-NonInteractive", "-Command", script],
+                                capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return []
+    if result.returncode != 0:
+        return []
+    return [int(line) for line in result.stdout.split() if line.isdigit()]
+
+
+def close_chrome(profile_dir=PROFILE_DIR):
+    """Kill Chromium processes still running on profile_dir (they keep its lock).
+    Call while holding the profile — anything left on it is then an orphan."""
+    marker = str(Path(profile_dir))
+    killed = False
+    try:
+        if psutil is not None:
+            for proc in psutil.process_iter(["name", "cmdline"]):
+                cmdline = " ".join(proc.info.get("cmdline") or [])
+                if "chrom" in (proc.info.get("name") or "").lower() and marker in cmdline:
+                    try:
+                        proc.kill()
+                        killed = True
+                    except psutil.Error:
+                        pass
+        elif sys.platform == "win32":
+            # command lines come from WMI; if they can't be read, nothing is killed
+            for pid in _windows_profile_pids(marker):
+                result = subprocess.run(["taskkill", "/F", "/PID", str(pid)], capture_output=True, text=True)
+                killed = killed or result.returncode == 0
+        else:
+            result = subprocess.run(["pkill", "-f", re.escape(marker)], capture_output=True)
+            killed = result.returncode == 0
+    except Exception:
+        pass
+    if killed:
+        print("[INFO] Closed Chromium left on the browser profile to free its lock...")
+        time.sleep(2)  # wait for profile lock to release
@@ -0,0 +1,90 @@
+"""
+Keyword Matcher — Shared Multi-Pattern Keyword Engine
+Compiles a priority-ordered keyword table into an Aho-Corasick automaton
+once at startup, then finds the highest-priority keyword contained in a
+text in a single pass — cost grows with the text, not with the table.
+Matching is case-insensitive substring matching, the same semantics as the
+`keyword in text.lower()` loops it replaces.
+
+Used by agent_brain (ACTION_HINTS / PLAN_TEMPLATES) and social_media_agent
+(response suggestions).
+"""
+
+from collections import deque
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over (keyword, value) entries.
+
+    Entries are given in priority order: when several keywords occur in a
+    text, the value of the one listed first wins, wherever it appears.
+    """
+
+    def __init__(self, entries):
+        self._goto = [{}]      # state -> {char: next state}
+        self._fail = [0]       # state -> failure link
+        self._out = [[]]       # state -> [(priority, value)] ending here, best first
+        self.size = 0
+
+        for priority, (keyword, value) in enumerate(entries):
+            keyword = keyword.lower()
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            if not self._out[state]:  # duplicate keyword — first entry wins
+                self._out[state].append((priority, value))
+                self.size += 1
+
+        # Breadth-first pass: failure links + inherit outputs of suffixes
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = sorted(self._out[nxt] + self._out[self._fail[nxt]], key=lambda o: o[0])
+
+    def _scan(self, text):
+        """Yield the output list of every state reached while reading text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text.lower():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                yield out[state]
+
+    def first(self, text, default=None):
+        """Value of the highest-priority keyword found in text, else default."""
+        best = None
+        for hits in self._scan(text):
+            if best is None or hits[0][0] < best[0]:
+                best = hits[0]
+                if best[0] == 0:
+                    break  # nothing can outrank the first entry
+        return best[1] if best is not None else default
+
+    def find_all(self, text):
+        """Values of every keyword found in text, in priority order (deduplicated)."""
+        found = {}
+        for hits in self._scan(text):
+            for priority, value in hits:
+                found.setdefault(priority, value)
+        return [found[p] for p in sorted(found)]
+
+    def __len__(self):
+        return self.size
@@ -6,6 +6,8 @@ Usage:
     python linkedin_poster.py                      # post latest draft
     python linkedin_poster.py Drafts/specific.md   # post a specific draft
     python linkedin_poster.py --login              # open browser for manual login
+    python linkedin_poster.py --batch [--limit N]  # post every due approved draft in one session
+    python linkedin_poster.py --strategy-stats     # selector strategy hit rates
 
 Requirements:
     pip install playwright && playwright install chromium
@@ -20,16 +22,22 @@ Notes:
 import sys
 import io
 import glob
+import json
 import os
 import re
-import subprocess
 import time
 from pathlib import Path
 
+import approval_queue
+import browser_steps
+from vault_record import read_record
+
 # Force UTF-8 stdout/stderr on Windows to handle emojis in post content
-if sys.stdout and hasattr(sys.stdout, "buffer"):
+# (skipped when already UTF-8, e.g. when imported by browser_pool: re-wrapping
+# would close the previous wrapper's buffer)
+if sys.stdout and hasattr(sys.stdout, "buffer") and (sys.stdout.encoding or "").lower() != "utf-8":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
-if sys.stderr and hasattr(sys.stderr, "buffer"):
+if sys.stderr and hasattr(sys.stderr, "buffer") and (sys.stderr.encoding or "").lower() != "utf-8":
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
 
 try:
@@ -42,25 +50,13 @@ BASE_DIR = Path(__file__).resolve().parent
 DRAFTS_DIR = BASE_DIR / "Drafts"
 APPROVED_DIR = BASE_DIR / "Approved"
 DONE_DIR = BASE_DIR / "Done"
-PLAYWRIGHT_PROFILE = BASE_DIR / ".playwright_profile"
+PLAYWRIGHT_PROFILE = browser_steps.PROFILE_DIR
+STRATEGY_FILE = BASE_DIR / ".linkedin_strategies.json"  # learned selector order + hit stats
 
 APPROVED_DIR.mkdir(exist_ok=True)
 DONE_DIR.mkdir(exist_ok=True)
 
 
-def close_chrome():
-    """Close all Chrome processes to avoid profile lock conflicts."""
-    result = subprocess.run(
-        ["tasklist", "/FI", "IMAGENAME eq chrome.exe"],
-        capture_output=True, text=True,
-    )
-    if "chrome.exe" not in result.stdout:
-        return
-    print("[INFO] Chrome is running — closing it to avoid profile conflicts...")
-    subprocess.run(["taskkill", "/F", "/IM", "chrome.exe"], capture_output=True)
-    time.sleep(2)
-
-
 def get_browser_context(playwright):
     """Launch a persistent Chromium context using a dedicated Playwright profile."""
     PLAYWRIGHT_PROFILE.mkdir(parents=True, exist_ok=True)
@@ -76,24 +72,30 @@ def get_browser_context(playwright):
 def find_latest_draft():
     """Find the most recently modified LinkedIn draft.
     Prefers Approved/ (ready-to-post) over Drafts/ (still in review).
-    Skips files already marked as Posted or Approved+already-sent."""
+    Approved drafts are claimed through approval_queue (moved to In_Progress/)
+    so a second poster can't publish the same one.
+    Skips files already marked as Posted or Approved+already-sent.
+    Returns (path, job) — job is None for Drafts/ files; (None, None) if nothing found."""
     # Check Approved/ first — these are CEO-approved and ready
-    approved_files = list(APPROVED_DIR.glob("LinkedIn_Post*.md"))
-    approved_files = [f for f in approved_files if "**Status:** Posted" not in f.read_text(encoding="utf-8")]
-    if approved_files:
-        approved_files.sort(key=os.path.getmtime, reverse=True)
-        print(f"[INFO] Found {len(approved_files)} approved draft(s) — using latest from Approved/")
-        return approved_files[0]
+    while True:
+        job = approval_queue.claim("LinkedIn_Post*.md", source=APPROVED_DIR, newest_first=True)
+        if job is None:
+            break
+        if read_record(job.path).get("Status") != "Posted":
+            print(f"[INFO] Claimed approved draft {job.name} from Approved/")
+            return job.path, job
+        # Posted earlier but never archived — just finish it
+        approval_queue.complete(job, DONE_DIR)
 
     # Fall back to Drafts/
     pattern = str(DRAFTS_DIR / "LinkedIn_Post*.md")
     files = glob.glob(pattern)
     if not files:
         print("[ERROR] No LinkedIn drafts found in Approved/ or Drafts/")
-        return None
+        return None, None
     files.sort(key=os.path.getmtime, reverse=True)
     print(f"[INFO] No approved drafts — using latest from Drafts/")
-    return Path(files[0])
+    return Path(files[0]), None
 
 
 def extract_post_content(filepath):
@@ -130,33 +132,389 @@ def login_flow():
     print("[INFO] Sign in to LinkedIn, then close the browser window.")
     print()
 
-    close_chrome()
+    try:
+        with browser_steps.hold_profile("LinkedIn login"), sync_playwright() as p:
+            browser_steps.close_chrome(PLAYWRIGHT_PROFILE)
+            context = get_browser_context(p)
+            page = context.pages[0] if context.pages else context.new_page()
+            page.goto("https://www.linkedin.com/login", timeout=60000)
+            print("[INFO] Waiting for you to log in... (close browser when done)")
+            try:
+                # Wait until the user closes the browser
+                page.wait_for_event("close", timeout=300000)
+            except Exception:
+                pass
+            try:
+                context.close()
+            except Exception:
+                pass
+    except browser_steps.ProfileBusy as e:
+        print(f"[ERROR] {e} — try again when it is done.")
+        return
 
-    with sync_playwright() as p:
-        context = get_browser_context(p)
-        page = context.pages[0] if context.pages else context.new_page()
-        page.goto("https://www.linkedin.com/login", timeout=60000)
-        print("[INFO] Waiting for you to log in... (close browser when done)")
+    print("[OK] Login session saved. You can now run: python linkedin_poster.py")
+
+
+FEED_URL = "https://www.linkedin.com/feed/"
+
+
+def feed_steps(page, log=print):
+    """Load the LinkedIn feed. Returns False when the session is logged out.
+    A browser_steps generator — open_feed() runs it on a sync page."""
+    log("[INFO] Navigating to LinkedIn feed...")
+    yield page.goto(FEED_URL, timeout=60000, wait_until="domcontentloaded")
+    try:
+        yield page.wait_for_load_state("networkidle", timeout=10000)
+    except Exception:
+        log("[INFO] networkidle not reached (normal for LinkedIn) — continuing...")
+    yield page.wait_for_timeout(3000)
+
+    # Check if we need to log in
+    if "/login" in page.url or "/checkpoint" in page.url:
+        log("[ERROR] Not logged in to LinkedIn.")
+        log("[HINT] Run: python linkedin_poster.py --login")
+        return False
+    return True
+
+
+def open_feed(page):
+    """Load the LinkedIn feed. Returns False when the session is logged out."""
+    return browser_steps.run(feed_steps(page))
+
+
+# ──────────────────────────────────────────────
+# SELECTOR STRATEGIES (learned order)
+# ──────────────────────────────────────────────
+# LinkedIn's DOM shifts often, so each UI element has several ways to find it.
+# The strategy that worked last time is tried first with a short timeout; if it
+# misses, all remaining selector strategies are raced in ONE wait (a combined
+# .or_() locator) instead of burning a full timeout on each in turn.
+QUICK_TIMEOUT = 3000  # ms — cached winner
+RACE_TIMEOUT = 8000  # ms — all other selectors at once
+CLICK_TIMEOUT = 5000  # ms
+MODAL_TIMEOUT = 5000  # ms — composer dialog must appear after a click
+
+EDITOR_TEXT_JS = """
+    () => {
+        const el = document.querySelector('div.ql-editor, div[role="textbox"][contenteditable="true"]');
+        return el ? el.innerText.trim() : '';
+    }
+"""
+EDITOR_INSERT_JS = """
+    text => {
+        const el = document.querySelector('div.ql-editor, div[role="textbox"][contenteditable="true"]');
+        if (el) {
+            el.focus();
+            el.innerHTML = text.split('\\n').map(l => '<p>' + l + '</p>').join('');
+            el.dispatchEvent(new Event('input', {bubbles: true}));
+        }
+    }
+"""
+
+MODAL_SELECTOR = (
+    "div[role='dialog'], "
+    "div.share-creation-state__overlay, "
+    "div.share-box--is-open, "
+    "div.artdeco-modal, "
+    "div[data-test-modal]"
+)
+
+# (name, locator factory or None, JS action or None)
+START_POST_STRATEGIES = [
+    # Strategy 1: text match
+    ("text", lambda page: page.get_by_text("Start a post"), None),
+    # Strategy 2: CSS class (share-box trigger)
+    ("css_class", lambda page: page.locator(".share-box-feed-entry__trigger"), None),
+    # Strategy 3: JS click — proven reliable on 2026 LinkedIn DOM
+    # Finds the innermost element containing "Start a post" and clicks it.
+    ("js_innermost", None, lambda page: page.evaluate("""
+        (() => {
+            const all = document.querySelectorAll('*');
+            let best = null;
+            for (const el of all) {
+                const text = (el.textContent || '').trim();
+                if (text.includes('Start a post') && el.children.length < 3) {
+                    if (!best || text.length < best.textContent.trim().length) {
+                        best = el;
+                    }
+                }
+            }
+            if (best) { best.click(); return true; }
+            return false;
+        })()
+    """)),
+    # Strategy 4: aria-label
+    ("aria_label", lambda page: page.locator("[aria-label*='Start a post']"), None),
+    # Strategy 5: data-view-name (LinkedIn 2025/2026 feed composer button)
+    ("data_view_name", lambda page: page.locator(
+        "[data-view-name='share-creation-state'] button, "
+        "button[data-control-name='share.share_feed_entry'], "
+        ".share-box-feed-entry__closed-share-box button"
+    ), None),
+    # Strategy 6: share prompt button / artdeco pill fallback
+    ("share_prompt", lambda page: page.locator("button.share-box-feed-entry__trigger, button.artdeco-pill"), None),
+]
+
+EDITOR_STRATEGIES = [
+    # Editor Strategy 1: role textbox
+    ("role_textbox", lambda page: page.get_by_role("textbox"), None),
+    # Editor Strategy 2: any contenteditable div
+    ("contenteditable", lambda page: page.locator("div[contenteditable='true']"), None),
+    # Editor Strategy 3: Quill editor class
+    ("ql_editor", lambda page: page.locator("div.ql-editor"), None),
+    # Editor Strategy 4: any element with data-placeholder
+    ("data_placeholder", lambda page: page.locator("[data-placeholder]"), None),
+]
+
+
+class StrategyCache:
+    """Per-group last winner and hit/miss counts, persisted in STRATEGY_FILE."""
+
+    def __init__(self, path=STRATEGY_FILE):
+        self.path = path
         try:
-            # Wait until the user closes the browser
-            page.wait_for_event("close", timeout=300000)
-        except Exception:
+            self.data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.data = {}
+
+    def order(self, group, names):
+        """Last winner first, then by hit rate; ties keep the declared order."""
+        info = self.data.get(group, {})
+        stats = info.get("stats", {})
+
+        def rate(name):
+            st = stats.get(name, {})
+            tries = st.get("hits", 0) + st.get("misses", 0)
+            return st.get("hits", 0) / tries if tries else 0.5  # untried = neutral
+
+        ranked = sorted(names, key=lambda n: -rate(n))
+        last = info.get("last")
+        if last in ranked:
+            ranked.remove(last)
+            ranked.insert(0, last)
+        return ranked
+
+    def record(self, group, name, hit, ms):
+        info = self.data.setdefault(group, {"last": None, "stats": {}})
+        st = info["stats"].setdefault(name, {"hits": 0, "misses": 0, "avg_ms": 0})
+        st["hits" if hit else "misses"] += 1
+        n = st["hits"] + st["misses"]
+        st["avg_ms"] = round(st["avg_ms"] + (ms - st["avg_ms"]) / n)
+        if hit:
+            info["last"] = name
+
+    def save(self):
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            tmp.write_text(json.dumps(self.data, indent=2), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"[WARN] Could not save strategy cache: {e}")
+
+
+def strategy_steps(page, cache, group, strategies, verify, log=print):
+    """Try strategies until one clicks its target and verify() (a step
+    generator function) confirms it. Returns the winning strategy name, or None."""
+    by_name = {name: (make_locator, js) for name, make_locator, js in strategies}
+    order = cache.order(group, list(by_name))
+    tried = set()
+
+    def attempt(name, wait_ms):
+        make_locator, js = by_name[name]
+        tried.add(name)
+        t0 = time.perf_counter()
+        try:
+            if make_locator is not None:
+                loc = make_locator(page).first
+                if wait_ms:
+                    yield loc.wait_for(state="visible", timeout=wait_ms)
+                elif not (yield loc.is_visible()):
+                    raise LookupError("not visible")
+                yield loc.click(force=True, timeout=CLICK_TIMEOUT)
+            elif not (yield js(page)):
+                raise LookupError("JS found no target")
+            ok = yield from verify()
+        except Exception as e:
+            log(f"[INFO] {group} strategy '{name}' missed: {type(e).__name__}")
+            ok = False
+        cache.record(group, name, ok, (time.perf_counter() - t0) * 1000)
+        if ok:
+            log(f"[INFO] {group} strategy '{name}' worked.")
+        return ok
+
+    # 1. Last winner alone, short timeout
+    if (yield from attempt(order[0], QUICK_TIMEOUT)):
+        return order[0]
+
+    # 2. Race every other selector strategy in a single wait
+    locators = [by_name[n][0](page) for n in order if n not in tried and by_name[n][0] is not None]
+    if locators:
+        combined = locators[0]
+        for loc in locators[1:]:
+            combined = combined.or_(loc)
+        try:
+            yield combined.first.wait_for(state="visible", timeout=RACE_TIMEOUT)
+        except PwTimeout:
             pass
+
+    # 3. Whatever is visible now (and JS strategies) — no further waiting
+    for name in order:
+        if name not in tried and (yield from attempt(name, 0)):
+            return name
+    return None
+
+
+def post_button_locator(page):
+    """The composer's Post button (role name, primary-action class, or aria-label)."""
+    return page.get_by_role("button", name="Post", exact=True).or_(
+        page.locator("button.share-actions__primary-action")
+    ).or_(
+        page.locator("button[aria-label='Post']")
+    )
+
+
+def modal_steps(page):
+    """True once the post composer dialog is visible."""
+    try:
+        yield page.locator(MODAL_SELECTOR).first.wait_for(state="visible", timeout=MODAL_TIMEOUT)
+        return True
+    except PwTimeout:
+        return False
+
+
+def _always():
+    return True
+    yield  # a step generator that makes no call
+
+
+def print_strategy_stats(path=STRATEGY_FILE):
+    """Hit rate per selector strategy — shows when LinkedIn's DOM drifts."""
+    cache = StrategyCache(path)
+    if not cache.data:
+        print("[INFO] No strategy stats recorded yet.")
+        return
+    for group, info in cache.data.items():
+        print(f"\n{group} (last winner: {info.get('last')})")
+        for name, st in sorted(info.get("stats", {}).items(), key=lambda kv: -kv[1]["hits"]):
+            tries = st["hits"] + st["misses"]
+            print(f"  {name:<18} {st['hits']:>4}/{tries:<4} {100 * st['hits'] / tries:5.1f}%  avg {st['avg_ms']} ms")
+
+
+class PostUncertain(Exception):
+    """The Post click raised part-way — the post may be live. Never retried:
+    a retry could publish it twice."""
+
+
+def post_steps(page, content, cache, log=print):
+    """Publish content from an already loaded, logged-in feed page.
+    Returns True once the post is submitted, False if the composer never opened.
+    Errors after a successful Post click don't fail the post; a click that
+    raises (other than never becoming clickable) raises PostUncertain.
+    A browser_steps generator — post_on_page() runs it on a sync page,
+    browser_pool on its async one."""
+    try:
+        # Click "Start a post", then verify the modal opened before proceeding
+        log("[INFO] Looking for 'Start a post'...")
+        if not (yield from strategy_steps(page, cache, "start_post", START_POST_STRATEGIES,
+                                          lambda: modal_steps(page), log)):
+            yield page.screenshot(path=str(BASE_DIR / "failure_capture.png"))
+            log("[ERROR] Could not open post modal. Screenshot saved: failure_capture.png")
+            return False
+
+        # Type content into the post editor
+        log("[INFO] Looking for post editor...")
+        if not (yield from strategy_steps(page, cache, "editor", EDITOR_STRATEGIES, _always, log)):
+            yield page.screenshot(path=str(BASE_DIR / "failure_capture.png"))
+            log("[ERROR] Could not find post editor. Screenshot saved: failure_capture.png")
+            return False
+    finally:
+        cache.save()
+
+    log("[INFO] Pasting post content via clipboard...")
+    yield page.wait_for_timeout(500)
+    # Use clipboard paste — instant, no timeout risk, handles emojis
+    yield page.evaluate("text => navigator.clipboard.writeText(text)", content)
+    yield page.wait_for_timeout(300)
+    yield page.keyboard.press("Control+v")
+    yield page.wait_for_timeout(1000)
+    # Fallback: if paste didn't work, try JS insertion
+    editor_text = yield page.evaluate(EDITOR_TEXT_JS)
+    if len(editor_text) < 20:
+        log("[INFO] Clipboard paste may not have worked — trying JS insert...")
+        yield page.evaluate(EDITOR_INSERT_JS, content)
+        yield page.wait_for_timeout(500)
+
+    yield page.wait_for_timeout(1000)
+
+    # Click Post button
+    log("[INFO] Clicking Post button...")
+    try:
+        yield post_button_locator(page).first.click(timeout=30000)
+    except PwTimeout:
+        raise  # never became clickable — nothing was submitted
+    except Exception as e:
+        raise PostUncertain(f"Post click failed: {e}") from e
+
+    # From here on the post is out — a failure only costs the confirmation
+    try:
+        # The composer dialog closes once LinkedIn accepted the post
+        log("[INFO] Waiting for post confirmation...")
         try:
-            context.close()
-        except Exception:
+            yield page.locator(MODAL_SELECTOR).first.wait_for(state="hidden", timeout=15000)
+        except PwTimeout:
             pass
 
-    print("[OK] Login session saved. You can now run: python linkedin_poster.py")
+        # Screenshot as audit proof
+        yield page.screenshot(path=str(BASE_DIR / "post_confirmation.png"))
+        log("[OK] Screenshot saved: post_confirmation.png")
+    except Exception as e:
+        log(f"[WARN] Post was clicked but the confirmation failed: {e}")
+
+    log("[OK] Post submitted to LinkedIn!")
+    return True
+
+
+def post_on_page(page, content, cache=None):
+    """post_steps() on a sync page."""
+    return browser_steps.run(post_steps(page, content, cache or StrategyCache()))
+
+
+def _capture_failure(page):
+    fail_path = str(BASE_DIR / "failure_capture.png")
+    try:
+        page.screenshot(path=fail_path)
+        print("[INFO] Failure screenshot saved: failure_capture.png")
+    except Exception:
+        pass
+
+
+def _post_safely(page, content):
+    """open_feed() + post_on_page() with the error reporting shared by single and
+    batch runs. PostUncertain propagates — the caller must not retry the draft."""
+    try:
+        return open_feed(page) and post_on_page(page, content)
+    except PostUncertain as e:
+        _capture_failure(page)
+        print(f"[ERROR] {e} — the post may be live.")
+        raise
+    except PwTimeout as e:
+        _capture_failure(page)
+        print(f"[ERROR] Timeout waiting for element: {e}")
+        print("[HINT] LinkedIn may have updated its UI. Check selectors in linkedin_poster.py.")
+    except Exception as e:
+        _capture_failure(page)
+        print(f"[ERROR] Failed to post: {e}")
+    return False
 
 
 def post_to_linkedin(content):
-    """Launch browser and post content to LinkedIn."""
-    close_chrome()
+    """Launch browser and post content to LinkedIn. Raises ProfileBusy (nothing
+    was attempted) if another script has a browser on the profile."""
     print("[INFO] Launching browser with persistent Playwright profile...")
     print()
 
-    with sync_playwright() as p:
+    with browser_steps.hold_profile("linkedin_poster"), sync_playwright() as p:
+        browser_steps.close_chrome(PLAYWRIGHT_PROFILE)
         try:
             context = get_browser_context(p)
         except Exception as e:
@@ -164,251 +522,86 @@ def post_to_linkedin(content):
             return False
 
         page = context.pages[0] if context.pages else context.new_page()
-
         try:
-            # Navigate to LinkedIn feed
-            print("[INFO] Navigating to LinkedIn feed...")
-            page.goto("https://www.linkedin.com/feed/", timeout=60000, wait_until="domcontentloaded")
-            try:
-                page.wait_for_load_state("networkidle", timeout=10000)
-            except Exception:
-                print("[INFO] networkidle not reached (normal for LinkedIn) — continuing...")
-            page.wait_for_timeout(3000)
+            return _post_safely(page, content)
+        finally:
+            context.close()
 
-            # Check if we need to log in
-            if "/login" in page.url or "/checkpoint" in page.url:
-                print("[ERROR] Not logged in to LinkedIn.")
-                print("[HINT] Run: python linkedin_poster.py --login")
-                context.close()
-                return False
-
-            # Click "Start a post" — try multiple strategies
-            # After clicking, we verify the modal opened before proceeding.
-            print("[INFO] Looking for 'Start a post'...")
-            modal_opened = False
-
-            start_post_strategies = [
-                # Strategy 1: text match
-                lambda: (
-                    print("[INFO] Strategy 1: text match...") or True,
-                    page.wait_for_selector("text=Start a post", timeout=8000),
-                    page.get_by_text("Start a post").first.click(force=True, timeout=5000),
-                ),
-                # Strategy 2: CSS class (share-box trigger)
-                lambda: (
-                    print("[INFO] Strategy 2: CSS class...") or True,
-                    page.locator(".share-box-feed-entry__trigger").first.wait_for(state="visible", timeout=8000),
-                    page.locator(".share-box-feed-entry__trigger").first.click(force=True, timeout=5000),
-                ),
-                # Strategy 3: JS click — proven reliable on 2026 LinkedIn DOM
-                # Finds the innermost element containing "Start a post" and clicks it.
-                lambda: (
-                    print("[INFO] Strategy 3: JavaScript innermost click...") or True,
-                    page.evaluate("""
-                        (() => {
-                            const all = document.querySelectorAll('*');
-                            let best = null;
-                            for (const el of all) {
-                                const text = (el.textContent || '').trim();
-                                if (text.includes('Start a post') && el.children.length < 3) {
-                                    if (!best || text.length < best.textContent.trim().length) {
-                                        best = el;
-                                    }
-                                }
-                            }
-                            if (best) { best.click(); return true; }
-                            return false;
-                        })()
-                    """),
-                ),
-                # Strategy 4: aria-label
-                lambda: (
-                    print("[INFO] Strategy 4: aria-label...") or True,
-                    page.locator("[aria-label*='Start a post']").first.wait_for(state="visible", timeout=8000),
-                    page.locator("[aria-label*='Start a post']").first.click(force=True, timeout=5000),
-                ),
-                # Strategy 5: data-view-name (LinkedIn 2025/2026 feed composer button)
-                lambda: (
-                    print("[INFO] Strategy 5: data-view-name feed composer...") or True,
-                    page.locator("[data-view-name='share-creation-state'] button, "
-                                 "button[data-control-name='share.share_feed_entry'], "
-                                 ".share-box-feed-entry__closed-share-box button").first.wait_for(state="visible", timeout=8000),
-                    page.locator("[data-view-name='share-creation-state'] button, "
-                                 "button[data-control-name='share.share_feed_entry'], "
-                                 ".share-box-feed-entry__closed-share-box button").first.click(force=True, timeout=5000),
-                ),
-                # Strategy 6: share prompt button / artdeco pill fallback
-                lambda: (
-                    print("[INFO] Strategy 6: share prompt fallback...") or True,
-                    page.locator("button.share-box-feed-entry__trigger, button.artdeco-pill").first.wait_for(state="visible", timeout=8000),
-                    page.locator("button.share-box-feed-entry__trigger, button.artdeco-pill").first.click(force=True, timeout=5000),
-                ),
-            ]
-
-            for i, strategy in enumerate(start_post_strategies):
-                if modal_opened:
-                    break
-                try:
-                    strategy()
-                    # Wait for modal to open
-                    page.wait_for_timeout(2000)
-                    # Verify modal opened: look for dialog/overlay
-                    modal_open = page.locator(
-                        "div[role='dialog'], "
-                        "div.share-creation-state__overlay, "
-                        "div.share-box--is-open, "
-                        "div.artdeco-modal, "
-                        "div[data-test-modal]"
-                    ).first
-                    try:
-                        modal_open.wait_for(state="visible", timeout=5000)
-                        print(f"[INFO] Modal opened after strategy {i+1}!")
-                        modal_opened = True
-                    except Exception:
-                        print(f"[INFO] Strategy {i+1} clicked but modal did not open — trying next...")
-                        # Debug screenshot
-                        page.screenshot(path=str(BASE_DIR / f"debug_strategy_{i+1}.png"))
-                except Exception as e:
-                    print(f"[INFO] Strategy {i+1} failed: {type(e).__name__}")
-
-            if not modal_opened:
-                fail_path = str(BASE_DIR / "failure_capture.png")
-                page.screenshot(path=fail_path)
-                print(f"[ERROR] Could not open post modal. Screenshot saved: failure_capture.png")
-                context.close()
-                return False
-
-            page.wait_for_timeout(1000)
-
-            # Type content into the post editor — multi-strategy
-            print("[INFO] Looking for post editor...")
-            editor_clicked = False
-
-            # Editor Strategy 1: role textbox
-            if not editor_clicked:
-                try:
-                    ed = page.get_by_role("textbox").first
-                    ed.wait_for(state="visible", timeout=8000)
-                    print("[INFO] Found editor via role=textbox — clicking...")
-                    ed.click(force=True, timeout=5000)
-                    editor_clicked = True
-                except Exception:
-                    print("[INFO] role=textbox failed, trying contenteditable...")
-
-            # Editor Strategy 2: any contenteditable div
-            if not editor_clicked:
-                try:
-                    ed = page.locator("div[contenteditable='true']").first
-                    ed.wait_for(state="visible", timeout=8000)
-                    print("[INFO] Found editor via contenteditable — clicking...")
-                    ed.click(force=True, timeout=5000)
-                    editor_clicked = True
-                except Exception:
-                    print("[INFO] contenteditable failed, trying ql-editor...")
-
-            # Editor Strategy 3: Quill editor class
-            if not editor_clicked:
-                try:
-                    ed = page.locator("div.ql-editor").first
-                    ed.wait_for(state="visible", timeout=8000)
-                    print("[INFO] Found editor via ql-editor — clicking...")
-                    ed.click(force=True, timeout=5000)
-                    editor_clicked = True
-                except Exception:
-                    print("[INFO] ql-editor failed, trying data-placeholder...")
-
-            # Editor Strategy 4: any element with data-placeholder
-            if not editor_clicked:
-                try:
-                    ed = page.locator("[data-placeholder]").first
-                    ed.wait_for(state="visible", timeout=8000)
-                    print("[INFO] Found editor via data-placeholder — clicking...")
-                    ed.click(force=True, timeout=5000)
-                    editor_clicked = True
-                except Exception:
-                    pass
-
-            if not editor_clicked:
-                fail_path = str(BASE_DIR / "failure_capture.png")
-                page.screenshot(path=fail_path)
-                print(f"[ERROR] Could not find post editor. Screenshot saved: failure_capture.png")
-                context.close()
-                return False
-
-            print("[INFO] Pasting post content via clipboard...")
-            page.wait_for_timeout(500)
-            # Use clipboard paste — instant, no timeout risk, handles emojis
-            page.evaluate("text => navigator.clipboard.writeText(text)", content)
-            page.wait_for_timeout(300)
-            page.keyboard.press("Control+v")
-            page.wait_for_timeout(1000)
-            # Fallback: if paste didn't work, try JS insertion
-            editor_text = page.evaluate("""
-                () => {
-                    const el = document.querySelector('div.ql-editor, div[role="textbox"][contenteditable="true"]');
-                    return el ? el.innerText.trim() : '';
-                }
-            """)
-            if len(editor_text) < 20:
-                print("[INFO] Clipboard paste may not have worked — trying JS insert...")
-                page.evaluate("""
-                    text => {
-                        const el = document.querySelector('div.ql-editor, div[role="textbox"][contenteditable="true"]');
-                        if (el) {
-                            el.focus();
-                            el.innerHTML = text.split('\\n').map(l => '<p>' + l + '</p>').join('');
-                            el.dispatchEvent(new Event('input', {bubbles: true}));
-                        }
-                    }
-                """, content)
-                page.wait_for_timeout(500)
-
-            page.wait_for_timeout(1000)
-
-            # Click Post button
-            print("[INFO] Clicking Post button...")
-            post_btn = page.get_by_role("button", name="Post", exact=True).or_(
-                page.locator("button.share-actions__primary-action")
-            ).or_(
-                page.locator("button[aria-label='Post']")
-            )
-            post_btn.first.click(timeout=30000)
-
-            # Wait for confirmation popup to appear
-            print("[INFO] Waiting for post confirmation...")
-            time.sleep(5)
-
-            # Screenshot as audit proof
-            screenshot_path = str(BASE_DIR / "post_confirmation.png")
-            page.screenshot(path=screenshot_path)
-            print(f"[OK] Screenshot saved: post_confirmation.png")
-
-            print("[OK] Post submitted to LinkedIn!")
-            success = True
-
-        except PwTimeout as e:
-            fail_path = str(BASE_DIR / "failure_capture.png")
+
+# ──────────────────────────────────────────────
+# BATCH MODE (--batch)
+# ──────────────────────────────────────────────
+def run_batch(limit=None):
+    """Post every due approved LinkedIn_Post*.md through ONE browser session.
+
+    Posts are claimed one at a time (oldest first) via approval_queue, so
+    files with a future **Scheduled:** time stay queued and a poster running
+    at the same time never gets the same draft. Returns (posted, failed),
+    or None when another script holds the browser profile (nothing claimed).
+    """
+    waiting = approval_queue.pending("LinkedIn_Post*.md", source=APPROVED_DIR)
+    if limit is not None:
+        waiting = waiting[:limit]
+    if not waiting:
+        print("[INFO] No due approved LinkedIn posts.")
+        return 0, 0
+
+    print(f"[INFO] {len(waiting)} approved post(s) due — one browser session for all.")
+    try:
+        with browser_steps.hold_profile("linkedin_poster --batch"), sync_playwright() as p:
+            browser_steps.close_chrome(PLAYWRIGHT_PROFILE)
             try:
-                page.screenshot(path=fail_path)
-                print(f"[INFO] Failure screenshot saved: failure_capture.png")
-            except Exception:
-                pass
-            print(f"[ERROR] Timeout waiting for element: {e}")
-            print("[HINT] LinkedIn may have updated its UI. Check selectors in linkedin_poster.py.")
-            success = False
-        except Exception as e:
-            fail_path = str(BASE_DIR / "failure_capture.png")
+                context = get_browser_context(p)
+            except Exception as e:
+                print(f"[ERROR] Could not launch browser: {e}")
+                return 0, 0
+            page = context.pages[0] if context.pages else context.new_page()
             try:
-                page.screenshot(path=fail_path)
-                print(f"[INFO] Failure screenshot saved: failure_capture.png")
-            except Exception:
-                pass
-            print(f"[ERROR] Failed to post: {e}")
-            success = False
-        finally:
-            context.close()
+                posted, failed = _post_batch(page, limit)
+            finally:
+                context.close()
+    except browser_steps.ProfileBusy as e:
+        print(f"\n[SKIPPED] Batch: {e}.")
+        return None
 
-        return success
+    print(f"\n[DONE] Batch: {posted} posted, {failed} failed.")
+    return posted, failed
+
+
+def _post_batch(page, limit):
+    """Claim and post due drafts on one page. Returns (posted, failed)."""
+    posted = failed = 0
+    while limit is None or posted + failed < limit:
+        job = approval_queue.claim("LinkedIn_Post*.md", source=APPROVED_DIR)
+        if job is None:
+            break
+        print(f"\n--- {job.name} ---")
+        if read_record(job.path).get("Status") == "Posted":
+            approval_queue.complete(job, DONE_DIR)
+            continue
+        content = extract_post_content(job.path)
+        if not content:
+            approval_queue.fail(job, "draft format unexpected", retry=False)
+            failed += 1
+            continue
+
+        # Same page for every post — only the feed is reloaded in between
+        try:
+            ok = _post_safely(page, content)
+        except PostUncertain as e:
+            approval_queue.fail(job, f"{e} — check LinkedIn before re-approving", retry=False)
+            failed += 1
+            continue
+        if ok:
+            approval_queue.clear_claim(job)
+            mark_as_posted(job.path)
+            posted += 1
+        else:
+            approval_queue.fail(job, "LinkedIn post failed")
+            failed += 1
+            if "/login" in page.url or "/checkpoint" in page.url:
+                break  # logged out — every remaining post would fail the same way
+    return posted, failed
 
 
 def mark_as_posted(filepath):
@@ -437,7 +630,26 @@ def main():
         login_flow()
         return
 
+    if "--strategy-stats" in sys.argv:
+        print_strategy_stats()
+        return
+
+    # Batch mode — drain Approved/ (honoring **Scheduled:**) in one browser session
+    if "--batch" in sys.argv:
+        limit = None
+        if "--limit" in sys.argv:
+            try:
+                limit = int(sys.argv[sys.argv.index("--limit") + 1])
+            except (IndexError, ValueError):
+                print("[ERROR] --limit needs a number")
+                sys.exit(2)
+        result = run_batch(limit)
+        if result is None:
+            sys.exit(browser_steps.EXIT_PROFILE_BUSY)
+        sys.exit(1 if result[1] else 0)
+
     # Determine which draft to post
+    job = None
     if len(sys.argv) > 1 and not sys.argv[1].startswith("--"):
         filepath = Path(sys.argv[1])
         if not filepath.is_absolute():
@@ -446,21 +658,22 @@ def main():
             print(f"[ERROR] File not found: {filepath}")
             sys.exit(1)
     else:
-        filepath = find_latest_draft()
+        filepath, job = find_latest_draft()
         if not filepath:
             sys.exit(1)
 
     print(f"[INFO] Draft: {filepath.name}")
 
     # Check if already posted
-    text = filepath.read_text(encoding="utf-8")
-    if "**Status:** Posted" in text:
+    if read_record(filepath).get("Status") == "Posted":
         print("[WARN] This draft is already marked as Posted. Skipping.")
         sys.exit(0)
 
     # Extract content
     content = extract_post_content(filepath)
     if not content:
+        if job:
+            approval_queue.fail(job, "draft format unexpected", retry=False)
         sys.exit(1)
 
     print(f"[INFO] Content length: {len(content)} chars")
@@ -468,11 +681,30 @@ def main():
     print()
 
     # Post to LinkedIn
-    if post_to_linkedin(content):
+    try:
+        ok = post_to_linkedin(content)
+    except browser_steps.ProfileBusy as e:
+        if job:
+            approval_queue.release(job)  # never attempted — no retry used up
+        print(f"\n[SKIPPED] {e}. Draft left in the approval queue.")
+        sys.exit(browser_steps.EXIT_PROFILE_BUSY)
+    except PostUncertain as e:
+        if job:
+            approval_queue.fail(job, f"{e} — check LinkedIn before re-approving", retry=False)
+        print("\n[FAILED] The post may be live — check LinkedIn. Not retried.")
+        sys.exit(1)
+    if ok:
+        if job:
+            approval_queue.clear_claim(job)
         mark_as_posted(filepath)
         print("\n[DONE] LinkedIn post complete.")
     else:
-        print("\n[FAILED] Could not post to LinkedIn. Draft remains as Draft.")
+        if job:
+            # Back to Approved/ with a retry delay, or Dead_Letter/ after MAX_ATTEMPTS
+            approval_queue.fail(job, "LinkedIn post failed")
+            print("\n[FAILED] Could not post to LinkedIn. Draft returned to the approval queue.")
+        else:
+            print("\n[FAILED] Could not post to LinkedIn. Draft remains as Draft.")
         sys.exit(1)
 
 
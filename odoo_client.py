@@ -0,0 +1,312 @@
+"""
+Odoo Client — Pooled JSON-RPC Access to Odoo 18/19
+Talks to Odoo's /jsonrpc endpoint over a small pool of keep-alive
+http.client connections, logs in once and caches the uid, and reads large
+models page by page (keyset paging on id), so tens of thousands of invoices
+stream through in PAGE_SIZE chunks instead of one giant response.
+
+Configuration (environment):
+    ODOO_URL        e.g. http://localhost:8069   (unset = Odoo disabled)
+    ODOO_DB         database name
+    ODOO_USER       login
+    ODOO_PASSWORD   password or API key
+    ODOO_PAGE_SIZE  records per search_read page (default 500)
+
+Usage:
+    python odoo_client.py            # check the connection and count records
+"""
+
+import http.client
+import itertools
+import json
+import os
+import queue
+import sys
+import threading
+from datetime import date
+from urllib.parse import urlsplit
+
+ODOO_URL = os.environ.get("ODOO_URL", "")
+ODOO_DB = os.environ.get("ODOO_DB", "")
+ODOO_USER = os.environ.get("ODOO_USER", "")
+ODOO_PASSWORD = os.environ.get("ODOO_PASSWORD", "")
+PAGE_SIZE = int(os.environ.get("ODOO_PAGE_SIZE", "500"))
+TIMEOUT = 30  # seconds per request
+POOL_SIZE = 4  # keep-alive connections kept open
+
+INVOICE_DOMAIN = [["move_type", "=", "out_invoice"], ["state", "!=", "cancel"]]
+INVOICE_FIELDS = [
+    "name", "partner_id", "ref", "invoice_origin", "amount_total", "amount_residual",
+    "invoice_date", "invoice_date_due", "payment_state", "state", "write_date",
+]
+EXPENSE_DOMAIN = [["state", "!=", "refused"]]
+EXPENSE_FIELDS = ["name", "product_id", "employee_id", "total_amount", "date", "state", "write_date"]
+BANK_DOMAIN = [["account_id.account_type", "=", "asset_cash"], ["parent_state", "=", "posted"]]
+
+
+class OdooError(Exception):
+    """An Odoo-side fault (bad credentials, access rights, server error)."""
+
+    def __init__(self, message, data=None):
+        super().__init__(message)
+        self.data = data or {}
+
+
+def configured():
+    """True when ODOO_URL is set — otherwise callers use accounting_status.json."""
+    return bool(ODOO_URL)
+
+
+# ──────────────────────────────────────────────
+# CLIENT
+# ──────────────────────────────────────────────
+class OdooClient:
+    """JSON-RPC client with pooled keep-alive connections and a cached uid.
+
+    Safe to share between threads: each request borrows its own connection.
+    """
+
+    def __init__(self, url=None, db=None, user=None, password=None,
+                 page_size=None, timeout=TIMEOUT, pool_size=POOL_SIZE):
+        self.url = (url or ODOO_URL).rstrip("/")
+        if not self.url:
+            raise OdooError("ODOO_URL is not set")
+        parts = urlsplit(self.url)
+        self._https = parts.scheme == "https"
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path = (parts.path or "") + "/jsonrpc"
+        self.db = db if db is not None else ODOO_DB
+        self.user = user if user is not None else ODOO_USER
+        self.password = password if password is not None else ODOO_PASSWORD
+        self.page_size = page_size or PAGE_SIZE
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=pool_size)  # LIFO: reuse the warmest connection
+        self._ids = itertools.count(1)
+        self._uid = None
+        self._uid_lock = threading.Lock()
+
+    # -- transport --
+    def _new_connection(self):
+        cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+        return cls(self._host, self._port, timeout=self.timeout)
+
+    def _borrow(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+
+    def _give_back(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _post(self, body):
+        """POST one JSON-RPC body; a dropped or refused connection (a keep-alive
+        the server already closed, a restarting server) is retried once on a
+        fresh connection. Transport failures (lost or refused connection,
+        timeout, truncated or garbled response) raise OdooError."""
+        for attempt in range(2):
+            # the retry opens a new connection — another pooled one may be just as stale
+            conn = self._new_connection() if attempt else self._borrow()
+            try:
+                conn.request("POST", self._path, body=body,
+                             headers={"Content-Type": "application/json", "Connection": "keep-alive"})
+                resp = conn.getresponse()
+                data = resp.read()
+            except (http.client.RemoteDisconnected, ConnectionError, http.client.CannotSendRequest) as e:
+                conn.close()
+                if attempt:
+                    raise OdooError(f"connection to {self.url} lost: {e!r}") from e
+                continue
+            except http.client.HTTPException as e:
+                conn.close()
+                raise OdooError(f"bad HTTP response from {self.url}: {e!r}") from e
+            except OSError as e:
+                # timeouts are not retried — the server may still be running the call
+                conn.close()
+                raise OdooError(f"request to {self.url} failed: {e!r}") from e
+            except Exception:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._give_back(conn)
+            if resp.status != 200:
+                raise OdooError(f"HTTP {resp.status} from {self.url}")
+            return data
+
+    def call(self, service, method, *args):
+        """Call service.method(*args) over /jsonrpc and return the result."""
+        body = json.dumps({
+            "jsonrpc": "2.0",
+            "method": "call",
+            "params": {"service": service, "method": method, "args": list(args)},
+            "id": next(self._ids),
+        }).encode("utf-8")
+        reply = json.loads(self._post(body))
+        if reply.get("error"):
+            err = reply["error"]
+            data = err.get("data") or {}
+            raise OdooError(data.get("message") or err.get("message") or "Odoo error", data)
+        return reply.get("result")
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- model access --
+    @property
+    def uid(self):
+        """Log in on first use; the uid is reused for every later call."""
+        if self._uid is None:
+            with self._uid_lock:
+                if self._uid is None:
+                    uid = self.call("common", "authenticate", self.db, self.user, self.password, {})
+                    if not uid:
+                        raise OdooError(f"Odoo login failed for {self.user!r} on database {self.db!r}")
+                    self._uid = uid
+        return self._uid
+
+    def execute_kw(self, model, method, args=None, kwargs=None):
+        return self.call("object", "execute_kw", self.db, self.uid, self.password,
+                         model, method, args or [], kwargs or {})
+
+    def search_count(self, model, domain):
+        return self.execute_kw(model, "search_count", [domain])
+
+    def search_read_pages(self, model, domain, fields, page_size=None):
+        """Yield search_read results one page at a time, in id order.
+
+        Pages are keyed on the last id seen (id > last) rather than an
+        offset, so each page costs the same however deep the scan is and
+        records created mid-scan cannot shift later pages.
+        """
+        size = page_size or self.page_size
+        last_id = 0
+        fields = list(fields) if "id" in fields else ["id", *fields]
+        while True:
+            page = self.execute_kw(model, "search_read", [domain + [["id", ">", last_id]]],
+                                   {"fields": fields, "order": "id asc", "limit": size})
+            if not page:
+                return
+            yield page
+            if len(page) < size:
+                return
+            last_id = page[-1]["id"]
+
+    def search_read_iter(self, model, domain, fields, page_size=None):
+        """Yield records one by one, fetched page by page."""
+        for page in self.search_read_pages(model, domain, fields, page_size):
+            yield from page
+
+
+# ──────────────────────────────────────────────
+# MAPPING → accounting_status.json shape
+# ──────────────────────────────────────────────
+def _name(many2one, default=""):
+    """Display name of a many2one value ([id, "Name"] or False)."""
+    return many2one[1] if isinstance(many2one, (list, tuple)) and len(many2one) > 1 else default
+
+
+def _day(value):
+    return value[:10] if value else None
+
+
+def invoice_status(rec, today=None):
+    """Map Odoo state/payment_state onto paid / pending / overdue / draft."""
+    if rec.get("state") == "draft":
+        return "draft"
+    if rec.get("payment_state") in ("paid", "in_payment", "reversed"):
+        return "paid"
+    due = _day(rec.get("invoice_date_due"))
+    if due and due < (today or date.today()).isoformat():
+        return "overdue"
+    return "pending"
+
+
+def map_invoice(rec, today=None):
+    status = invoice_status(rec, today)
+    return {
+        "id": rec.get("name") or f"INV-{rec['id']}",
+        "client": _name(rec.get("partner_id"), "Unknown"),
+        "description": rec.get("ref") or rec.get("invoice_origin") or "",
+        "amount": rec.get("amount_total") or 0,
+        "status": status,
+        "issue_date": _day(rec.get("invoice_date")),
+        "due_date": _day(rec.get("invoice_date_due")),
+        # Odoo has no single "paid on" field; the last write of a paid invoice
+        # is the reconciliation in practice
+        "paid_date": _day(rec.get("write_date")) if status == "paid" else None,
+        "odoo_id": rec["id"],
+        "write_date": rec.get("write_date"),
+    }
+
+
+def map_expense(rec):
+    return {
+        "id": f"EXP-{rec['id']}",
+        "category": _name(rec.get("product_id"), "Uncategorized"),
+        "vendor": _name(rec.get("employee_id")),
+        "description": rec.get("name") or "",
+        "amount": rec.get("total_amount") or 0,
+        "date": _day(rec.get("date")),
+        "status": "paid" if rec.get("state") in ("done", "paid") else rec.get("state") or "",
+        "odoo_id": rec["id"],
+        "write_date": rec.get("write_date"),
+    }
+
+
+def iter_invoices(client, domain=None):
+    """Mapped customer invoices, streamed page by page."""
+    today = date.today()
+    for rec in client.search_read_iter("account.move", INVOICE_DOMAIN + (domain or []), INVOICE_FIELDS):
+        yield map_invoice(rec, today)
+
+
+def iter_expenses(client, domain=None):
+    """Mapped hr.expense records, streamed page by page."""
+    for rec in client.search_read_iter("hr.expense", EXPENSE_DOMAIN + (domain or []), EXPENSE_FIELDS):
+        yield map_expense(rec)
+
+
+def bank_balance(client):
+    """Posted balance of every cash/bank account, summed server-side."""
+    rows = client.execute_kw("account.move.line", "read_group", [BANK_DOMAIN, ["balance:sum"], []], {"lazy": False})
+    return {"account": "Bank & Cash (Odoo)", "balance": (rows[0].get("balance") or 0) if rows else 0,
+            "as_of": date.today().isoformat()}
+
+
+def main():
+    if not configured():
+        print("[ERROR] Set ODOO_URL, ODOO_DB, ODOO_USER and ODOO_PASSWORD first.")
+        sys.exit(1)
+    with OdooClient() as client:
+        try:
+            version = client.call("common", "version")
+            print(f"[OK] {client.url} — Odoo {version.get('server_version', '?')}")
+            print(f"[OK] Logged in to {client.db!r} as uid {client.uid}")
+            print(f"  Invoices: {client.search_count('account.move', INVOICE_DOMAIN)}")
+            try:
+                print(f"  Expenses: {client.search_count('hr.expense', EXPENSE_DOMAIN)}")
+            except OdooError as e:
+                print(f"  Expenses: unavailable ({e})")
+        except (OdooError, OSError) as e:
+            print(f"[ERROR] {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
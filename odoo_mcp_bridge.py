@@ -1,16 +1,24 @@
 """
 Odoo MCP Bridge — Platinum Tier Accounting Agent
-Connects to Odoo 18/19 Community via JSON-RPC (future),
-currently reads mock data from accounting_status.json.
-Generates an Accounting Audit summary and flags overdue invoices as tasks.
+Reads invoices and expenses from Odoo 18/19 Community over JSON-RPC
+(odoo_client.py) when ODOO_URL is set — mirrored locally by odoo_store.py so
+each cycle only pulls what changed — otherwise from accounting_status.json.
+Generates an Accounting Audit summary (figures from accounting_analytics,
+aging / DSO / cash projection from receivables) and flags invoices past
+their due date as tasks.
 """
 
-import json
 import sys
 import time
 import re
 from pathlib import Path
-from datetime import datetime, date
+from datetime import datetime
+
+import accounting_analytics
+import odoo_client
+import odoo_store
+import receivables
+import vault_json
 
 BASE_DIR = Path(__file__).resolve().parent
 DATA_FILE = BASE_DIR / "accounting_status.json"
@@ -18,57 +26,30 @@ READINGS_DIR = BASE_DIR / "Readings"
 TASKS_DIR = BASE_DIR / "Needs_Action"
 POLL_INTERVAL = 600  # seconds (10 minutes)
 
+
 # ──────────────────────────────────────────────
-# ODOO JSON-RPC PLACEHOLDER
-# ──────────────────────────────────────────────
-# Future implementation will replace load_mock_data() with:
-#
-# ODOO_URL = "http://localhost:8069"
-# ODOO_DB = "multicraft"
-# ODOO_USER = "admin"
-# ODOO_PASS = "admin"
-#
-# def odoo_authenticate():
-#     payload = {
-#         "jsonrpc": "2.0",
-#         "method": "call",
-#         "params": {
-#             "service": "common",
-#             "method": "login",
-#             "args": [ODOO_DB, ODOO_USER, ODOO_PASS]
-#         }
-#     }
-#     resp = requests.post(f"{ODOO_URL}/jsonrpc", json=payload)
-#     return resp.json()["result"]
-#
-# def odoo_fetch_invoices(uid):
-#     payload = {
-#         "jsonrpc": "2.0",
-#         "method": "call",
-#         "params": {
-#             "service": "object",
-#             "method": "execute_kw",
-#             "args": [ODOO_DB, uid, ODOO_PASS,
-#                      "account.move", "search_read",
-#                      [[["move_type", "=", "out_invoice"]]],
-#                      {"fields": ["name","partner_id","amount_total",
-#                                  "invoice_date","invoice_date_due",
-#                                  "payment_state","state"],
-#                       "limit": 50}]
-#         }
-#     }
-#     resp = requests.post(f"{ODOO_URL}/jsonrpc", json=payload)
-#     return resp.json()["result"]
+# DATA SOURCE — live Odoo or accounting_status.json
 # ──────────────────────────────────────────────
-
-
 def load_data():
-    """Load accounting data (mock or future Odoo)."""
-    if not DATA_FILE.exists():
+    """Load accounting data — from the local Odoo mirror (odoo_store), synced
+    incrementally first, when ODOO_URL is set; else accounting_status.json.
+    If Odoo is unreachable the last synced data is used."""
+    if odoo_client.configured():
+        try:
+            with odoo_client.OdooClient() as client:
+                changes = odoo_store.sync(client)
+            print("  [ODOO] " + ", ".join(f"{kind}: {up} changed, {gone} removed" for kind, (up, gone) in changes.items()))
+        except (odoo_client.OdooError, OSError, ValueError) as e:
+            print(f"  [WARN] Odoo unavailable ({e}) — using the last synced data")
+        data = odoo_store.load()
+        if data is not None:
+            return data
+
+    # accounting_status.json / .jsonl — streamed, and only re-parsed when the file changes
+    data = vault_json.load(DATA_FILE)
+    if data is None:
         print(f"  [ERROR] {DATA_FILE.name} not found.")
-        return None
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return data
 
 
 def fmt_pkr(amount):
@@ -76,49 +57,15 @@ def fmt_pkr(amount):
     return f"PKR {amount:,.0f}"
 
 
-def sanitize_filename(name):
-    return re.sub(r'[<>:"/\\|?*]', '', name).strip().replace(' ', '_')[:80]
+def _days(value):
+    return "—" if value is None else f"{value:.0f} days"
 
 
-def analyze_invoices(invoices):
-    """Compute invoice analytics."""
-    total_revenue = sum(i["amount"] for i in invoices)
-    paid = [i for i in invoices if i["status"] == "paid"]
-    pending = [i for i in invoices if i["status"] == "pending"]
-    overdue = [i for i in invoices if i["status"] == "overdue"]
-    draft = [i for i in invoices if i["status"] == "draft"]
-
-    collected = sum(i["amount"] for i in paid)
-    outstanding = sum(i["amount"] for i in pending + overdue)
-    overdue_total = sum(i["amount"] for i in overdue)
-
-    return {
-        "total_revenue": total_revenue,
-        "collected": collected,
-        "outstanding": outstanding,
-        "overdue_total": overdue_total,
-        "paid": paid,
-        "pending": pending,
-        "overdue": overdue,
-        "draft": draft,
-        "collection_rate": (collected / total_revenue * 100) if total_revenue > 0 else 0,
-    }
-
-
-def analyze_expenses(expenses):
-    """Compute expense analytics by category."""
-    total = sum(e["amount"] for e in expenses)
-    by_category = {}
-    for e in expenses:
-        cat = e["category"]
-        by_category[cat] = by_category.get(cat, 0) + e["amount"]
-    return {
-        "total": total,
-        "by_category": dict(sorted(by_category.items(), key=lambda x: x[1], reverse=True)),
-    }
+def sanitize_filename(name):
+    return re.sub(r'[<>:"/\\|?*]', '', name).strip().replace(' ', '_')[:80]
 
 
-def generate_audit(data):
+def generate_audit(data, summary=None, rec=None):
     """Generate Readings/Accounting_Audit.md."""
     READINGS_DIR.mkdir(parents=True, exist_ok=True)
     now = datetime.now().strftime("%Y-%m-%d %H:%M")
@@ -126,11 +73,9 @@ def generate_audit(data):
     invoices = data.get("invoices", [])
     expenses = data.get("expenses", [])
     bank = data.get("bank_balance", {})
-    inv = analyze_invoices(invoices)
-    exp = analyze_expenses(expenses)
-
-    net_profit = inv["collected"] - exp["total"]
-    profit_margin = (net_profit / inv["collected"] * 100) if inv["collected"] > 0 else 0
+    sm = summary or accounting_analytics.summarize(data)
+    rec = rec or receivables.cached(data, sm)
+    inv = sm["invoices"]
 
     lines = [
         "# Accounting Audit Report",
@@ -147,15 +92,16 @@ def generate_audit(data):
         "",
         "| Metric | Amount |",
         "|--------|--------|",
-        f"| Total Invoiced | {fmt_pkr(inv['total_revenue'])} |",
-        f"| Collected (Paid) | {fmt_pkr(inv['collected'])} |",
-        f"| Outstanding | {fmt_pkr(inv['outstanding'])} |",
-        f"| Overdue | {fmt_pkr(inv['overdue_total'])} |",
-        f"| Total Expenses | {fmt_pkr(exp['total'])} |",
-        f"| **Net Profit (Collected - Expenses)** | **{fmt_pkr(net_profit)}** |",
-        f"| Collection Rate | {inv['collection_rate']:.1f}% |",
-        f"| Profit Margin | {profit_margin:.1f}% |",
+        f"| Total Invoiced | {fmt_pkr(sm['total_revenue'])} |",
+        f"| Collected (Paid) | {fmt_pkr(sm['collected'])} |",
+        f"| Outstanding | {fmt_pkr(sm['outstanding'])} |",
+        f"| Overdue | {fmt_pkr(sm['overdue_total'])} |",
+        f"| Total Expenses | {fmt_pkr(sm['expense_total'])} |",
+        f"| **Net Profit (Collected - Expenses)** | **{fmt_pkr(sm['net_profit'])}** |",
+        f"| Collection Rate | {sm['collection_rate']:.1f}% |",
+        f"| Profit Margin | {sm['profit_margin']:.1f}% |",
         f"| Bank Balance | {fmt_pkr(bank.get('balance', 0))} ({bank.get('as_of', 'N/A')}) |",
+        f"| DSO ({rec['dso_window']}-day) | {_days(rec['dso'])} |",
         "",
         "---",
         "",
@@ -171,6 +117,49 @@ def generate_audit(data):
         due = i.get("due_date") or "TBD"
         lines.append(f"| {i['id']} | {i['client']} | {i['description'][:40]} | {fmt_pkr(i['amount'])} | {s} | {due} |")
 
+    lines += [
+        "",
+        "---",
+        "",
+        "## Receivables Aging",
+        "",
+        "| Days Past Due | Amount | % of Outstanding |",
+        "|---------------|--------|------------------|",
+    ]
+
+    for bucket, amt in rec["aging"].items():
+        pct = (amt / rec["outstanding"] * 100) if rec["outstanding"] > 0 else 0
+        lines.append(f"| {bucket} | {fmt_pkr(amt)} | {pct:.1f}% |")
+
+    lines += [
+        "",
+        "## Client Exposure",
+        "",
+        "| Client | Outstanding | Overdue | Open Invoices | Oldest (days past due) | DSO | Avg. Days Late |",
+        "|--------|-------------|---------|---------------|------------------------|-----|----------------|",
+    ]
+
+    for c in rec["clients"]:
+        oldest = f"{c['oldest_days']:.0f}" if (c["oldest_days"] or 0) > 0 else "—"
+        lines.append(f"| {c['client']} | {fmt_pkr(c['outstanding'])} | {fmt_pkr(c['overdue'])} | {c['invoices']} | {oldest} "
+                     f"| {_days(c['dso'])} | {_days(c['avg_delay'])} |")
+
+    lines += [
+        "",
+        "---",
+        "",
+        f"## Cash Projection — Next {len(rec['projection'])} Weeks",
+        "",
+        f"Opening balance {fmt_pkr(rec['opening_balance'])}. Inflows: open invoices at their due date plus the client's "
+        f"average delay. Outflows: recurring expenses ({len(rec['recurring'])} found).",
+        "",
+        "| Week of | Inflow | Outflow | Net | Balance |",
+        "|---------|--------|---------|-----|---------|",
+    ]
+
+    for w in rec["projection"]:
+        lines.append(f"| {w['week']} | {fmt_pkr(w['inflow'])} | {fmt_pkr(w['outflow'])} | {fmt_pkr(w['net'])} | {fmt_pkr(w['balance'])} |")
+
     lines += [
         "",
         "---",
@@ -181,11 +170,11 @@ def generate_audit(data):
         "|----------|--------|------------|",
     ]
 
-    for cat, amt in exp["by_category"].items():
-        pct = (amt / exp["total"] * 100) if exp["total"] > 0 else 0
+    for cat, amt in sm["by_category"].items():
+        pct = (amt / sm["expense_total"] * 100) if sm["expense_total"] > 0 else 0
         lines.append(f"| {cat} | {fmt_pkr(amt)} | {pct:.1f}% |")
 
-    lines.append(f"| **Total** | **{fmt_pkr(exp['total'])}** | **100%** |")
+    lines.append(f"| **Total** | **{fmt_pkr(sm['expense_total'])}** | **100%** |")
 
     lines += [
         "",
@@ -209,28 +198,30 @@ def generate_audit(data):
         "",
     ]
 
-    if inv["overdue"]:
-        lines.append(f"**1. URGENT — Overdue Invoices ({fmt_pkr(inv['overdue_total'])})**")
-        for i in inv["overdue"]:
-            days = (date.today() - date.fromisoformat(i["due_date"])).days
-            lines.append(f"   - {i['id']} ({i['client']}): {days} days overdue — send payment reminder immediately")
+    # Past due by due date — an invoice still marked "pending" counts once its due date passes
+    late = accounting_analytics.past_due(inv)
+    upcoming = inv[inv["status"].isin(accounting_analytics.OPEN_STATUSES)].drop(late.index)
+    if not late.empty:
+        lines.append(f"**1. URGENT — Overdue Invoices ({fmt_pkr(rec['past_due'])})**")
+        for i in late.itertuples(index=False):
+            lines.append(f"   - {i.id} ({i.client}): {i.days_past_due:.0f} days overdue — send payment reminder immediately")
         lines.append("")
 
-    if inv["pending"]:
-        lines.append(f"**2. Follow Up — Pending Invoices ({fmt_pkr(sum(i['amount'] for i in inv['pending']))})**")
-        for i in inv["pending"]:
-            lines.append(f"   - {i['id']} ({i['client']}): due {i['due_date']} — monitor and send reminder 3 days before due")
+    if not upcoming.empty:
+        lines.append(f"**2. Follow Up — Pending Invoices ({fmt_pkr(upcoming['amount'].sum())})**")
+        for i in upcoming.itertuples(index=False):
+            lines.append(f"   - {i.id} ({i.client}): due {i.due_date} — monitor and send reminder 3 days before due")
         lines.append("")
 
-    if inv["draft"]:
+    if sm["counts"]["draft"]:
         lines.append(f"**3. Finalize Drafts**")
-        for i in inv["draft"]:
-            lines.append(f"   - {i['id']} ({i['client']}): draft invoice — finalize and send to client")
+        for i in inv[inv["status"] == "draft"].itertuples(index=False):
+            lines.append(f"   - {i.id} ({i.client}): draft invoice — finalize and send to client")
         lines.append("")
 
-    top_expense = list(exp["by_category"].keys())[0] if exp["by_category"] else None
+    top_expense = next(iter(sm["by_category"]), None)
     if top_expense:
-        lines.append(f"**4. Expense Watch:** Largest category is **{top_expense}** ({fmt_pkr(exp['by_category'][top_expense])}). Review for optimization opportunities.")
+        lines.append(f"**4. Expense Watch:** Largest category is **{top_expense}** ({fmt_pkr(sm['by_category'][top_expense])}). Review for optimization opportunities.")
         lines.append("")
 
     lines += [
@@ -244,16 +235,14 @@ def generate_audit(data):
     return audit_path
 
 
-def create_overdue_tasks(data):
-    """Create tasks in Needs_Action/ for overdue invoices."""
+def create_overdue_tasks(data, summary=None):
+    """Create tasks in Needs_Action/ for invoices past their due date."""
     TASKS_DIR.mkdir(parents=True, exist_ok=True)
     now = datetime.now().strftime("%Y-%m-%d %H:%M")
     created = []
+    sm = summary or accounting_analytics.summarize(data)
 
-    for inv in data.get("invoices", []):
-        if inv["status"] != "overdue":
-            continue
-
+    for inv in accounting_analytics.past_due(sm["invoices"]).to_dict("records"):
         safe_name = sanitize_filename(inv["id"])
         filename = f"ACCT_TASK_{safe_name}.md"
         filepath = TASKS_DIR / filename
@@ -261,7 +250,7 @@ def create_overdue_tasks(data):
         if filepath.exists():
             continue
 
-        days_overdue = (date.today() - date.fromisoformat(inv["due_date"])).days
+        days_overdue = int(inv["days_past_due"])
 
         content = f"""# Accounting Task: Overdue Invoice {inv['id']}
 
@@ -312,13 +301,18 @@ def run_scan():
     expenses = data.get("expenses", [])
     print(f"  [SCAN] {len(invoices)} invoices, {len(expenses)} expenses loaded")
 
+    # Figures and the receivables report — computed once per sync, saved for the dashboard
+    summary = accounting_analytics.summarize(data)
+    rec = receivables.cached(data, summary)
+    print(f"  [AR] past due {fmt_pkr(rec['past_due'])}, DSO {_days(rec['dso'])}, "
+          f"13-week low {fmt_pkr(min(w['balance'] for w in rec['projection']))}")
+
     # Generate audit
-    audit_path = generate_audit(data)
-    overdue_count = sum(1 for i in invoices if i["status"] == "overdue")
-    print(f"  [AUDIT] {audit_path.name} (overdue: {overdue_count})")
+    audit_path = generate_audit(data, summary, rec)
+    print(f"  [AUDIT] {audit_path.name} (overdue: {len(accounting_analytics.past_due(summary['invoices']))})")
 
     # Create tasks for overdue invoices
-    created = create_overdue_tasks(data)
+    created = create_overdue_tasks(data, summary)
     for f in created:
         print(f"  [TASK] {f}")
 
@@ -338,9 +332,16 @@ def main():
     print(f"  Data:     {DATA_FILE}")
     print(f"  Company:  Multicraft Agency")
     print()
-    print("  [MODE] Mock data — Odoo JSON-RPC integration pending")
+    if odoo_client.configured():
+        print(f"  [MODE] Live Odoo — {odoo_client.ODOO_URL} ({odoo_client.ODOO_DB})")
+    else:
+        print("  [MODE] Mock data — set ODOO_URL / ODOO_DB / ODOO_USER / ODOO_PASSWORD for live Odoo")
     print()
 
+    # Forget the local mirror so the next sync pulls every record again
+    if "--resync" in sys.argv:
+        odoo_store.clear()
+
     # Single-run mode
     if "--once" in sys.argv:
         run_scan()
@@ -0,0 +1,245 @@
+"""
+Odoo Store — Local Invoice / Expense Mirror with write_date Watermarks
+Keeps the raw Odoo invoice and expense records in a local SQLite database.
+Each sync asks Odoo only for records written since the last write_date
+watermark and applies them as upserts (cancelled / refused records are
+deleted), so a sync costs as much as what changed since the previous one.
+Hard deletes in Odoo leave no write_date behind; those are caught by a
+reconciliation of (id, write_date) pairs at most every RECONCILE_EVERY seconds.
+
+The dashboard and odoo_mcp_bridge read from here via load(), so neither
+waits on the network. Statuses (overdue vs pending) are derived at read
+time, so they stay correct without a sync.
+"""
+
+import json
+import sqlite3
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+import odoo_client
+
+BASE_DIR = Path(__file__).resolve().parent
+STORE_FILE = BASE_DIR / ".odoo_store.db"
+STORE_VERSION = 1  # bump whenever the stored record shape changes
+RECONCILE_EVERY = 24 * 3600  # seconds between full id reconciliations
+
+# kind -> (model, base domain, fields, "gone" predicate on a raw record, mapper)
+KINDS = {
+    "invoices": ("account.move", [["move_type", "=", "out_invoice"]], odoo_client.INVOICE_FIELDS,
+                 lambda rec: rec.get("state") == "cancel", odoo_client.map_invoice),
+    "expenses": ("hr.expense", [], odoo_client.EXPENSE_FIELDS,
+                 lambda rec: rec.get("state") == "refused", lambda rec, today=None: odoo_client.map_expense(rec)),
+}
+
+
+def _connect():
+    """Open the store, resetting it if the schema version changed."""
+    conn = sqlite3.connect(str(STORE_FILE), timeout=10)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != STORE_VERSION:
+        for kind in KINDS:
+            conn.execute(f"DROP TABLE IF EXISTS {kind}")
+        conn.execute("DROP TABLE IF EXISTS meta")
+        conn.execute(f"PRAGMA user_version = {STORE_VERSION}")
+    # WAL lets the dashboard read while the bridge is syncing
+    conn.execute("PRAGMA journal_mode=WAL")
+    for kind in KINDS:
+        conn.execute(
+            f"""CREATE TABLE IF NOT EXISTS {kind} (
+                   odoo_id    INTEGER PRIMARY KEY,
+                   write_date TEXT    NOT NULL,
+                   data       TEXT    NOT NULL
+               )"""
+        )
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    return conn
+
+
+def _get_meta(conn, key, default=None):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return json.loads(row[0]) if row else default
+
+
+def _set_meta(conn, key, value):
+    conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, json.dumps(value)))
+
+
+# ──────────────────────────────────────────────
+# SYNC
+# ──────────────────────────────────────────────
+def _apply(conn, kind, records):
+    """Upsert live records and delete gone ones in one transaction. Returns (upserted, deleted)."""
+    gone = KINDS[kind][3]
+    rows, dead = [], []
+    for rec in records:
+        if gone(rec):
+            dead.append((rec["id"],))
+        else:
+            rows.append((rec["id"], rec.get("write_date") or "", json.dumps(rec)))
+    with conn:
+        conn.executemany(f"INSERT OR REPLACE INTO {kind} VALUES (?, ?, ?)", rows)
+        conn.executemany(f"DELETE FROM {kind} WHERE odoo_id = ?", dead)
+    return len(rows), len(dead)
+
+
+def _sync_kind(conn, client, kind):
+    """Pull records of one kind changed since its watermark. Returns (upserted, deleted).
+
+    Odoo returns write_date truncated to the second, so "=" on it never
+    matches and ">" skips the rest of that second. Pages therefore ask for
+    write_date >= the watermark's second minus the ids already applied in
+    that second. The watermark advances page by page (an interrupted sync
+    resumes where it stopped), and a bulk import that stamped thousands of
+    rows with the same second is still read exactly once.
+    """
+    model, domain, fields, _, _ = KINDS[kind]
+    fields = ["id", *fields]
+    wd, seen = _get_meta(conn, f"{kind}_watermark") or ["", []]
+    seen = set(seen) if isinstance(seen, list) else set()  # older stores kept the last id only
+    upserted = deleted = 0
+    while True:
+        after = [["write_date", ">=", wd], ["id", "not in", sorted(seen)]] if wd else []
+        page = client.execute_kw(model, "search_read", [domain + after],
+                                 {"fields": fields, "order": "write_date asc, id asc", "limit": client.page_size})
+        if not page:
+            break
+        up, dead = _apply(conn, kind, page)
+        upserted += up
+        deleted += dead
+        last = page[-1]["write_date"]
+        if last != wd:
+            wd, seen = last, set()
+        seen.update(rec["id"] for rec in page if rec["write_date"] == wd)
+        with conn:
+            _set_meta(conn, f"{kind}_watermark", [wd, sorted(seen)])
+        if len(page) < client.page_size:
+            break
+    return upserted, deleted
+
+
+def _reconcile_kind(conn, client, kind):
+    """Compare (id, write_date) of every record with the local rows: drop rows
+    deleted in Odoo and re-read rows whose write_date differs (a transaction
+    that committed after the sync had read past its timestamp). Returns
+    (upserted, deleted)."""
+    model, domain, fields, _, _ = KINDS[kind]
+    remote = {}
+    for page in client.search_read_pages(model, domain, ["write_date"]):
+        remote.update((rec["id"], rec.get("write_date") or "") for rec in page)
+    local = dict(conn.execute(f"SELECT odoo_id, write_date FROM {kind}"))
+    stale = [(i,) for i in local if i not in remote]
+    with conn:
+        conn.executemany(f"DELETE FROM {kind} WHERE odoo_id = ?", stale)
+    changed = [i for i, wd in remote.items() if i in local and local[i] != wd]
+    upserted, deleted = 0, len(stale)
+    for start in range(0, len(changed), client.page_size):
+        chunk = changed[start:start + client.page_size]
+        page = client.execute_kw(model, "search_read", [[["id", "in", chunk]]], {"fields": ["id", *fields]})
+        up, dead = _apply(conn, kind, page)
+        upserted += up
+        deleted += dead
+    return upserted, deleted
+
+
+def sync(client, reconcile=None):
+    """Bring the store up to date with Odoo. Returns {kind: (upserted, deleted)}.
+
+    Expenses and the bank balance are optional (a database may lack
+    hr_expense); invoice errors propagate to the caller.
+    """
+    conn = _connect()
+    try:
+        now = time.time()
+        if reconcile is None:
+            # a first (full) sync has nothing to reconcile — it just starts the clock
+            reconciled_at = _get_meta(conn, "reconciled_at")
+            if reconciled_at is None:
+                with conn:
+                    _set_meta(conn, "reconciled_at", now)
+            reconcile = reconciled_at is not None and now - reconciled_at >= RECONCILE_EVERY
+        result = {}
+        for kind in KINDS:
+            try:
+                upserted, deleted = _sync_kind(conn, client, kind)
+                if reconcile:
+                    up, dead = _reconcile_kind(conn, client, kind)
+                    upserted += up
+                    deleted += dead
+            except odoo_client.OdooError as e:
+                if kind == "invoices":
+                    raise
+                print(f"  [WARN] Odoo {kind} unavailable: {e}")
+                continue
+            result[kind] = (upserted, deleted)
+        try:
+            bank = odoo_client.bank_balance(client)
+        except odoo_client.OdooError as e:
+            print(f"  [WARN] Odoo bank balance unavailable: {e}")
+            bank = None
+        with conn:
+            if bank is not None:
+                _set_meta(conn, "bank_balance", bank)
+            if reconcile:
+                _set_meta(conn, "reconciled_at", now)
+            _set_meta(conn, "source", f"odoo:{client.db}")
+            _set_meta(conn, "last_synced", datetime.now().isoformat(timespec="seconds"))
+        return result
+    finally:
+        conn.close()
+
+
+# ──────────────────────────────────────────────
+# READ SIDE
+# ──────────────────────────────────────────────
+def last_synced():
+    """ISO time of the last successful sync, or None (cheap — one row)."""
+    if not STORE_FILE.exists():
+        return None
+    conn = _connect()
+    try:
+        return _get_meta(conn, "last_synced")
+    finally:
+        conn.close()
+
+
+def load(today=None):
+    """The mirrored data in the accounting_status.json shape, or None if
+    the store was never synced."""
+    if not STORE_FILE.exists():
+        return None
+    today = today or date.today()
+    conn = _connect()
+    try:
+        synced = _get_meta(conn, "last_synced")
+        if synced is None:
+            return None
+        data = {
+            "last_synced": synced,
+            "source": _get_meta(conn, "source", "odoo"),
+            "company": "Multicraft Agency",
+            "currency": "PKR",
+            "fiscal_month": today.strftime("%B %Y"),
+            "bank_balance": _get_meta(conn, "bank_balance", {}),
+        }
+        for kind, (_, _, _, _, mapper) in KINDS.items():
+            data[kind] = [
+                mapper(json.loads(raw), today)
+                for (raw,) in conn.execute(f"SELECT data FROM {kind} ORDER BY odoo_id")
+            ]
+        return data
+    finally:
+        conn.close()
+
+
+def clear():
+    """Forget every record and watermark (the next sync pulls everything)."""
+    if STORE_FILE.exists():
+        conn = _connect()
+        try:
+            with conn:
+                for kind in KINDS:
+                    conn.execute(f"DELETE FROM {kind}")
+                conn.execute("DELETE FROM meta")
+        finally:
+            conn.close()
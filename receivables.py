@@ -0,0 +1,177 @@
+"""
+Receivables — Aging, DSO and a 13-Week Cash Projection
+Built on the accounting_analytics frames. report() derives, from due and
+issue dates rather than the stored status string:
+  - aging of open invoices by days past due (0-30 / 31-60 / 61-90 / 90+),
+  - DSO per client and overall over the trailing DSO_WINDOW days,
+  - a rolling 13-week cash projection from the bank balance: open invoices
+    come in on their due date shifted by the client's average payment
+    delay, recurring expenses (seen in two or more months) go out at their
+    monthly cadence.
+
+odoo_mcp_bridge computes the report once per sync and saves it to
+.receivables.json; cached() returns that copy while the data's
+last_synced stamp (and, for accounting_status.json, the file's mtime and
+size) is unchanged, so the dashboard never recomputes it on a render.
+"""
+
+import json
+import os
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+import accounting_analytics
+import vault_json
+
+BASE_DIR = Path(__file__).resolve().parent
+CACHE_FILE = BASE_DIR / ".receivables.json"
+DATA_FILE = BASE_DIR / "accounting_status.json"  # the non-Odoo source
+REPORT_VERSION = 1  # bump whenever the report's figures or shape change
+DSO_WINDOW = 90  # days of invoicing DSO is measured against
+WEEKS = 13  # cash projection horizon
+RECURRING_MIN_MONTHS = 2  # an expense seen in this many months recurs
+RECURRING_LOOKBACK = 62  # days — a recurring expense must have been seen this recently
+
+
+def _records(df):
+    """Frame rows as JSON-ready dicts (NaN → None, numpy → Python numbers)."""
+    return json.loads(df.to_json(orient="records"))
+
+
+def _num(value):
+    return None if pd.isna(value) else round(float(value), 1)
+
+
+# ──────────────────────────────────────────────
+# ENGINE
+# ──────────────────────────────────────────────
+def client_terms(inv, today, window=DSO_WINDOW):
+    """Per-client DSO (open receivables / invoicing over the window × days)
+    and average days paid late, indexed by client."""
+    since = today - pd.Timedelta(days=window)
+    billed = inv["status"] != "draft"
+    recent = billed & (inv["issued"] > since) & (inv["issued"] <= today)
+    is_open = inv["status"].isin(accounting_analytics.OPEN_STATUSES)
+    per_client = pd.DataFrame({
+        "client": inv["client"],
+        "receivable": inv["amount"].where(is_open, 0.0),
+        "sales": inv["amount"].where(recent, 0.0),
+        # how late paid invoices were settled (early payment counts as on time)
+        "delay": (inv["paid"] - inv["due"]).dt.days.clip(lower=0).where(inv["status"] == "paid"),
+    }).groupby("client").agg(receivable=("receivable", "sum"), sales=("sales", "sum"), avg_delay=("delay", "mean"))
+    per_client["dso"] = (per_client["receivable"] / per_client["sales"] * window).where(per_client["sales"] > 0)
+    return per_client
+
+
+def recurring_expenses(exp, today):
+    """Expenses seen in RECURRING_MIN_MONTHS+ distinct months (same category
+    and description), still active, with their typical monthly amount."""
+    dated = exp.dropna(subset=["day"])
+    items = (
+        dated.assign(month=dated["day"].dt.to_period("M"))
+        .groupby(["category", "description"])
+        .agg(months=("month", "nunique"), monthly=("amount", "median"), last=("day", "max"))
+        .reset_index()
+    )
+    active = (items["months"] >= RECURRING_MIN_MONTHS) & (items["last"] >= today - pd.Timedelta(days=RECURRING_LOOKBACK))
+    return items[active]
+
+
+def cash_projection(inv, exp, today, opening, terms=None, weeks=WEEKS):
+    """Weekly inflow / outflow / net / running balance for the next `weeks`
+    weeks, starting with the current week (Monday)."""
+    start = today - pd.Timedelta(days=today.weekday())
+    end = start + pd.Timedelta(weeks=weeks)
+    week_starts = pd.date_range(start, periods=weeks, freq="7D")
+
+    def week_of(dates):
+        # past-due expectations land in the current week
+        return ((dates - start).dt.days // 7).clip(lower=0)
+
+    open_inv = inv[inv["status"].isin(accounting_analytics.OPEN_STATUSES)]
+    terms = terms if terms is not None else client_terms(inv, today)
+    delay = open_inv["client"].map(terms["avg_delay"]).fillna(0)
+    expected = open_inv["due"].fillna(today) + pd.to_timedelta(delay.round(), unit="D")
+    inflow = open_inv["amount"].groupby(week_of(expected)).sum()
+
+    recurring = recurring_expenses(exp, today)
+    # next occurrences one, two, ... months after the last one, inside the horizon
+    due = pd.concat([
+        pd.DataFrame({"day": recurring["last"] + pd.DateOffset(months=k), "amount": recurring["monthly"]})
+        for k in range(1, weeks // 4 + 3)
+    ]) if not recurring.empty else pd.DataFrame({"day": pd.Series(dtype="datetime64[ns]"), "amount": []})
+    due = due[(due["day"] >= start) & (due["day"] < end)]
+    outflow = due["amount"].groupby(week_of(due["day"])).sum()
+
+    proj = pd.DataFrame({"week": week_starts.strftime("%Y-%m-%d")})
+    proj["inflow"] = inflow.reindex(range(weeks), fill_value=0.0).to_numpy()
+    proj["outflow"] = outflow.reindex(range(weeks), fill_value=0.0).to_numpy()
+    proj["net"] = proj["inflow"] - proj["outflow"]
+    proj["balance"] = opening + proj["net"].cumsum()
+    return proj, recurring
+
+
+def report(data, summary=None, today=None):
+    """The receivables report as a JSON-ready dict."""
+    today = pd.Timestamp(today or date.today())
+    sm = summary or accounting_analytics.summarize(data, today)
+    inv, exp = sm["invoices"], sm["expenses"]
+    opening = float((data.get("bank_balance") or {}).get("balance") or 0)
+
+    terms = client_terms(inv, today)
+    clients = sm["clients"].join(terms[["dso", "avg_delay"]], how="left").reset_index()
+    sales = terms["sales"].sum()
+    proj, recurring = cash_projection(inv, exp, today, opening, terms)
+
+    return {
+        "key": cache_key(data, today.date()),
+        "as_of": today.date().isoformat(),
+        "dso_window": DSO_WINDOW,
+        "dso": _num(sm["outstanding"] / sales * DSO_WINDOW) if sales > 0 else None,
+        "outstanding": sm["outstanding"],
+        "past_due": float(accounting_analytics.past_due(inv)["amount"].sum()),
+        "aging": sm["aging"],
+        "clients": _records(clients.round({"dso": 1, "avg_delay": 1})),
+        "opening_balance": opening,
+        "projection": _records(proj),
+        "recurring": _records(recurring[["category", "description", "monthly"]]),
+    }
+
+
+# ──────────────────────────────────────────────
+# CACHE — one report per sync
+# ──────────────────────────────────────────────
+def cache_key(data, today=None):
+    """Identifies one state of the data: its source and sync stamp (set by
+    every Odoo sync and accounting export), plus the day — aging moves daily.
+    A hand-edited accounting_status.json keeps its last_synced, so for
+    non-Odoo data the file's mtime and size are part of the key too."""
+    source = data.get("source") or "accounting_status.json"
+    key = [REPORT_VERSION, source, data.get("last_synced"), (today or date.today()).isoformat()]
+    if not source.startswith("odoo"):
+        key.append(vault_json.stamp(DATA_FILE, data))
+    return key
+
+
+def save(rep):
+    tmp = CACHE_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(rep, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, CACHE_FILE)
+
+
+def cached(data, summary=None, today=None, write=True):
+    """The saved report if it belongs to this data, else a fresh one
+    (saved for the next reader when write=True)."""
+    key = cache_key(data, today)
+    try:
+        rep = json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+        if rep.get("key") == key:
+            return rep
+    except (OSError, ValueError):
+        pass
+    rep = report(data, summary, today)
+    if write:
+        save(rep)
+    return rep
@@ -0,0 +1,276 @@
+"""
+Scheduler — One Process for Every Polling Agent
+Runs the scan functions of agent_brain, gmail_bridge, odoo_mcp_bridge,
+social_media_agent and whatsapp_sender as jobs in a single interpreter,
+instead of five processes each sleeping in its own `while True` loop.
+
+A heap of (due time, job) drives a small thread pool. A job is only
+rescheduled after its previous run finished, so a slow run never overlaps
+itself; every due time gets random jitter so the jobs do not fire in
+lockstep, and a failing job backs off without holding up the others.
+Per-job timing stats are printed on exit and saved to .scheduler_stats.json.
+
+Usage:
+    python scheduler.py                      # run every job
+    python scheduler.py --only brain,gmail   # a subset (brain, gmail, odoo, social, whatsapp)
+    python scheduler.py --once               # run each job once and exit
+    python scheduler.py --stats              # print the stats of the running scheduler
+"""
+
+import heapq
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+STATS_FILE = BASE_DIR / ".scheduler_stats.json"
+JITTER = 0.1  # fraction of the interval a due time may move either way
+MAX_JITTER = 30  # seconds — cap for the jitter of long intervals
+STARTUP_SPREAD = 10  # seconds — first runs are spread over this window
+MAX_BACKOFF = 1800  # seconds — ceiling for a failing job's retry delay
+MAX_WORKERS = 4
+
+
+# ──────────────────────────────────────────────
+# JOB SETUP — import a module once, return (run function, interval)
+# ──────────────────────────────────────────────
+def _setup_brain():
+    import agent_brain
+    return agent_brain.run_scan, agent_brain.POLL_INTERVAL
+
+
+def _setup_gmail():
+    sys.path.insert(0, str(BASE_DIR / "watchers"))
+    import gmail_bridge
+    service = gmail_bridge.authenticate()  # may prompt for sign-in — done before the loop starts
+    return (lambda: gmail_bridge.fetch_unread_emails(service)), gmail_bridge.POLL_INTERVAL
+
+
+def _setup_odoo():
+    import odoo_mcp_bridge
+    return odoo_mcp_bridge.run_scan, odoo_mcp_bridge.POLL_INTERVAL
+
+
+def _setup_social():
+    import social_media_agent
+    return social_media_agent.run_scan, social_media_agent.POLL_INTERVAL
+
+
+def _setup_whatsapp():
+    import whatsapp_sender
+
+    def run():
+        # The daemon already sends approved messages — a second browser would fight it
+        if whatsapp_sender.daemon_status():
+            return "daemon active — skipped"
+        return whatsapp_sender.process_approved()
+
+    return run, 60  # same cadence as whatsapp_sender --watch
+
+
+JOBS = {
+    "brain": _setup_brain,
+    "gmail": _setup_gmail,
+    "odoo": _setup_odoo,
+    "social": _setup_social,
+    "whatsapp": _setup_whatsapp,
+}
+
+
+class Job:
+    """One scheduled function with its timing stats."""
+
+    def __init__(self, name, func, interval):
+        self.name = name
+        self.func = func
+        self.interval = max(int(interval), 10)
+        self.failures = 0
+        self.runs = 0
+        self.errors = 0
+        self.overruns = 0  # runs that took longer than the interval
+        self.total = 0.0
+        self.max = 0.0
+        self.last = None
+        self.last_result = None
+        self.last_error = None
+        self.last_run = None
+
+    def run(self):
+        """Call the job function. SystemExit from a module (e.g. missing
+        credentials) is a failed run, not a scheduler exit."""
+        try:
+            return self.func()
+        except SystemExit as e:
+            raise RuntimeError(f"job exited (code {e.code})") from None
+
+    def record(self, seconds, result=None, error=None):
+        self.runs += 1
+        self.last = seconds
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.last_run = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.last_result = None if result is None else str(result)
+        self.last_error = error
+        if error is not None:
+            self.errors += 1
+        if seconds > self.interval:
+            self.overruns += 1
+
+    def next_delay(self, ok):
+        """Seconds until the next run: the interval (doubled per consecutive
+        failure) with jitter, so jobs with equal intervals drift apart."""
+        if ok:
+            self.failures = 0
+            base = self.interval
+        else:
+            self.failures += 1
+            base = min(self.interval * (2 ** self.failures), MAX_BACKOFF)
+        spread = min(base * JITTER, MAX_JITTER)
+        return max(1.0, base + random.uniform(-spread, spread))
+
+    def stats(self):
+        return {
+            "interval": self.interval,
+            "runs": self.runs,
+            "errors": self.errors,
+            "overruns": self.overruns,
+            "avg": round(self.total / self.runs, 3) if self.runs else None,
+            "max": round(self.max, 3),
+            "last": round(self.last, 3) if self.last is not None else None,
+            "last_run": self.last_run,
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+        }
+
+
+def load_jobs(names):
+    """Import each job's module. A module that cannot be imported here (missing
+    dependency, no credentials) disables that job only."""
+    jobs = []
+    for name in names:
+        try:
+            func, interval = JOBS[name]()
+        except (Exception, SystemExit) as e:
+            code = f"exit {e.code}" if isinstance(e, SystemExit) else f"{type(e).__name__}: {e}"
+            print(f"[SKIP] {name}: could not load ({code})")
+            continue
+        jobs.append(Job(name, func, interval))
+        print(f"[OK] {name}: every {interval}s")
+    return jobs
+
+
+def save_stats(jobs, started):
+    state = {
+        "pid": os.getpid(),
+        "started": started,
+        "updated": time.time(),
+        "jobs": {job.name: job.stats() for job in jobs},
+    }
+    tmp = STATS_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    os.replace(tmp, STATS_FILE)
+
+
+def print_stats(stats):
+    print(f"  {'job':<10} {'every':>6} {'runs':>5} {'errors':>6} {'over':>5} {'avg s':>7} {'max s':>7}  last run")
+    for name, s in stats.items():
+        avg = f"{s['avg']:.2f}" if s["avg"] is not None else "-"
+        print(f"  {name:<10} {s['interval']:>5}s {s['runs']:>5} {s['errors']:>6} {s['overruns']:>5} "
+              f"{avg:>7} {s['max']:>7.2f}  {s['last_run'] or '-'}")
+        if s["last_error"]:
+            print(f"  {'':<10} last error: {s['last_error']}")
+
+
+# ──────────────────────────────────────────────
+# SCHEDULER LOOP
+# ──────────────────────────────────────────────
+def run(jobs, once=False):
+    """Run jobs on a shared thread pool until Ctrl+C (or one round with once=True)."""
+    started = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    now = time.monotonic()
+    due = [(now + random.uniform(0, STARTUP_SPREAD if not once else 0), i) for i in range(len(jobs))]
+    heapq.heapify(due)
+    running = {}
+    remaining = len(jobs) if once else None
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(jobs)), thread_name_prefix="job") as pool:
+        while due or running:
+            now = time.monotonic()
+            while due and due[0][0] <= now:
+                _, i = heapq.heappop(due)
+                running[pool.submit(jobs[i].run)] = (i, time.perf_counter())
+
+            timeout = max(0, due[0][0] - now) if due else None
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                i, t0 = running.pop(future)
+                job = jobs[i]
+                seconds = time.perf_counter() - t0
+                stamp = datetime.now().strftime("%H:%M:%S")
+                try:
+                    result = future.result()
+                    job.record(seconds, result=result)
+                    delay = job.next_delay(ok=True)
+                    print(f"[{stamp}] [{job.name}] done in {seconds:.2f}s — next run in {delay:.0f}s")
+                except Exception as e:
+                    job.record(seconds, error=str(e))
+                    delay = job.next_delay(ok=False)
+                    print(f"[{stamp}] [{job.name}] [ERROR] {e} — backing off {delay:.0f}s")
+                save_stats(jobs, started)
+                if once:
+                    remaining -= 1
+                else:
+                    heapq.heappush(due, (time.monotonic() + delay, i))
+            if once and not remaining:
+                break
+
+
+def main():
+    if "--stats" in sys.argv:
+        try:
+            state = json.loads(STATS_FILE.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            print("[INFO] No scheduler stats yet.")
+            return
+        print(f"Scheduler pid {state['pid']} — started {state['started']}, "
+              f"updated {datetime.fromtimestamp(state['updated']):%H:%M:%S}")
+        print_stats(state["jobs"])
+        return
+
+    print("=" * 50)
+    print("  Scheduler — All Polling Agents, One Process")
+    print("=" * 50)
+    print()
+
+    names = list(JOBS)
+    if "--only" in sys.argv:
+        try:
+            names = [n.strip() for n in sys.argv[sys.argv.index("--only") + 1].split(",") if n.strip()]
+        except IndexError:
+            names = []
+        unknown = [n for n in names if n not in JOBS]
+        if not names or unknown:
+            print(f"[ERROR] --only takes a comma-separated list of: {', '.join(JOBS)}")
+            sys.exit(2)
+
+    jobs = load_jobs(names)
+    if not jobs:
+        print("[ERROR] No job could be loaded.")
+        sys.exit(1)
+
+    print(f"\n[LOOP] {len(jobs)} job(s) in one process. Press Ctrl+C to stop.\n")
+    try:
+        run(jobs, once="--once" in sys.argv)
+    except KeyboardInterrupt:
+        print("\n[STOP] Stopped by user.")
+    print()
+    print_stats({job.name: job.stats() for job in jobs})
+
+
+if __name__ == "__main__":
+    main()
@@ -5,27 +5,46 @@ generates a summary in Readings/Social_Summary.md, and creates
 tasks in Needs_Action/Social/ for business inquiries.
 """
 
-import json
 import sys
 import time
 import re
 from pathlib import Path
 from datetime import datetime
 
+import vault_json
+from keyword_matcher import KeywordMatcher
+
 BASE_DIR = Path(__file__).resolve().parent
 DATA_FILE = BASE_DIR / "social_updates.json"
 READINGS_DIR = BASE_DIR / "Readings"
 SOCIAL_TASKS_DIR = BASE_DIR / "Needs_Action" / "Social"
 POLL_INTERVAL = 300  # seconds (5 minutes)
 
+# Suggested responses keyed by keyword groups — first matching group wins
+RESPONSE_RULES = [
+    (["rate", "price", "cost", "budget", "quote"],
+     "Send {sender} the Multicraft Agency services & pricing deck"),
+    (["call", "schedule", "meeting", "consult"],
+     "Schedule a discovery call with {sender} via Calendly"),
+    (["app", "website", "mobile", "web"],
+     "Share portfolio and discuss project scope with {sender}"),
+    (["partner", "collaboration", "automation", "ai"],
+     "Arrange a Lyvexa AI consultation session with {sender}"),
+]
+DEFAULT_RESPONSE = "Follow up with {sender} to understand their requirements"
+
+RESPONSE_MATCHER = KeywordMatcher(
+    (word, template) for words, template in RESPONSE_RULES for word in words
+)
+
 
 def load_social_data():
-    """Load mock social media data from JSON."""
-    if not DATA_FILE.exists():
+    """Load social media data from social_updates.json (or .jsonl) — streamed,
+    and only re-parsed when the file changed since the last scan."""
+    data = vault_json.load(DATA_FILE)
+    if data is None:
         print(f"  [ERROR] {DATA_FILE.name} not found.")
-        return None
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return data
 
 
 def sanitize_filename(name):
@@ -42,18 +61,9 @@ def classify_message(msg):
 
 def suggest_response(msg):
     """Generate a one-line suggested response for a business inquiry."""
-    content = msg.get("content", "").lower()
     sender = msg.get("from", "Unknown")
-
-    if any(w in content for w in ["rate", "price", "cost", "budget", "quote"]):
-        return f"Send {sender} the Multicraft Agency services & pricing deck"
-    if any(w in content for w in ["call", "schedule", "meeting", "consult"]):
-        return f"Schedule a discovery call with {sender} via Calendly"
-    if any(w in content for w in ["app", "website", "mobile", "web"]):
-        return f"Share portfolio and discuss project scope with {sender}"
-    if any(w in content for w in ["partner", "collaboration", "automation", "ai"]):
-        return f"Arrange a Lyvexa AI consultation session with {sender}"
-    return f"Follow up with {sender} to understand their requirements"
+    template = RESPONSE_MATCHER.first(msg.get("content", ""), DEFAULT_RESPONSE)
+    return template.format(sender=sender)
 
 
 def generate_summary(data):
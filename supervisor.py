@@ -0,0 +1,500 @@
+"""
+Supervisor — Owner of the Background Watcher Processes
+Runs the scripts in WATCHERS as child processes, restarts crashed ones with
+exponential backoff and answers status / start / stop requests on a
+localhost control socket. The dashboard asks the supervisor instead of
+keeping Popen handles in st.session_state, so a browser refresh or a second
+tab sees the same processes and can never start duplicates.
+
+Protocol: one JSON object per line over TCP on 127.0.0.1:SUPERVISOR_PORT
+    {"cmd": "status"}                     -> {"ok": true, "watchers": {name: {...}}}
+    {"cmd": "start", "name": "..."}       -> {"ok": true}   (also: stop, restart)
+
+Which watchers should be running is remembered in .supervisor.json, so a
+restarted supervisor brings them back and reaps any orphans of its
+predecessor. CPU / RSS come from psutil when installed, else /proc (Linux).
+
+Usage:
+    python supervisor.py                  # run the supervisor (foreground)
+    python supervisor.py status           # print watcher status
+    python supervisor.py start <name>     # start | stop | restart <name|all>
+    python supervisor.py shutdown         # stop every watcher and the supervisor
+"""
+
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import vault_logs
+
+try:
+    import psutil
+except ImportError:  # optional — /proc fallback below
+    psutil = None
+
+# ──────────────────────────────────────────────
+# CONFIGURATION
+# ──────────────────────────────────────────────
+BASE_DIR = Path(__file__).resolve().parent
+STATE_FILE = BASE_DIR / ".supervisor.json"
+LOGS_DIR = BASE_DIR / "logs"
+WATCHER_LOG_DIR = LOGS_DIR / "watchers"  # one stdout/stderr log per watcher
+ACTIVITY_LOG = LOGS_DIR / "agent_activity.log"  # shown in the dashboard console
+
+HOST = "127.0.0.1"
+PORT = int(os.environ.get("SUPERVISOR_PORT", "8765"))
+REQUEST_TIMEOUT = 1.0  # seconds — the dashboard must never hang on the supervisor
+TICK = 1.0  # seconds between process checks
+RESTART_BASE = 2  # seconds — first restart delay, doubled per consecutive crash
+RESTART_MAX = 300  # seconds — ceiling for the restart delay
+STABLE_AFTER = 60  # seconds — a child that ran this long resets the backoff
+STATE_MAX_AGE = 10  # seconds — an older state file means the supervisor is gone
+LOG_CHECK_EVERY = 30  # seconds between size checks of the running watchers' logs
+
+WATCHERS = {
+    "Gmail Bridge": "watchers/gmail_bridge.py",
+    "Desktop Watcher": "watchers/desktop_watcher.py",
+    "Agent Brain": "agent_brain.py",
+    "Social Media Agent": "social_media_agent.py",
+    "Odoo Bridge": "odoo_mcp_bridge.py",
+    "WhatsApp Daemon": "whatsapp_sender.py --daemon",
+    # Brain, Gmail, Odoo, Social + WhatsApp polling in ONE process — use instead of the single agents
+    "Scheduler": "scheduler.py",
+}
+
+# Watchers that run the same jobs as others and must never run alongside
+# them. "start all" starts the single agents and leaves these out.
+EXCLUSIVE = {
+    "Scheduler": ["Gmail Bridge", "Agent Brain", "Social Media Agent", "Odoo Bridge", "WhatsApp Daemon"],
+}
+
+
+# Watchers "start all" never starts — only an explicit Start. The daemon holds
+# the shared browser profile for its whole life, which blocks LinkedIn posting.
+OPT_IN = ["WhatsApp Daemon"]
+
+
+def overlaps(name):
+    """Watchers that do some of name's work (in either direction of EXCLUSIVE)."""
+    if name in EXCLUSIVE:
+        return list(EXCLUSIVE[name])
+    return [other for other, names in EXCLUSIVE.items() if name in names]
+
+
+def _log(message):
+    line = f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {message}"
+    print(line)
+    try:
+        vault_logs.append_line(ACTIVITY_LOG, f"\n{line}")
+    except OSError:
+        pass
+
+
+# ──────────────────────────────────────────────
+# PROCESS STATS (psutil, else /proc)
+# ──────────────────────────────────────────────
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def _proc_cpu_seconds(pid):
+    """utime + stime of pid from /proc/<pid>/stat, or None."""
+    try:
+        with open(f"/proc/{pid}/stat", encoding="ascii", errors="replace") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / _CLK_TCK
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _proc_rss(pid):
+    """Resident set size of pid in bytes from /proc/<pid>/status, or None."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii", errors="replace") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _cmdline(pid):
+    """Command line of pid as one string ("" when it cannot be read)."""
+    if psutil is not None:
+        try:
+            return " ".join(psutil.Process(pid).cmdline())
+        except (psutil.Error, OSError):
+            return ""
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().replace(b"\0", b" ").decode("utf-8", "replace")
+    except OSError:
+        return ""
+
+
+class ProcStats:
+    """CPU % and RSS per pid. CPU % is measured between two samples, so the
+    first reading of a new process is 0."""
+
+    def __init__(self):
+        self._procs = {}  # pid -> psutil.Process
+        self._last = {}  # pid -> (cpu seconds, monotonic time)
+
+    def sample(self, pid):
+        """(cpu_percent, rss_bytes) — either may be None if unavailable."""
+        if psutil is not None:
+            try:
+                proc = self._procs.get(pid)
+                if proc is None:
+                    proc = self._procs[pid] = psutil.Process(pid)
+                return proc.cpu_percent(None), proc.memory_info().rss
+            except (psutil.Error, OSError):
+                self._procs.pop(pid, None)
+                return None, None
+
+        cpu = _proc_cpu_seconds(pid)
+        now = time.monotonic()
+        percent = None
+        if cpu is not None:
+            prev = self._last.get(pid)
+            percent = 0.0
+            if prev and now > prev[1]:
+                percent = max(0.0, (cpu - prev[0]) / (now - prev[1]) * 100)
+            self._last[pid] = (cpu, now)
+        return percent, _proc_rss(pid)
+
+    def forget(self, pid):
+        self._procs.pop(pid, None)
+        self._last.pop(pid, None)
+
+
+# ──────────────────────────────────────────────
+# CHILD PROCESSES
+# ──────────────────────────────────────────────
+class Watcher:
+    """One supervised script: its process, restart backoff and counters."""
+
+    def __init__(self, name, command):
+        self.name = name
+        self.command = command
+        self.proc = None
+        self.wanted = False  # should be running (start requested, not stopped)
+        self.started_at = None
+        self.next_start = None  # monotonic time of a pending restart
+        self.crashes = 0  # consecutive crashes — drives the backoff
+        self.restarts = 0
+        self.last_exit = None
+
+    @property
+    def log_file(self):
+        return WATCHER_LOG_DIR / (self.name.lower().replace(" ", "_") + ".log")
+
+    def spawn(self):
+        script, *args = self.command.split()
+        WATCHER_LOG_DIR.mkdir(parents=True, exist_ok=True)
+        # While the child runs, the supervisor tick rotates its log by copy-truncate
+        vault_logs.rotate_if_needed(self.log_file)
+        with open(self.log_file, "a", encoding="utf-8") as out_f:
+            out_f.write(f"\n[{datetime.now():%Y-%m-%d %H:%M:%S}] --- started by supervisor ---\n")
+            out_f.flush()
+            kwargs = {"creationflags": 0x08000000} if os.name == "nt" else {"start_new_session": True}  # CREATE_NO_WINDOW
+            self.proc = subprocess.Popen(
+                [sys.executable, str(BASE_DIR / script), *args],
+                cwd=str(BASE_DIR),
+                stdout=out_f,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+                env=dict(os.environ, PYTHONUNBUFFERED="1"),
+                **kwargs,
+            )
+        self.started_at = time.monotonic()
+        self.next_start = None
+        _log(f"Starting {self.name} (pid {self.proc.pid})...")
+
+    def start(self):
+        self.wanted = True
+        self.crashes = 0
+        if self.proc is None:
+            self.spawn()
+
+    def stop(self):
+        self.wanted = False
+        self.next_start = None
+        if self.proc is None:
+            return
+        proc, self.proc = self.proc, None
+        try:
+            proc.terminate()
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait(timeout=5)
+        except OSError:
+            pass
+        _log(f"Stopped {self.name}.")
+
+    def poll(self):
+        """Notice a crashed child and (re)start it once its backoff has passed."""
+        now = time.monotonic()
+        if self.proc is not None:
+            code = self.proc.poll()
+            if code is None:
+                return
+            self.last_exit = code
+            ran = now - self.started_at
+            self.proc = None
+            if not self.wanted:
+                return
+            self.crashes = 1 if ran >= STABLE_AFTER else self.crashes + 1
+            delay = min(RESTART_BASE * 2 ** (self.crashes - 1), RESTART_MAX)
+            self.next_start = now + delay
+            _log(f"{self.name} exited with code {code} after {ran:.0f}s — restarting in {delay}s")
+        elif self.wanted and self.next_start is not None and now >= self.next_start:
+            self.restarts += 1
+            self.spawn()
+
+    def status(self, stats):
+        running = self.proc is not None
+        cpu, rss = stats.sample(self.proc.pid) if running else (None, None)
+        return {
+            "running": running,
+            "wanted": self.wanted,
+            "pid": self.proc.pid if running else None,
+            "uptime": round(time.monotonic() - self.started_at) if running else None,
+            "cpu": cpu,
+            "rss": rss,
+            "restarts": self.restarts,
+            "last_exit": self.last_exit,
+            "restart_in": round(max(0.0, self.next_start - time.monotonic())) if self.next_start else None,
+            "log": str(self.log_file.relative_to(BASE_DIR)),
+        }
+
+
+# ──────────────────────────────────────────────
+# SUPERVISOR
+# ──────────────────────────────────────────────
+class Supervisor:
+    def __init__(self, watchers=WATCHERS):
+        self.watchers = {name: Watcher(name, cmd) for name, cmd in watchers.items()}
+        self.stats = ProcStats()
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.next_log_check = 0.0
+
+    def handle(self, request):
+        """Execute one control request and return the reply dict."""
+        cmd = request.get("cmd")
+        name = request.get("name")
+        with self.lock:
+            if cmd == "ping":
+                return {"ok": True, "pid": os.getpid()}
+            if cmd == "status":
+                return {"ok": True, "pid": os.getpid(),
+                        "watchers": {n: w.status(self.stats) for n, w in self.watchers.items()}}
+            if cmd == "shutdown":
+                self.stopping.set()
+                return {"ok": True}
+            if cmd not in ("start", "stop", "restart"):
+                return {"ok": False, "error": f"unknown command: {cmd}"}
+            if name == "all":
+                targets = [w for w in self.watchers.values()
+                           if cmd == "stop" or (w.name not in EXCLUSIVE and w.name not in OPT_IN)]
+            elif name in self.watchers:
+                targets = [self.watchers[name]]
+            else:
+                return {"ok": False, "error": f"unknown watcher: {name}"}
+            errors = []
+            for w in targets:
+                if cmd in ("stop", "restart"):
+                    w.stop()
+                if cmd in ("start", "restart"):
+                    if not (BASE_DIR / w.command.split()[0]).exists():
+                        errors.append(f"{w.name}: script not found ({w.command})")
+                        continue
+                    busy = [n for n in overlaps(w.name) if self.watchers[n].wanted or self.watchers[n].proc is not None]
+                    if busy:
+                        errors.append(f"{w.name}: does the same work as {', '.join(busy)}, which must be stopped first")
+                        continue
+                    w.start()
+            self._save_state()
+            if errors:
+                return {"ok": False, "error": "; ".join(errors)}
+            return {"ok": True}
+
+    def tick(self):
+        with self.lock:
+            for w in self.watchers.values():
+                pid = w.proc.pid if w.proc is not None else None
+                w.poll()
+                if pid is not None and w.proc is None:
+                    self.stats.forget(pid)
+            self._save_state()
+            logs = []
+            if time.monotonic() >= self.next_log_check:
+                self.next_log_check = time.monotonic() + LOG_CHECK_EVERY
+                logs = [w.log_file for w in self.watchers.values() if w.proc is not None]
+        # Outside the lock: compressing a full log takes a moment, and status requests must not wait
+        for log_file in logs:
+            try:
+                if vault_logs.rotate_if_needed(log_file, in_use=True):
+                    _log(f"Rotated {log_file.name}")
+            except OSError as e:
+                _log(f"Could not rotate {log_file.name}: {e}")
+
+    def _save_state(self, running=True):
+        state = {
+            "pid": os.getpid(),
+            "port": PORT,
+            "updated": time.time() if running else 0,
+            "wanted": [n for n, w in self.watchers.items() if w.wanted],
+            "children": {n: w.proc.pid for n, w in self.watchers.items() if w.proc is not None},
+        }
+        tmp = STATE_FILE.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, STATE_FILE)
+
+    def recover(self):
+        """Reap orphans of a previous supervisor and restart what it was running."""
+        try:
+            state = json.loads(STATE_FILE.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        for name, pid in state.get("children", {}).items():
+            w = self.watchers.get(name)
+            # Only kill a pid that still runs the same script — pids get reused
+            if w and w.command.split()[0] in _cmdline(pid).replace("\\", "/"):
+                try:
+                    os.kill(pid, 15)
+                    _log(f"Reaped orphaned {name} (pid {pid})")
+                except OSError:
+                    pass
+        for name in state.get("wanted", []):
+            if name not in self.watchers:
+                continue
+            if any(self.watchers[n].wanted for n in overlaps(name)):
+                _log(f"Not restarting {name}: it overlaps a watcher already started")
+                continue
+            self.watchers[name].start()
+
+    def shutdown(self):
+        with self.lock:
+            for w in self.watchers.values():
+                if w.proc is not None:
+                    wanted = w.wanted
+                    w.stop()
+                    w.wanted = wanted  # remembered for the next supervisor
+            self._save_state(running=False)
+
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline(65536) or b"{}")
+            reply = self.server.supervisor.handle(request)
+        except ValueError as e:
+            reply = {"ok": False, "error": f"bad request: {e}"}
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+class _ControlServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def serve():
+    """Run the supervisor until Ctrl+C or a shutdown request."""
+    if request("ping") is not None:
+        print(f"[INFO] A supervisor is already running on {HOST}:{PORT}.")
+        return
+
+    sup = Supervisor()
+    try:
+        server = _ControlServer((HOST, PORT), _ControlHandler)
+    except OSError as e:
+        print(f"[ERROR] Cannot listen on {HOST}:{PORT}: {e}")
+        sys.exit(1)
+    server.supervisor = sup
+    threading.Thread(target=server.serve_forever, daemon=True, name="supervisor_control").start()
+
+    sup.recover()
+    _log(f"Supervisor listening on {HOST}:{PORT} (pid {os.getpid()})")
+    try:
+        while not sup.stopping.wait(TICK):
+            sup.tick()
+    except KeyboardInterrupt:
+        print("\n[STOP] Stopped by user.")
+    finally:
+        server.shutdown()
+        sup.shutdown()
+        _log("Supervisor stopped.")
+
+
+# ──────────────────────────────────────────────
+# CLIENT SIDE (used by the dashboard)
+# ──────────────────────────────────────────────
+def request(cmd, name=None, timeout=REQUEST_TIMEOUT):
+    """Send one command to the supervisor. Returns its reply, or None if none is running."""
+    payload = {"cmd": cmd}
+    if name is not None:
+        payload["name"] = name
+    try:
+        with socket.create_connection((HOST, PORT), timeout=timeout) as sock:
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            data = b""
+            while not data.endswith(b"\n"):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+        return json.loads(data)
+    except (OSError, ValueError):
+        return None
+
+
+def is_alive():
+    """Cheap check via the state file — no socket round trip."""
+    try:
+        state = json.loads(STATE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return time.time() - state.get("updated", 0) <= STATE_MAX_AGE
+
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        serve()
+        return
+
+    cmd, name = args[0], " ".join(args[1:]) or None
+    reply = request(cmd, name)
+    if reply is None:
+        print(f"[ERROR] No supervisor on {HOST}:{PORT}. Start one with: python supervisor.py")
+        sys.exit(1)
+    if not reply.get("ok"):
+        print(f"[ERROR] {reply.get('error')}")
+        sys.exit(1)
+    if cmd != "status":
+        print("[OK]")
+        return
+    for n, s in reply["watchers"].items():
+        if s["running"]:
+            cpu = f"{s['cpu']:.0f}%" if s["cpu"] is not None else "?"
+            rss = f"{s['rss'] / 1048576:.0f} MB" if s["rss"] is not None else "?"
+            state = f"RUNNING  pid {s['pid']}  cpu {cpu}  rss {rss}  up {s['uptime']}s"
+        elif s["restart_in"] is not None:
+            state = f"CRASHED  exit {s['last_exit']}  restart in {s['restart_in']}s"
+        else:
+            state = "STOPPED"
+        print(f"  {n:<20} {state}  restarts {s['restarts']}")
+
+
+if __name__ == "__main__":
+    main()
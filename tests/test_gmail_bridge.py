@@ -0,0 +1,214 @@
+"""
+gmail_bridge --sync against a fake Gmail service object (users().history(),
+messages(), getProfile() and batch requests): checkpoint advance, the full
+resync on a missing or expired historyId, and the checkpoint kept when a
+message could not be fetched.
+
+Run: python -m pytest -q tests   (skipped without the Google client libraries)
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "watchers"))
+
+try:
+    import httplib2
+    from googleapiclient.errors import HttpError
+
+    import gmail_bridge
+except ImportError:  # optional — the Gmail bridge needs google-api-python-client
+    gmail_bridge = None
+
+
+def http_error(status):
+    return HttpError(httplib2.Response({"status": status}), b"{}")
+
+
+class FakeRequest:
+    def __init__(self, fn):
+        self.fn = fn
+
+    def execute(self):
+        return self.fn()
+
+
+class FakeBatch:
+    def __init__(self, callback):
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, request.execute(), None)
+            except HttpError as e:
+                self.callback(request_id, None, e)
+
+
+class FakeGmail:
+    """A mailbox: messages added one by one, each bumping the historyId."""
+
+    def __init__(self):
+        self.mailbox = {}  # id -> (historyId it was added at, labels)
+        self.history_id = 100
+        self.expired_before = 0  # startHistoryIds below this answer 404
+        self.broken = set()  # ids whose messages.get answers 500
+        self.deleted = set()  # ids still in the history whose messages.get answers 404
+        self.gets = []
+
+    def add(self, msg_id, unread=True):
+        self.history_id += 1
+        self.mailbox[msg_id] = (self.history_id, ["INBOX", "UNREAD"] if unread else ["INBOX"])
+
+    # -- resource tree --
+    def users(self):
+        return self
+
+    def getProfile(self, userId):
+        return FakeRequest(lambda: {"historyId": str(self.history_id)})
+
+    def history(self):
+        return FakeHistory(self)
+
+    def messages(self):
+        return FakeMessages(self)
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(callback)
+
+
+class FakeHistory:
+    def __init__(self, gmail):
+        self.gmail = gmail
+
+    def list(self, userId, startHistoryId, historyTypes, maxResults, pageToken=None):
+        def run():
+            start = int(startHistoryId)
+            if start < self.gmail.expired_before:
+                raise http_error(404)
+            records = [{"id": str(hid), "messagesAdded": [{"message": {"id": msg_id, "labelIds": labels}}]}
+                       for msg_id, (hid, labels) in self.gmail.mailbox.items() if hid > start]
+            offset = int(pageToken or 0)
+            resp = {"history": records[offset:offset + maxResults], "historyId": str(self.gmail.history_id)}
+            if offset + maxResults < len(records):
+                resp["nextPageToken"] = str(offset + maxResults)
+            return resp
+        return FakeRequest(run)
+
+
+class FakeMessages:
+    def __init__(self, gmail):
+        self.gmail = gmail
+
+    def list(self, userId, q, maxResults, pageToken=None):
+        def run():
+            unread = [{"id": msg_id} for msg_id, (_, labels) in self.gmail.mailbox.items() if "UNREAD" in labels]
+            offset = int(pageToken or 0)
+            resp = {"messages": unread[offset:offset + maxResults]}
+            if offset + maxResults < len(unread):
+                resp["nextPageToken"] = str(offset + maxResults)
+            return resp
+        return FakeRequest(run)
+
+    def get(self, userId, id, format, metadataHeaders):
+        def run():
+            self.gmail.gets.append(id)
+            if id in self.gmail.broken:
+                raise http_error(500)
+            if id in self.gmail.deleted:
+                raise http_error(404)
+            headers = [{"name": "Subject", "value": f"Subject {id}"}, {"name": "From", "value": "a@example.com"},
+                       {"name": "Date", "value": "Mon, 5 Oct 2026 09:00:00 +0000"}]
+            return {"id": id, "snippet": f"body of {id}", "payload": {"headers": headers}}
+        return FakeRequest(run)
+
+
+@unittest.skipIf(gmail_bridge is None, "google-api-python-client not installed")
+class HistorySyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.history_file = os.path.join(self.tmp.name, "history.json")
+        self.readings = os.path.join(self.tmp.name, "Readings")
+        self.gmail = FakeGmail()
+        patches = [mock.patch.object(gmail_bridge, "PAGE_SIZE", 2), mock.patch.object(gmail_bridge.time, "sleep")]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def sync(self):
+        return gmail_bridge.sync_emails(self.gmail, self.history_file, self.readings)
+
+    def saved(self):
+        return sorted(os.listdir(self.readings)) if os.path.isdir(self.readings) else []
+
+    def checkpoint(self):
+        return gmail_bridge.load_history_id(self.history_file)
+
+    def test_first_sync_is_a_full_resync(self):
+        for msg_id in ("m1", "m2", "m3"):
+            self.gmail.add(msg_id)
+        self.gmail.add("read", unread=False)
+        self.assertEqual(self.sync(), 3)
+        self.assertEqual(self.saved(), ["EMAIL_m1.md", "EMAIL_m2.md", "EMAIL_m3.md"])
+        self.assertEqual(self.checkpoint(), str(self.gmail.history_id))
+
+    def test_checkpoint_advances(self):
+        self.gmail.add("m1")
+        self.sync()
+        for msg_id in ("m2", "m3", "m4"):  # more than one history page
+            self.gmail.add(msg_id)
+        self.gmail.gets.clear()
+        self.assertEqual(self.sync(), 3)
+        self.assertEqual(sorted(self.gmail.gets), ["m2", "m3", "m4"])  # only the new mail is fetched
+        self.assertEqual(self.checkpoint(), str(self.gmail.history_id))
+        self.gmail.gets.clear()
+        self.assertEqual(self.sync(), 0)
+        self.assertEqual(self.gmail.gets, [])
+
+    def test_expired_checkpoint_resyncs(self):
+        self.gmail.add("m1")
+        self.sync()
+        self.gmail.add("m2")
+        self.gmail.expired_before = self.gmail.history_id + 1
+        self.assertEqual(self.sync(), 1)  # m1 is already saved — skipped
+        self.assertEqual(self.saved(), ["EMAIL_m1.md", "EMAIL_m2.md"])
+        self.assertEqual(self.checkpoint(), str(self.gmail.history_id))
+
+    def test_failed_fetch_keeps_checkpoint(self):
+        self.gmail.add("m1")
+        self.sync()
+        start = self.checkpoint()
+        self.gmail.add("m2")
+        self.gmail.add("m3")
+        self.gmail.broken.add("m3")
+        self.assertEqual(self.sync(), 1)
+        self.assertEqual(self.checkpoint(), start)  # m3 must be listed again
+        self.gmail.broken.clear()
+        self.assertEqual(self.sync(), 1)
+        self.assertEqual(self.saved(), ["EMAIL_m1.md", "EMAIL_m2.md", "EMAIL_m3.md"])
+        self.assertEqual(self.checkpoint(), str(self.gmail.history_id))
+
+    def test_deleted_message_does_not_hold_checkpoint(self):
+        self.gmail.add("m1")
+        self.sync()
+        self.gmail.add("m2")
+        self.gmail.add("gone")
+        self.gmail.deleted.add("gone")  # deleted between history.list and messages.get
+        self.assertEqual(self.sync(), 1)
+        self.assertEqual(self.checkpoint(), str(self.gmail.history_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
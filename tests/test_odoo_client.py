@@ -0,0 +1,152 @@
+"""
+odoo_client against a local stub JSON-RPC server (http.server on 127.0.0.1):
+login, keyset paging, the fresh-connection retry and error wrapping.
+
+Run: python -m pytest -q tests
+"""
+
+import json
+import socket
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import odoo_client  # noqa: E402
+
+UID = 7
+PASSWORD = "secret"
+RECORDS = [{"id": i, "name": f"INV/{i:04d}"} for i in range(1, 1201)]
+
+
+class StubOdoo(BaseHTTPRequestHandler):
+    """Answers common.authenticate and object.execute_kw(search_read / search_count)."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, like Odoo behind werkzeug
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.calls.append(body["params"])
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        reply = {"jsonrpc": "2.0", "id": body["id"]}
+        try:
+            reply["result"] = self.dispatch(**body["params"])
+        except ValueError as e:
+            reply["error"] = {"message": "Odoo Server Error", "data": {"message": str(e)}}
+        data = json.dumps(reply).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        if self.server.drop_after_reply:
+            # advertises keep-alive, then closes — the client's pooled connection goes stale
+            self.close_connection = True
+
+    def dispatch(self, service, method, args):
+        if service == "common" and method == "authenticate":
+            db, user, password, _ = args
+            return UID if password == PASSWORD else False
+        if service == "object" and method == "execute_kw":
+            db, uid, password, model, kw_method, kw_args, kwargs = args
+            if uid != UID or password != PASSWORD:
+                raise ValueError("Access Denied")
+            if kw_method in ("search_count", "search_read"):
+                rows = [r for r in RECORDS if all(self.matches(r, term) for term in kw_args[0])]
+                return len(rows) if kw_method == "search_count" else rows[:kwargs.get("limit") or None]
+        raise ValueError(f"unsupported call {service}.{method}")
+
+    @staticmethod
+    def matches(record, term):
+        field, op, value = term
+        if op == ">":
+            return record[field] > value
+        raise ValueError(f"unsupported operator {op}")
+
+
+class OdooClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubOdoo)
+        self.server.daemon_threads = True
+        self.server.calls, self.server.connections = [], 0
+        self.server.delay, self.server.drop_after_reply = 0, False
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def client(self, password=PASSWORD, **kwargs):
+        return odoo_client.OdooClient(self.url, db="stub", user="admin", password=password, **kwargs)
+
+    def test_login_once(self):
+        with self.client() as client:
+            self.assertEqual(client.uid, UID)
+            client.search_count("account.move", [])
+            client.search_count("account.move", [])
+        logins = [c for c in self.server.calls if c["method"] == "authenticate"]
+        self.assertEqual(len(logins), 1)
+
+    def test_bad_login(self):
+        with self.client(password="wrong") as client, self.assertRaises(odoo_client.OdooError):
+            client.uid
+
+    def test_paging(self):
+        with self.client(page_size=500) as client:
+            pages = list(client.search_read_pages("account.move", [], ["name"]))
+        self.assertEqual([len(p) for p in pages], [500, 500, 200])
+        self.assertEqual([r["id"] for p in pages for r in p], [r["id"] for r in RECORDS])
+        # keyset: every page asks for ids after the last one seen; a short page ends the scan
+        reads = [c["args"][5][0] for c in self.server.calls if c["args"][4:5] == ["search_read"]]
+        self.assertEqual(reads, [[["id", ">", 0]], [["id", ">", 500]], [["id", ">", 1000]]])
+
+    def test_keep_alive_reuses_connection(self):
+        with self.client() as client:
+            for _ in range(3):
+                client.search_count("account.move", [])
+        self.assertEqual(self.server.connections, 1)
+
+    def test_stale_connection_retried(self):
+        self.server.drop_after_reply = True
+        with self.client() as client:
+            for _ in range(3):
+                self.assertEqual(client.search_count("account.move", []), len(RECORDS))
+        self.assertEqual(self.server.connections, 4)  # login + one fresh connection per retried call
+
+    def test_server_error(self):
+        with self.client() as client, self.assertRaises(odoo_client.OdooError) as ctx:
+            client.execute_kw("account.move", "unlink", [[1]])
+        self.assertIn("unsupported", str(ctx.exception))
+
+    def test_refused_connection(self):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]  # free, and nothing listens once closed
+        client = odoo_client.OdooClient(f"http://127.0.0.1:{port}", db="stub", user="admin", password=PASSWORD)
+        with self.assertRaises(odoo_client.OdooError) as ctx:
+            client.uid
+        self.assertIsInstance(ctx.exception.__cause__, ConnectionRefusedError)
+
+    def test_timeout(self):
+        self.server.delay = 1.0
+        with self.client(timeout=0.2) as client, self.assertRaises(odoo_client.OdooError) as ctx:
+            client.uid
+        self.assertIsInstance(ctx.exception.__cause__, TimeoutError)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+"""
+Vault Events — Workflow Folder Change Feed
+Watches the workflow directories (WORKFLOW_DIRS in vault_sync.py) plus the
+root-level data files and bumps a per-source generation counter whenever
+something in that source changes. The dashboard compares generations to
+decide whether a rerun is needed at all, and which loaders must re-read.
+
+Uses watchdog (inotify / FSEvents / ReadDirectoryChangesW) when installed,
+otherwise falls back to a light os.scandir polling thread.
+"""
+
+import os
+import threading
+from pathlib import Path
+
+from vault_sync import WORKFLOW_DIRS
+
+try:
+    from watchdog.observers import Observer
+except ImportError:  # optional — polling fallback below
+    Observer = None
+
+BASE_DIR = Path(__file__).resolve().parent
+ROOT_KEY = "."
+# Only these root-level files count as vault data; everything else in the
+# root (index database, screenshots, .git) would otherwise cause rerun storms.
+ROOT_FILES = {
+    "CEO_Briefing_Feb_17.md",
+    "accounting_status.json",
+    "accounting_status.jsonl",
+    "social_updates.json",
+    "social_updates.jsonl",
+}
+EXTRA_DIRS = ["logs"]
+POLL_INTERVAL = 2.0  # seconds — only used without watchdog
+
+
+class _EventHandler:
+    """Minimal watchdog handler — Observer only ever calls dispatch()."""
+
+    def __init__(self, feed):
+        self.feed = feed
+
+    def dispatch(self, event):
+        for path in (getattr(event, "src_path", None), getattr(event, "dest_path", None)):
+            if path:
+                self.feed._touch_path(os.fsdecode(path))
+
+
+class VaultChangeFeed:
+    """Per-source generation counters for the vault, kept current in the background."""
+
+    def __init__(self, base_dir=BASE_DIR, dirs=None, poll_interval=POLL_INTERVAL):
+        self.base_dir = Path(base_dir)
+        self.keys = list(dirs if dirs is not None else WORKFLOW_DIRS + EXTRA_DIRS)
+        self.poll_interval = poll_interval
+        self._gens = {key: 0 for key in self.keys + [ROOT_KEY]}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._observer = None
+        self._thread = None
+        self._stop = threading.Event()
+        # Longest paths first so the deepest watched folder wins the lookup
+        self._roots = sorted(
+            ((key, str(self.base_dir / key)) for key in self.keys),
+            key=lambda kv: len(kv[1]),
+            reverse=True,
+        )
+
+    @property
+    def mode(self):
+        return "watchdog" if self._observer is not None else "polling"
+
+    # ── Public API ──────────────────────────────
+    def start(self):
+        """Start watching. Safe to call once per process."""
+        if Observer is not None:
+            observer = Observer()
+            handler = _EventHandler(self)
+            observer.schedule(handler, str(self.base_dir), recursive=False)
+            for key in self.keys:
+                path = self.base_dir / key
+                path.mkdir(parents=True, exist_ok=True)
+                # Nested workflow dirs (Needs_Action/Social) are covered by
+                # their parent's recursive watch
+                if not any(key.startswith(other + "/") for other in self.keys):
+                    observer.schedule(handler, str(path), recursive=True)
+            observer.daemon = True
+            observer.start()
+            self._observer = observer
+        else:
+            self._thread = threading.Thread(target=self._poll_loop, daemon=True, name="vault_events_poll")
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+
+    def generations(self):
+        """Snapshot of {source: generation}."""
+        with self._lock:
+            return dict(self._gens)
+
+    def changed_since(self, snapshot, keys=None):
+        """Return the set of sources whose generation moved since snapshot."""
+        current = self.generations()
+        keys = keys if keys is not None else current.keys()
+        return {key for key in keys if current.get(key) != snapshot.get(key)}
+
+    def wait_for_change(self, snapshot, timeout=None):
+        """Block until any generation differs from snapshot (or timeout)."""
+        with self._changed:
+            self._changed.wait_for(lambda: self._gens != snapshot, timeout=timeout)
+            return dict(self._gens)
+
+    # ── Internals ───────────────────────────────
+    def _bump(self, keys):
+        if not keys:
+            return
+        with self._changed:
+            for key in keys:
+                self._gens[key] += 1
+            self._changed.notify_all()
+
+    def _touch_path(self, path):
+        """Map a changed filesystem path to the source key(s) it belongs to."""
+        keys = set()
+        for key, root in self._roots:
+            if path == root or path.startswith(root + os.sep):
+                keys.add(key)
+                # Parent workflow dirs include their sub-folders (kanban)
+                parent = key.rsplit("/", 1)[0] if "/" in key else None
+                while parent:
+                    keys.add(parent)
+                    parent = parent.rsplit("/", 1)[0] if "/" in parent else None
+                break
+        else:
+            if os.path.dirname(path) == str(self.base_dir) and os.path.basename(path) in ROOT_FILES:
+                keys.add(ROOT_KEY)
+        self._bump(keys)
+
+    def _signature(self, key):
+        """Cheap fingerprint of one source: (name, mtime, size) of its entries."""
+        if key == ROOT_KEY:
+            entries = []
+            for name in sorted(ROOT_FILES):
+                try:
+                    st = os.stat(self.base_dir / name)
+                    entries.append((name, st.st_mtime_ns, st.st_size))
+                except OSError:
+                    pass
+            return hash(tuple(entries))
+        try:
+            with os.scandir(self.base_dir / key) as it:
+                entries = []
+                for entry in it:
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((entry.name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            return None
+        return hash(tuple(sorted(entries)))
+
+    def _poll_loop(self):
+        keys = self.keys + [ROOT_KEY]
+        last = {key: self._signature(key) for key in keys}
+        while not self._stop.wait(self.poll_interval):
+            changed = set()
+            for key in keys:
+                sig = self._signature(key)
+                if sig != last[key]:
+                    last[key] = sig
+                    changed.add(key)
+            # A change inside Needs_Action/Social also changes Needs_Action
+            for key in list(changed):
+                while "/" in key:
+                    key = key.rsplit("/", 1)[0]
+                    changed.add(key)
+            self._bump(changed & set(self._gens))
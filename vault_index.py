@@ -0,0 +1,127 @@
+"""
+Vault Index — Persistent Parsed-File Cache
+Keeps the parsed fields of vault markdown files in a local SQLite database
+keyed by path + mtime + size, so a dashboard refresh only re-reads files
+that actually changed and every other row comes straight from the index.
+"""
+
+import fnmatch
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+INDEX_FILE = BASE_DIR / ".vault_index.db"
+INDEX_VERSION = 3  # bump whenever a parser's output shape changes
+
+
+def _connect():
+    """Open the index database, resetting it if the schema version changed."""
+    conn = sqlite3.connect(str(INDEX_FILE), timeout=10)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+        conn.execute("DROP TABLE IF EXISTS records")
+        conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+    # WAL lets the dashboard read while an agent is writing
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS records (
+               kind     TEXT    NOT NULL,
+               root     TEXT    NOT NULL,
+               rel      TEXT    NOT NULL,
+               mtime_ns INTEGER NOT NULL,
+               size     INTEGER NOT NULL,
+               data     TEXT    NOT NULL,
+               PRIMARY KEY (kind, root, rel)
+           )"""
+    )
+    return conn
+
+
+def _scan(directory, pattern, recursive):
+    """Yield (relative posix path, os.stat_result) for files matching pattern."""
+    stack = [(str(directory), "")]
+    while stack:
+        path, prefix = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        if recursive:
+                            stack.append((entry.path, f"{prefix}{entry.name}/"))
+                        continue
+                    if not fnmatch.fnmatch(entry.name, pattern):
+                        continue
+                    try:
+                        yield prefix + entry.name, entry.stat()
+                    except OSError:
+                        continue  # file vanished between listing and stat
+        except OSError:
+            continue
+
+
+def _sort_key(rel):
+    """Top-level files first (by name), then sub-folder files — matches glob order."""
+    return ("/" in rel, rel)
+
+
+def load_records(directory, pattern, parser, kind, recursive=False):
+    """Return [(Path, data)] for files in directory matching pattern.
+
+    parser(path) -> dict is only called for files whose mtime or size changed
+    since the last call; everything else is served from the index. Rows for
+    files that disappeared are dropped.
+    """
+    directory = Path(directory)
+    if not directory.exists():
+        return []
+
+    root = str(directory.resolve())
+    conn = _connect()
+    try:
+        cached = {
+            rel: (mtime_ns, size, data)
+            for rel, mtime_ns, size, data in conn.execute(
+                "SELECT rel, mtime_ns, size, data FROM records WHERE kind = ? AND root = ?",
+                (kind, root),
+            )
+        }
+
+        rows = {}
+        changed = []
+        for rel, st in _scan(directory, pattern, recursive):
+            hit = cached.pop(rel, None)
+            if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+                rows[rel] = json.loads(hit[2])
+                continue
+            try:
+                data = parser(directory / rel)
+            except OSError:
+                continue  # moved by an agent mid-scan — picked up next refresh
+            rows[rel] = data
+            changed.append((kind, root, rel, st.st_mtime_ns, st.st_size, json.dumps(data)))
+
+        with conn:
+            if changed:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?)", changed
+                )
+            if cached:
+                conn.executemany(
+                    "DELETE FROM records WHERE kind = ? AND root = ? AND rel = ?",
+                    [(kind, root, rel) for rel in cached],
+                )
+    finally:
+        conn.close()
+
+    return [(directory / rel, rows[rel]) for rel in sorted(rows, key=_sort_key)]
+
+
+def clear():
+    """Drop every cached row (the next load re-parses all files)."""
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute("DELETE FROM records")
+    finally:
+        conn.close()
@@ -0,0 +1,130 @@
+"""
+Vault JSON — Streaming Ingestion + Parsed-File Cache
+Loads the exported data files (accounting_status.json, social_updates.json)
+without holding the raw text and the parsed tree in memory at once:
+  - <name>.jsonl (JSON Lines) is read one record per line. A line whose
+    "_list" names a dotted path ("invoices", "platforms.linkedin.messages")
+    is appended to that list; any other line is merged into the document.
+  - <name>.json larger than STREAM_BYTES is parsed incrementally with ijson
+    (event by event, in small chunks) when it is installed. That is slower
+    than json.load but skips the full copy of the text, so smaller files
+    (or no ijson) use json.load.
+
+Parsed documents are kept per path and reused until the file's mtime or
+size changes, so a polling agent or the dashboard never re-parses an
+unchanged export.
+"""
+
+import json
+import threading
+from pathlib import Path
+
+try:
+    import ijson
+except ImportError:  # optional — json.load below
+    ijson = None
+
+STREAM_BYTES = 32 * 1024 * 1024  # stream .json files above 32 MB
+LIST_KEY = "_list"  # JSON Lines: the list a line belongs to
+
+_cache = {}  # resolved path -> (mtime_ns, size, document)
+_lock = threading.Lock()
+
+
+def source_path(path):
+    """The file behind path: path itself, else its .jsonl sibling. None if neither exists."""
+    path = Path(path)
+    if path.exists():
+        return path
+    lines = path.with_suffix(".jsonl")
+    return lines if lines.exists() else None
+
+
+def _append(doc, dotted, record):
+    node = doc
+    *parents, leaf = dotted.split(".")
+    for key in parents:
+        node = node.setdefault(key, {})
+    node.setdefault(leaf, []).append(record)
+
+
+def _parse_lines(path):
+    doc = {}
+    keys = {}  # one str object per distinct key, shared by every record
+    with open(path, "r", encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path.name} line {n}: {e}") from None
+            if not isinstance(record, dict):
+                raise ValueError(f"{path.name} line {n}: expected a JSON object")
+            target = record.pop(LIST_KEY, None)
+            if target:
+                _append(doc, target, {keys.setdefault(k, k): v for k, v in record.items()})
+            else:
+                doc.update(record)
+    return doc
+
+
+def _parse_stream(path):
+    builder = ijson.ObjectBuilder()
+    keys = {}  # json.load shares repeated keys too — without this every record holds its own copies
+    with open(path, "rb") as f:
+        try:
+            # floats, not Decimal — the loaders feed pandas and json.dumps
+            for event, value in ijson.basic_parse(f, use_float=True):
+                if event == "map_key":
+                    value = keys.setdefault(value, value)
+                builder.event(event, value)
+        except ijson.JSONError as e:
+            raise ValueError(f"{path.name}: {e}") from None
+    return builder.value
+
+
+def parse(path):
+    """Parse one .json / .jsonl file (no caching). Raises ValueError on bad JSON."""
+    path = Path(path)
+    if path.suffix == ".jsonl":
+        return _parse_lines(path)
+    if ijson is not None and path.stat().st_size > STREAM_BYTES:
+        return _parse_stream(path)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load(path):
+    """Parsed document of path (or its .jsonl sibling), reused while the file
+    is unchanged; None if neither exists. The result is shared with later
+    callers — treat it as read-only."""
+    src = source_path(path)
+    if src is None:
+        return None
+    st = src.stat()
+    key = str(src.resolve())
+    with _lock:
+        hit = _cache.get(key)
+    if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        return hit[2]
+    doc = parse(src)
+    with _lock:
+        _cache[key] = (st.st_mtime_ns, st.st_size, doc)
+    return doc
+
+
+def stamp(path, doc=None):
+    """[file name, mtime_ns, size] of the file load(path) parsed doc from —
+    of the file as it is now when doc is not the cached document — or None
+    if neither file exists. Lets callers key derived results on the data."""
+    src = source_path(path)
+    if src is None:
+        return None
+    with _lock:
+        hit = _cache.get(str(src.resolve()))
+    if hit and doc is not None and hit[2] is doc:
+        return [src.name, hit[0], hit[1]]
+    st = src.stat()
+    return [src.name, st.st_mtime_ns, st.st_size]
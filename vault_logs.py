@@ -0,0 +1,121 @@
+"""
+Vault Logs — Bounded Tail Reads + Size-Based Rotation
+tail_lines() reads the last N lines of a log by seeking backwards from the
+end in fixed-size blocks, so the Agent Console costs O(N) however large the
+log has grown. append_line() rotates the log once it passes MAX_BYTES:
+the current file becomes <name>.1.gz (gzip), older archives shift up to
+<name>.<BACKUPS>.gz and the oldest is dropped. A log that a running
+process holds open (a watcher's stdout) is rotated with copy_truncate().
+"""
+
+import gzip
+import os
+import shutil
+from pathlib import Path
+
+MAX_BYTES = 10 * 1024 * 1024  # rotate once the live log passes 10 MB
+BACKUPS = 5  # compressed archives kept per log
+BLOCK_SIZE = 8192
+
+
+def tail_lines(path, n=50, block_size=BLOCK_SIZE):
+    """Last n lines of a text file, read from the end. [] if it does not exist."""
+    try:
+        f = open(path, "rb", buffering=0)  # raw reads: each seek reads one block, not a buffer
+    except OSError:
+        return []
+    with f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        blocks = []
+        newlines = 0
+        # n lines need n newlines before them (+1 for a trailing newline)
+        while pos > 0 and newlines <= n:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step)
+            newlines += block.count(b"\n")
+            blocks.append(block)
+    lines = b"".join(reversed(blocks)).decode("utf-8", errors="replace").splitlines()
+    if pos > 0:
+        lines = lines[1:]  # the first line is cut off mid-way
+    return lines[-n:] if n else []
+
+
+def archive_path(path, index):
+    path = Path(path)
+    return path.with_name(f"{path.name}.{index}.gz")
+
+
+def rotate(path, backups=BACKUPS):
+    """Compress the live log into <name>.1.gz and shift older archives up.
+    Returns the new archive path, or None if there was nothing to rotate."""
+    path = Path(path)
+    # Rename first: writers that open-per-append start a fresh file at once
+    pending = path.with_name(f".{path.name}.rotating")
+    try:
+        os.replace(path, pending)
+    except OSError:
+        return None
+
+    dest = _shift_archives(path, backups)
+    with open(pending, "rb") as src, gzip.open(dest, "wb") as out:
+        shutil.copyfileobj(src, out)
+    pending.unlink()
+    return dest
+
+
+def copy_truncate(path, backups=BACKUPS):
+    """Rotate a log another process keeps open: compress a copy into
+    <name>.1.gz, then truncate the live file in place. The writer must have
+    opened it in append mode, so it carries on at the new end; lines written
+    between the copy and the truncate are lost. Returns the archive path."""
+    path = Path(path)
+    try:
+        src = open(path, "r+b")
+    except OSError:
+        return None
+    with src:
+        dest = _shift_archives(path, backups)
+        with gzip.open(dest, "wb") as out:
+            shutil.copyfileobj(src, out)
+        src.truncate(0)
+    return dest
+
+
+def _shift_archives(path, backups):
+    """Drop the oldest archive and shift the rest up; returns the free <name>.1.gz."""
+    oldest = archive_path(path, backups)
+    if oldest.exists():
+        oldest.unlink()
+    for i in range(backups - 1, 0, -1):
+        src = archive_path(path, i)
+        if src.exists():
+            os.replace(src, archive_path(path, i + 1))
+    return archive_path(path, 1)
+
+
+def rotate_if_needed(path, max_bytes=MAX_BYTES, backups=BACKUPS, in_use=False):
+    """Rotate path when it is larger than max_bytes (one stat otherwise).
+    in_use: another process holds it open — copy and truncate it instead."""
+    try:
+        if os.path.getsize(path) <= max_bytes:
+            return None
+    except OSError:
+        return None
+    return copy_truncate(path, backups) if in_use else rotate(path, backups)
+
+
+def append_line(path, line, max_bytes=MAX_BYTES):
+    """Append one line to a log, rotating it first if it grew too large."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rotate_if_needed(path, max_bytes)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line if line.endswith("\n") else line + "\n")
+
+
+def archives(path):
+    """Existing compressed archives of a log, newest first."""
+    return [p for p in (archive_path(path, i) for i in range(1, BACKUPS + 1)) if p.exists()]
@@ -0,0 +1,123 @@
+"""
+Vault Record — Shared Markdown Metadata Parser
+Every vault file starts with the same header: a `# Title` line followed by
+`**Field:** value` lines, closed by a `---` rule or the first `## ` section.
+read_record() parses that header in a single pass with precompiled patterns
+and stops reading as soon as the metadata block (plus any requested
+sections) has been seen, instead of regex-scanning the whole body per field.
+
+Used by the dashboard, agent_brain, whatsapp_sender and linkedin_poster.
+"""
+
+import re
+from pathlib import Path
+
+TITLE_RE = re.compile(r"^#(?!#)\s*(.+?)\s*$")
+FIELD_RE = re.compile(r"^\s*(?:[-*]\s+)?\*\*([^*\n]+?):\*\*\s*(.*?)\s*$")
+SECTION_RE = re.compile(r"^##\s+(.+?)\s*$")
+RULE_RE = re.compile(r"^---\s*$")
+STEP_RE = re.compile(r"^\d+\.\s*(.+)", re.MULTILINE)
+
+
+class VaultRecord:
+    """Parsed header of one vault markdown file."""
+
+    __slots__ = ("path", "title", "fields", "sections")
+
+    def __init__(self, path, title=None, fields=None, sections=None):
+        self.path = Path(path)
+        self.title = title
+        self.fields = fields if fields is not None else {}
+        self.sections = sections if sections is not None else {}
+
+    def get(self, name, default=None):
+        """Value of a `**name:**` header field (first occurrence wins)."""
+        return self.fields.get(name, default)
+
+    def heading(self, *prefixes):
+        """Title with the first matching prefix removed; file stem if that leaves nothing."""
+        title = self.title or ""
+        for prefix in prefixes:
+            if title.startswith(prefix):
+                title = title[len(prefix):].strip()
+                break
+        return title or self.path.stem
+
+    def section(self, name, default=""):
+        """Body text of a `## name` section requested at read time."""
+        return self.sections.get(name, default)
+
+    def first_line(self, name, default=""):
+        """First non-empty line of a requested section."""
+        for line in self.sections.get(name, "").splitlines():
+            if line.strip():
+                return line.strip()
+        return default
+
+    def steps(self, name):
+        """Numbered list items (`1. ...`) inside a requested section."""
+        return STEP_RE.findall(self.sections.get(name, ""))
+
+    def __repr__(self):
+        return f"VaultRecord({self.path.name!r}, title={self.title!r}, fields={self.fields!r})"
+
+
+def read_record(path, sections=()):
+    """Parse the header of a vault markdown file.
+
+    sections: names of `## ` sections whose body should also be captured
+    (e.g. "Summary", "Message"). Reading stops once the header and all
+    requested sections are done — the rest of the file is never read.
+    """
+    wanted = set(sections)
+    title = None
+    fields = {}
+    captured = {}
+    current = None  # name of the section being captured
+    buf = []
+    in_header = True
+
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\n")
+
+            if current is not None:
+                if RULE_RE.match(line) or SECTION_RE.match(line):
+                    captured[current] = "\n".join(buf).strip()
+                    current, buf = None, []
+                    if not wanted - captured.keys():
+                        break
+                    # fall through — this line may open the next section
+                else:
+                    buf.append(line)
+                    continue
+
+            section = SECTION_RE.match(line)
+            if section:
+                in_header = False
+                name = section.group(1)
+                if name in wanted and name not in captured:
+                    current = name
+                elif not wanted - captured.keys():
+                    break
+                continue
+
+            if in_header:
+                if RULE_RE.match(line):
+                    in_header = False
+                    if not wanted:
+                        break
+                    continue
+                if title is None:
+                    m = TITLE_RE.match(line)
+                    if m:
+                        title = m.group(1)
+                        continue
+                m = FIELD_RE.match(line)
+                if m:
+                    fields.setdefault(m.group(1).strip(), m.group(2))
+
+    if current is not None:
+        captured[current] = "\n".join(buf).strip()
+
+    return VaultRecord(path, title, fields, captured)
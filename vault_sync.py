@@ -24,6 +24,21 @@ PROTECTED_FILES = {
     "whatsapp_sender.py",
     "linkedin_agent.py",
     "social_media_agent.py",
+    "vault_index.py",
+    "vault_events.py",
+    "vault_record.py",
+    "keyword_matcher.py",
+    "approval_queue.py",
+    "browser_pool.py",
+    "browser_steps.py",
+    "supervisor.py",
+    "scheduler.py",
+    "vault_logs.py",
+    "vault_json.py",
+    "odoo_client.py",
+    "odoo_store.py",
+    "accounting_analytics.py",
+    "receivables.py",
     "watchers/gmail_bridge.py",
     "watchers/desktop_watcher.py",
 }
@@ -36,6 +51,7 @@ WORKFLOW_DIRS = [
     "In_Progress",
     "Pending_Approval",
     "Approved",
+    "Dead_Letter",
     "Done",
     "Plans",
     "Drafts",
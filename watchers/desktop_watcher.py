@@ -1,21 +1,249 @@
+"""
+Desktop Watcher — Bronze Tier Watcher
+Reports files created, modified, deleted or moved anywhere under the watched
+folder (recursively) and appends them to Desktop_Log.md.
+
+Uses watchdog (inotify / FSEvents / ReadDirectoryChangesW) when installed,
+otherwise polls with os.scandir snapshots and set differences. Bursts of
+events are coalesced per path and written to the log in one batch.
+
+Usage:
+    python watchers/desktop_watcher.py            # watch ~/Desktop
+    python watchers/desktop_watcher.py <folder>   # watch another folder
+"""
+
 import os
+import sys
+import threading
 import time
 
+try:
+    from watchdog.observers import Observer
+except ImportError:  # optional — polling fallback below
+    Observer = None
+
+# --- Configuration ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 # Jis folder ko monitor karna hai (Desktop)
-path_to_watch = os.path.expanduser("~/Desktop")
+WATCH_DIR = os.path.expanduser("~/Desktop")
 # Obsidian file jahan update jayegi
-log_file = "Desktop_Log.md"
-
-print(f"Monitoring: {path_to_watch}")
-
-before = dict([(f, None) for f in os.listdir(path_to_watch)])
-while True:
-    time.sleep(5)
-    after = dict([(f, None) for f in os.listdir(path_to_watch)])
-    added = [f for f in after if not f in before]
-    if added:
-        with open(log_file, "a") as f:
-            for file in added:
-                f.write(f"\n- New file detected: {file} at {time.ctime()}")
-        print(f"Added: {', '.join(added)}")
-    before = after
\ No newline at end of file
+LOG_FILE = os.path.join(SCRIPT_DIR, "Desktop_Log.md")
+POLL_INTERVAL = 5  # seconds — only used without watchdog
+QUIET_PERIOD = 1.0  # seconds without new events before a batch is flushed
+MAX_DELAY = 10.0  # seconds — flush a busy batch at least this often
+
+CREATED, MODIFIED, DELETED, MOVED = "CREATED", "MODIFIED", "DELETED", "MOVED"
+
+
+# ──────────────────────────────────────────────
+# EVENT COALESCING + BATCHED LOG WRITES
+# ──────────────────────────────────────────────
+class EventBatcher:
+    """Collects events per path and appends them to the log in batches.
+
+    Repeated events for one path collapse into one line: create+modify is a
+    create, modify+delete is a delete, and a file created and removed
+    within the same batch is never logged at all.
+    """
+
+    def __init__(self, log_file=LOG_FILE):
+        self.log_file = log_file
+        self._pending = {}  # path -> [kind, dest]
+        self._lock = threading.Lock()
+        self._first = None  # monotonic time of the oldest pending event
+        self._last = None  # monotonic time of the newest pending event
+
+    def add(self, kind, path, dest=None):
+        now = time.monotonic()
+        with self._lock:
+            if kind == MOVED:
+                prev = self._pending.pop(path, None)
+                source = prev[1] if prev and prev[0] == MOVED else path  # A→B→C is one move A→C
+                if prev and prev[0] == CREATED:
+                    # Created then moved in one batch: just a create at the new path
+                    self._pending[dest] = [CREATED, None]
+                elif source == dest:
+                    # Moved away and back: the file is where it was, possibly edited meanwhile
+                    self._pending[dest] = [MODIFIED, None]
+                else:
+                    self._pending[dest] = [MOVED, source]
+            else:
+                prev = self._pending.get(path)
+                if prev is None:
+                    self._pending[path] = [kind, None]
+                elif kind == DELETED:
+                    if prev[0] == CREATED:
+                        del self._pending[path]
+                    elif prev[0] == MOVED:
+                        # Moved then deleted: the original path is what disappeared
+                        del self._pending[path]
+                        self._pending[prev[1]] = [DELETED, None]
+                    else:
+                        prev[0] = DELETED
+                elif kind == CREATED and prev[0] == DELETED:
+                    prev[0] = MODIFIED  # replaced in place (editor save-by-rename)
+                # CREATED/MOVED followed by MODIFIED keeps the original kind
+            if self._first is None:
+                self._first = now
+            self._last = now
+
+    def due(self):
+        """True when the pending batch has gone quiet or waited too long."""
+        with self._lock:
+            if self._first is None:
+                return False
+            now = time.monotonic()
+            return now - self._last >= QUIET_PERIOD or now - self._first >= MAX_DELAY
+
+    def flush(self):
+        """Append every pending event to the log in one write. Returns the count."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._first = self._last = None
+        if not pending:
+            return 0
+
+        stamp = time.ctime()
+        lines = []
+        for path, (kind, other) in sorted(pending.items()):
+            if kind == MOVED:
+                lines.append(f"\n- [{kind}] {_rel(other)} -> {_rel(path)} at {stamp}")
+            else:
+                lines.append(f"\n- [{kind}] {_rel(path)} at {stamp}")
+        with open(self.log_file, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+        print(f"[LOG] {len(lines)} change(s): " + ", ".join(_rel(p) for p in list(pending)[:5])
+              + (" ..." if len(pending) > 5 else ""))
+        return len(lines)
+
+
+def _rel(path):
+    try:
+        return os.path.relpath(path, WATCH_DIR)
+    except ValueError:  # different drive on Windows
+        return path
+
+
+# ──────────────────────────────────────────────
+# WATCHDOG BACKEND
+# ──────────────────────────────────────────────
+class _EventHandler:
+    """Minimal watchdog handler — Observer only ever calls dispatch()."""
+
+    KINDS = {"created": CREATED, "modified": MODIFIED, "deleted": DELETED, "moved": MOVED}
+
+    def __init__(self, batcher):
+        self.batcher = batcher
+
+    def dispatch(self, event):
+        kind = self.KINDS.get(event.event_type)
+        if kind is None:
+            return
+        # Directory "modified" just means its listing changed — the child event covers it
+        if event.is_directory and kind == MODIFIED:
+            return
+        src = os.fsdecode(event.src_path)
+        if _ignored(src):
+            return
+        if kind == MOVED:
+            self.batcher.add(kind, src, os.fsdecode(event.dest_path))
+        else:
+            self.batcher.add(kind, src)
+
+
+def _ignored(path):
+    return os.path.abspath(path) == os.path.abspath(LOG_FILE)
+
+
+# ──────────────────────────────────────────────
+# POLLING BACKEND (no watchdog)
+# ──────────────────────────────────────────────
+def snapshot(root):
+    """{path: (inode, mtime_ns, size)} for every file and folder under root."""
+    entries = {}
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        entries[entry.path] = (st.st_ino, 0, 0)  # dir mtime changes with every child
+                    elif not _ignored(entry.path):
+                        entries[entry.path] = (st.st_ino, st.st_mtime_ns, st.st_size)
+        except OSError:
+            continue
+    return entries
+
+
+def diff_snapshots(before, after, batcher):
+    """Feed the differences between two snapshots into the batcher."""
+    created = after.keys() - before.keys()
+    deleted = before.keys() - after.keys()
+
+    # Same inode, mtime and size under a new path = move/rename (a rename keeps
+    # all three; a recycled inode almost never does). Inode 0 means "unknown".
+    by_stat = {after[p]: p for p in created if after[p][0]}
+    for path in sorted(deleted):
+        dest = by_stat.pop(before[path], None) if before[path][0] else None
+        if dest is not None:
+            batcher.add(MOVED, path, dest)
+            created.discard(dest)
+        else:
+            batcher.add(DELETED, path)
+    for path in sorted(created):
+        batcher.add(CREATED, path)
+    for path in before.keys() & after.keys():
+        if before[path] != after[path]:
+            batcher.add(MODIFIED, path)
+
+
+# ──────────────────────────────────────────────
+# MAIN
+# ──────────────────────────────────────────────
+def main():
+    global WATCH_DIR
+    if len(sys.argv) > 1:
+        WATCH_DIR = os.path.abspath(os.path.expanduser(sys.argv[1]))
+
+    print(f"Monitoring: {WATCH_DIR} (recursive)")
+    print(f"Log:        {LOG_FILE}")
+
+    batcher = EventBatcher()
+    observer = None
+    if Observer is not None:
+        observer = Observer()
+        observer.schedule(_EventHandler(batcher), WATCH_DIR, recursive=True)
+        observer.daemon = True
+        observer.start()
+        print("[MODE] watchdog — event driven")
+        before = None
+    else:
+        print(f"[MODE] polling every {POLL_INTERVAL}s (pip install watchdog for event-driven mode)")
+        before = snapshot(WATCH_DIR)
+        next_poll = time.monotonic() + POLL_INTERVAL
+
+    try:
+        while True:
+            time.sleep(0.25)
+            if observer is None and time.monotonic() >= next_poll:
+                after = snapshot(WATCH_DIR)
+                diff_snapshots(before, after, batcher)
+                before = after
+                next_poll = time.monotonic() + POLL_INTERVAL
+            if batcher.due():
+                batcher.flush()
+    except KeyboardInterrupt:
+        print("\n[STOP] Stopped by user.")
+    finally:
+        if observer is not None:
+            observer.stop()
+        batcher.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,20 @@
 """
 Gmail Bridge — Silver Tier Watcher
 Fetches unread emails from Gmail and saves Markdown summaries into Readings/.
+With --sync, polls the mailbox history (history.list) from a saved historyId
+checkpoint so each cycle only touches mail that arrived since the last one.
+With --accounts, one process polls every mailbox listed in watchers/accounts.json
+on a shared thread pool, writing each account's mail to Readings/<account>/.
 """
 
+import heapq
+import json
 import os
+import re
 import sys
 import time
 import webbrowser
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from email.utils import parsedate_to_datetime
 
@@ -14,6 +22,7 @@ from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 
 # --- Configuration ---
 SCOPES = ["https://www.googleapis.com/auth/gmail.readonly"]
@@ -22,28 +31,35 @@ VAULT_DIR = os.path.dirname(SCRIPT_DIR)
 READINGS_DIR = os.path.join(VAULT_DIR, "Readings")
 CREDENTIALS_FILE = os.path.join(SCRIPT_DIR, "credentials.json")
 TOKEN_FILE = os.path.join(SCRIPT_DIR, "token.json")
+HISTORY_FILE = os.path.join(SCRIPT_DIR, "history.json")  # --sync checkpoint
+ACCOUNTS_FILE = os.path.join(SCRIPT_DIR, "accounts.json")  # --accounts config
+ACCOUNTS_STATE_DIR = os.path.join(SCRIPT_DIR, "accounts")  # per-account token + checkpoint
 MAX_EMAILS = 10
 POLL_INTERVAL = 120  # seconds
+BATCH_SIZE = 50  # Gmail recommends at most 50 calls per batch request
+PAGE_SIZE = 500  # max page size for messages.list / history.list
+MAX_WORKERS = 8  # concurrent mailbox polls in --accounts mode
+MAX_BACKOFF = 1800  # seconds — ceiling for a failing account's retry delay
 
 
-def authenticate():
+def authenticate(token_file=TOKEN_FILE, credentials_file=CREDENTIALS_FILE):
     """Authenticate with Gmail API using OAuth2."""
     creds = None
 
-    if os.path.exists(TOKEN_FILE):
-        creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
+    if os.path.exists(token_file):
+        creds = Credentials.from_authorized_user_file(token_file, SCOPES)
 
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
             print("[AUTH] Refreshing expired token...")
             creds.refresh(Request())
         else:
-            if not os.path.exists(CREDENTIALS_FILE):
-                print(f"[ERROR] credentials.json not found at {CREDENTIALS_FILE}")
+            if not os.path.exists(credentials_file):
+                print(f"[ERROR] credentials.json not found at {credentials_file}")
                 print("Download it from Google Cloud Console and place it in watchers/")
                 sys.exit(1)
             print("[AUTH] Starting Google sign-in...")
-            flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_FILE, SCOPES)
+            flow = InstalledAppFlow.from_client_secrets_file(credentials_file, SCOPES)
             # Use fixed port so the redirect URI is predictable
             auth_url, _ = flow.authorization_url(prompt="consent")
             print()
@@ -58,7 +74,8 @@ def authenticate():
             webbrowser.open(auth_url)
             creds = flow.run_local_server(port=8090, open_browser=False)
 
-        with open(TOKEN_FILE, "w") as token:
+        os.makedirs(os.path.dirname(token_file), exist_ok=True)
+        with open(token_file, "w") as token:
             token.write(creds.to_json())
         print("[AUTH] Token saved.")
 
@@ -82,12 +99,12 @@ def format_date(date_str):
         return date_str
 
 
-def save_email_as_markdown(msg_id, subject, sender, date_str, snippet):
+def save_email_as_markdown(msg_id, subject, sender, date_str, snippet, readings_dir=READINGS_DIR):
     """Save a single email summary as a Markdown file in Readings/."""
-    os.makedirs(READINGS_DIR, exist_ok=True)
+    os.makedirs(readings_dir, exist_ok=True)
 
     filename = f"EMAIL_{msg_id}.md"
-    filepath = os.path.join(READINGS_DIR, filename)
+    filepath = os.path.join(readings_dir, filename)
 
     if os.path.exists(filepath):
         return False  # already processed
@@ -108,27 +125,58 @@ def save_email_as_markdown(msg_id, subject, sender, date_str, snippet):
     return True
 
 
-def fetch_unread_emails(service):
-    """Fetch latest unread emails and save as Markdown."""
-    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Checking for unread emails...")
+def fetch_message_metadata(service, msg_ids):
+    """Fetch Subject/From/Date metadata for many messages in batched HTTP calls.
+
+    One round-trip per BATCH_SIZE messages instead of one per message.
+    Gets that fail (often a rate limit inside the batch) are retried once.
+    Returns ({msg_id: message}, [msg_ids that still failed]).
+    """
+    results = {}
+    failed = {}  # msg_id -> exception of the last attempt
+
+    def on_response(request_id, response, exception):
+        if exception is not None:
+            # 404: deleted since it was listed — nothing left to fetch or retry
+            if str(getattr(getattr(exception, "resp", None), "status", None)) != "404":
+                failed[request_id] = exception
+            return
+        results[request_id] = response
+
+    todo = list(msg_ids)
+    for attempt in range(2):
+        for start in range(0, len(todo), BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=on_response)
+            for msg_id in todo[start:start + BATCH_SIZE]:
+                batch.add(
+                    service.users().messages().get(
+                        userId="me", id=msg_id, format="metadata",
+                        metadataHeaders=["Subject", "From", "Date"]
+                    ),
+                    request_id=msg_id,
+                )
+            batch.execute()
+        if not failed or attempt:
+            break
+        todo = list(failed)
+        failed.clear()
+        time.sleep(1)
 
-    results = service.users().messages().list(
-        userId="me", q="is:unread", maxResults=MAX_EMAILS
-    ).execute()
+    for msg_id, exception in failed.items():
+        print(f"  [WARN] Could not fetch {msg_id}: {exception}")
+    return results, list(failed)
 
-    messages = results.get("messages", [])
 
-    if not messages:
-        print("  No unread emails found.")
-        return 0
+def save_messages(service, msg_ids, readings_dir=READINGS_DIR):
+    """Fetch metadata for msg_ids (batched) and save each as Markdown.
+    Returns (new files written, ids whose metadata could not be fetched)."""
+    metadata, failed = fetch_message_metadata(service, msg_ids)
 
     saved_count = 0
-    for msg_info in messages:
-        msg_id = msg_info["id"]
-        msg = service.users().messages().get(
-            userId="me", id=msg_id, format="metadata",
-            metadataHeaders=["Subject", "From", "Date"]
-        ).execute()
+    for msg_id in msg_ids:
+        msg = metadata.get(msg_id)
+        if msg is None:
+            continue
 
         headers = msg.get("payload", {}).get("headers", [])
         subject = extract_header(headers, "Subject")
@@ -136,16 +184,253 @@ def fetch_unread_emails(service):
         date_str = extract_header(headers, "Date")
         snippet = msg.get("snippet", "")
 
-        if save_email_as_markdown(msg_id, subject, sender, date_str, snippet):
+        if save_email_as_markdown(msg_id, subject, sender, date_str, snippet, readings_dir):
             print(f"  Saved: {subject[:60]}")
             saved_count += 1
         else:
             print(f"  Skipped (already exists): {subject[:60]}")
 
+    return saved_count, failed
+
+
+def fetch_unread_emails(service, readings_dir=READINGS_DIR, max_emails=MAX_EMAILS, query="is:unread"):
+    """Fetch the latest max_emails messages matching query (Gmail search
+    syntax, e.g. "is:unread label:sales") and save them as Markdown."""
+    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Checking for unread emails...")
+
+    results = service.users().messages().list(
+        userId="me", q=query, maxResults=max_emails
+    ).execute()
+
+    messages = results.get("messages", [])
+
+    if not messages:
+        print("  No unread emails found.")
+        return 0
+
+    saved_count, _ = save_messages(service, [m["id"] for m in messages], readings_dir)
     print(f"  Total new: {saved_count} / {len(messages)} unread")
     return saved_count
 
 
+# ──────────────────────────────────────────────
+# HISTORY SYNC (--sync)
+# ──────────────────────────────────────────────
+def load_history_id(history_file=HISTORY_FILE):
+    """Return the saved historyId checkpoint, or None."""
+    try:
+        with open(history_file, "r", encoding="utf-8") as f:
+            return json.load(f).get("historyId")
+    except (OSError, ValueError):
+        return None
+
+
+def save_history_id(history_id, history_file=HISTORY_FILE):
+    """Persist the historyId checkpoint atomically."""
+    tmp = history_file + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"historyId": str(history_id), "updated": datetime.now().isoformat()}, f)
+    os.replace(tmp, history_file)
+
+
+def list_all_unread(service):
+    """Page through every unread message id (used for a full resync)."""
+    ids = []
+    page_token = None
+    while True:
+        kwargs = {"userId": "me", "q": "is:unread", "maxResults": PAGE_SIZE}
+        if page_token:
+            kwargs["pageToken"] = page_token
+        resp = service.users().messages().list(**kwargs).execute()
+        ids += [m["id"] for m in resp.get("messages", [])]
+        page_token = resp.get("nextPageToken")
+        if not page_token:
+            return ids
+
+
+def list_history_additions(service, start_history_id):
+    """Return (unread message ids added since start_history_id, newest historyId).
+    Pages through the whole history; raises HttpError 404 if the id expired."""
+    ids = []
+    seen = set()
+    latest = start_history_id
+    page_token = None
+    while True:
+        kwargs = {
+            "userId": "me",
+            "startHistoryId": start_history_id,
+            "historyTypes": ["messageAdded"],
+            "maxResults": PAGE_SIZE,
+        }
+        if page_token:
+            kwargs["pageToken"] = page_token
+        resp = service.users().history().list(**kwargs).execute()
+        for record in resp.get("history", []):
+            for added in record.get("messagesAdded", []):
+                msg = added.get("message", {})
+                msg_id = msg.get("id")
+                labels = msg.get("labelIds", [])
+                if msg_id and msg_id not in seen and "UNREAD" in labels and "DRAFT" not in labels:
+                    seen.add(msg_id)
+                    ids.append(msg_id)
+        latest = resp.get("historyId", latest)
+        page_token = resp.get("nextPageToken")
+        if not page_token:
+            return ids, latest
+
+
+def _history_expired(err):
+    """Gmail answers 404 when startHistoryId is too old (about a week)."""
+    status = getattr(getattr(err, "resp", None), "status", None)
+    return str(status) == "404"
+
+
+def sync_emails(service, history_file=HISTORY_FILE, readings_dir=READINGS_DIR):
+    """Fetch only mail added since the saved historyId checkpoint.
+
+    First run, or an expired checkpoint, falls back to a full resync of all
+    unread mail. The checkpoint is only advanced after everything is saved:
+    if any message could not be fetched it stays put, so the next sync lists
+    those messages again (already saved ones are skipped).
+    """
+    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Syncing mailbox history...")
+
+    start = load_history_id(history_file)
+    ids = None
+    if start:
+        try:
+            ids, latest = list_history_additions(service, start)
+        except HttpError as e:
+            if not _history_expired(e):
+                raise
+            print("  [SYNC] History checkpoint expired — running full resync...")
+
+    if ids is None:
+        if not start:
+            print("  [SYNC] No checkpoint yet — running full resync...")
+        # Take the checkpoint before listing so nothing arriving mid-resync is missed
+        latest = service.users().getProfile(userId="me").execute()["historyId"]
+        ids = list_all_unread(service)
+
+    saved_count, failed = save_messages(service, ids, readings_dir) if ids else (0, [])
+    if failed:
+        print(f"  [SYNC] {len(failed)} message(s) not fetched — keeping checkpoint {start} for a retry")
+    else:
+        save_history_id(latest, history_file)
+    print(f"  Total new: {saved_count} / {len(ids)} added (historyId {latest})")
+    return saved_count
+
+
+# ──────────────────────────────────────────────
+# MULTI-ACCOUNT SCHEDULER (--accounts)
+# ──────────────────────────────────────────────
+# watchers/accounts.json:
+#   [
+#     {"name": "sales", "interval": 60, "sync": true},
+#     {"name": "support", "interval": 300, "credentials": "support_client.json",
+#      "sync": false, "query": "is:unread label:support"}
+#   ]
+# Each account keeps its OAuth token and historyId checkpoint under
+# watchers/accounts/<name>/ and writes mail to Readings/<name>/.
+class Account:
+    """One mailbox polled by the shared scheduler."""
+
+    def __init__(self, name, interval=POLL_INTERVAL, sync=True, credentials=None, max_emails=MAX_EMAILS,
+                 query="is:unread"):
+        if not re.fullmatch(r"[A-Za-z0-9_.-]+", name or ""):
+            raise ValueError(f"invalid account name {name!r} (use letters, digits, _ . -)")
+        self.name = name
+        self.interval = max(int(interval), 10)
+        self.sync = sync
+        self.max_emails = max_emails
+        self.query = query  # Gmail search for polling without sync
+        state_dir = os.path.join(ACCOUNTS_STATE_DIR, name)
+        self.token_file = os.path.join(state_dir, "token.json")
+        self.history_file = os.path.join(state_dir, "history.json")
+        self.credentials_file = os.path.join(SCRIPT_DIR, credentials) if credentials else CREDENTIALS_FILE
+        self.readings_dir = os.path.join(READINGS_DIR, name)
+        self.service = None
+        self.failures = 0
+        self.last_error = None
+
+    def poll(self):
+        """Run one poll cycle for this mailbox. Returns the number of new emails."""
+        if self.service is None:
+            self.service = authenticate(self.token_file, self.credentials_file)
+        if self.sync:
+            return sync_emails(self.service, self.history_file, self.readings_dir)
+        return fetch_unread_emails(self.service, self.readings_dir, self.max_emails, self.query)
+
+    def next_delay(self, ok):
+        """Seconds until the next poll: the interval, doubled per consecutive failure."""
+        if ok:
+            self.failures = 0
+            return self.interval
+        self.failures += 1
+        return min(self.interval * (2 ** self.failures), MAX_BACKOFF)
+
+
+def load_accounts(accounts_file=ACCOUNTS_FILE):
+    """Read the account list from accounts.json."""
+    with open(accounts_file, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    accounts = [Account(**entry) for entry in entries]
+    names = [a.name for a in accounts]
+    if len(set(names)) != len(names):
+        raise ValueError("duplicate account names in accounts.json")
+    return accounts
+
+
+def run_accounts(accounts, once=False):
+    """Poll many mailboxes from one process.
+
+    A heap of (due time, account) drives a small thread pool. An account is
+    only rescheduled after its previous poll finished, so a slow mailbox
+    never overlaps itself, and a failing one backs off without holding up
+    the rest.
+    """
+    if not accounts:
+        raise ValueError("no accounts to poll")
+    # Interactive sign-in has to happen one account at a time (fixed port)
+    for account in accounts:
+        print(f"[AUTH] {account.name}")
+        account.service = authenticate(account.token_file, account.credentials_file)
+
+    due = [(time.monotonic(), i) for i in range(len(accounts))]
+    heapq.heapify(due)
+    running = {}
+    remaining = len(accounts) if once else None
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(accounts)), thread_name_prefix="gmail") as pool:
+        while due or running:
+            now = time.monotonic()
+            while due and due[0][0] <= now:
+                _, i = heapq.heappop(due)
+                running[pool.submit(accounts[i].poll)] = i
+
+            timeout = max(0, due[0][0] - now) if due else None
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = running.pop(future)
+                account = accounts[i]
+                stamp = datetime.now().strftime("%H:%M:%S")
+                try:
+                    saved = future.result()
+                    account.last_error = None
+                    delay = account.next_delay(ok=True)
+                    print(f"[{stamp}] [{account.name}] {saved} new — next poll in {delay}s")
+                except Exception as e:
+                    account.last_error = str(e)
+                    delay = account.next_delay(ok=False)
+                    print(f"[{stamp}] [{account.name}] [ERROR] {e} — backing off {delay}s")
+                if once:
+                    remaining -= 1
+                else:
+                    heapq.heappush(due, (time.monotonic() + delay, i))
+            if once and not remaining:
+                break
+
+
 def main():
     print("=" * 50)
     print("  Gmail Bridge — Silver Tier Watcher")
@@ -154,12 +439,27 @@ def main():
     print(f"Readings: {READINGS_DIR}")
     print()
 
+    if "--accounts" in sys.argv:
+        accounts = load_accounts()
+        if not accounts:
+            print(f"[ERROR] No accounts in {ACCOUNTS_FILE} — add at least one, or run without --accounts")
+            sys.exit(1)
+        print(f"[OK] {len(accounts)} account(s): {', '.join(a.name for a in accounts)}\n")
+        try:
+            run_accounts(accounts, once="--once" in sys.argv)
+        except KeyboardInterrupt:
+            print("\n[STOP] Stopped by user.")
+        return
+
     service = authenticate()
     print("[OK] Connected to Gmail API.\n")
 
+    # --sync: incremental history-based polling instead of "is:unread" top-N
+    poll = sync_emails if "--sync" in sys.argv else fetch_unread_emails
+
     # Check for --once flag
     if "--once" in sys.argv:
-        fetch_unread_emails(service)
+        poll(service)
         print("\nDone (single run).")
         return
 
@@ -167,7 +467,7 @@ def main():
     print(f"[LOOP] Polling every {POLL_INTERVAL}s. Press Ctrl+C to stop.\n")
     while True:
         try:
-            fetch_unread_emails(service)
+            poll(service)
         except KeyboardInterrupt:
             print("\n[STOP] Stopped by user.")
             break
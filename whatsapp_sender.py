@@ -1,28 +1,38 @@
 """
 WhatsApp Sender — Browser Automation
 Reads approved .md files from Approved/ and sends WhatsApp messages via WhatsApp Web.
+With --daemon, keeps one logged-in WhatsApp Web page open and sends Approved/WA_*.md
+files as soon as they appear, instead of starting a browser per run.
+Approved/ files are claimed through approval_queue, so any number of senders
+can run at once without sending a message twice.
 """
 
 import os
-import re
 import sys
 import io
+import json
 import shutil
-import subprocess
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
 
+import approval_queue
+import browser_steps
+from vault_record import read_record
+
 # Force UTF-8 stdout/stderr on Windows to handle emojis in message content
-if sys.stdout and hasattr(sys.stdout, "buffer"):
+# (skipped when already UTF-8, e.g. when imported by browser_pool: re-wrapping
+# would close the previous wrapper's buffer)
+if sys.stdout and hasattr(sys.stdout, "buffer") and (sys.stdout.encoding or "").lower() != "utf-8":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
-if sys.stderr and hasattr(sys.stderr, "buffer"):
+if sys.stderr and hasattr(sys.stderr, "buffer") and (sys.stderr.encoding or "").lower() != "utf-8":
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
 
 try:
     from playwright.sync_api import sync_playwright, TimeoutError as PwTimeout
-except ImportError:
-    print("[ERROR] playwright not installed. Run: pip install playwright && playwright install chromium")
-    sys.exit(1)
+except ImportError:  # still importable for daemon_status() (the dashboard)
+    sync_playwright = PwTimeout = None
 
 # ──────────────────────────────────────────────
 # PATHS
@@ -30,40 +40,76 @@ except ImportError:
 BASE_DIR = Path(__file__).resolve().parent
 APPROVED_DIR = BASE_DIR / "Approved"
 DONE_DIR = BASE_DIR / "Done"
-PROFILE_DIR = BASE_DIR / ".playwright_profile"
+PROFILE_DIR = browser_steps.PROFILE_DIR
+DAEMON_FILE = BASE_DIR / ".whatsapp_daemon.json"  # heartbeat read by app.py
 
 APPROVED_DIR.mkdir(exist_ok=True)
 DONE_DIR.mkdir(exist_ok=True)
-PROFILE_DIR.mkdir(exist_ok=True)
+
+WA_URL = "https://web.whatsapp.com/"
+CHAT_LIST_READY = (
+    'div[contenteditable="true"][data-tab="3"], '
+    'div[title="Search input textbox"], '
+    'div[aria-label="Search input textbox"], '
+    '[data-testid="chat-list-search"]'
+)
+SEARCH_BOX = (
+    'div[contenteditable="true"][data-tab="3"], '
+    'div[title="Search input textbox"], '
+    'div[aria-label="Search input textbox"]'
+)
+MSG_BOX = (
+    'div[contenteditable="true"][data-tab="10"], '
+    'div[title="Type a message"], '
+    'footer div[contenteditable="true"]'
+)
+# Outgoing message bubble + the tick icons WhatsApp shows once the server has it
+OUT_BUBBLE = "div.message-out"
+SENT_TICK = 'span[data-icon="msg-check"], span[data-icon="msg-dblcheck"], span[data-icon="msg-dblcheck-ack"]'
+
+# DOM conditions for send_on_page() (shared with browser_pool's async sender)
+COMPOSE_FOCUSED_JS = (
+    "() => document.activeElement && document.activeElement.isContentEditable"
+    " && !!document.activeElement.closest('footer')"
+)
+COMPOSE_HAS_TEXT_JS = "() => (document.activeElement.textContent || '').trim().length > 0"
+NEW_BUBBLE_SENT_JS = """([sel, tick, n]) => {
+    const out = document.querySelectorAll(sel);
+    return out.length > n && !!out[out.length - 1].querySelector(tick);
+}"""
+
+# Ceilings (ms) for each condition-based wait in send_on_page(). Steps normally
+# finish as soon as the condition holds; override with e.g. WA_WAIT_DELIVER_MS=30000.
+WAIT_MS = {
+    "search": 15000,   # contact appears in search results
+    "chat": 15000,     # chat opens and compose box is focused
+    "compose": 5000,   # typed text shows up in the compose box
+    "deliver": 20000,  # new outgoing bubble shows a sent/delivered tick
+}
+for _step in WAIT_MS:
+    _env = os.environ.get(f"WA_WAIT_{_step.upper()}_MS")
+    if _env and _env.isdigit():
+        WAIT_MS[_step] = int(_env)
+
+DAEMON_POLL = 2  # seconds between Approved/ scans in --daemon mode
+HEARTBEAT_MAX_AGE = 30  # seconds — older heartbeat means the daemon is gone
+HEARTBEAT_EVERY = 10  # seconds between heartbeat writes, whatever the daemon is doing
 
 
 # ──────────────────────────────────────────────
 # HELPERS
 # ──────────────────────────────────────────────
-def close_chrome():
-    """Kill any running Chrome/Chromium instances to avoid profile lock conflicts."""
-    import time as _t
-    killed = False
-    try:
-        if sys.platform == "win32":
-            for proc_name in ["chrome.exe", "chromium.exe"]:
-                result = subprocess.run(
-                    ["taskkill", "/F", "/IM", proc_name],
-                    capture_output=True, text=True,
-                )
-                if result.returncode == 0:
-                    killed = True
-            if killed:
-                print("[INFO] Closed Chrome/Chromium to free profile lock...")
-                _t.sleep(3)  # wait for profile lock to release
-        else:
-            subprocess.run(["pkill", "-f", "chrome"], capture_output=True)
-    except Exception:
-        pass
+def playwright_ready():
+    """False (with an install hint) when playwright is missing."""
+    if sync_playwright is None:
+        print("[ERROR] playwright not installed. Run: pip install playwright && playwright install chromium")
+        return False
+    return True
 
 
 def get_browser_context(playwright):
     """Launch persistent Chromium context with saved profile."""
+    PROFILE_DIR.mkdir(exist_ok=True)
     # Remove stale lock files that prevent browser from opening
     lock_file = PROFILE_DIR / "lockfile"
     default_lock = PROFILE_DIR / "Default" / "LOCK"
@@ -98,14 +144,11 @@ def get_browser_context(playwright):
 
 def parse_message_file(filepath):
     """Extract To and Message from an approved .md file."""
-    text = filepath.read_text(encoding="utf-8")
-    to_match = re.search(r"\*\*To:\*\*\s*(.+)", text)
-    msg_match = re.search(r"## Message\s*\n+([\s\S]+?)(?:\n---|\Z)", text)
-    if not to_match:
+    rec = read_record(filepath, sections=("Message",))
+    contact = rec.get("To")
+    if not contact:
         return None, None
-    contact = to_match.group(1).strip()
-    message = msg_match.group(1).strip() if msg_match else ""
-    return contact, message
+    return contact, rec.section("Message")
 
 
 # ──────────────────────────────────────────────
@@ -115,126 +158,237 @@ def login_flow():
     """Open browser for QR code scan, then save session."""
     print("[INFO] Opening browser for WhatsApp Web login...")
     print("[INFO] Scan the QR code, then close the browser window.")
-    close_chrome()
 
-    with sync_playwright() as p:
-        context = get_browser_context(p)
-        page = context.pages[0] if context.pages else context.new_page()
-        page.goto("https://web.whatsapp.com/", timeout=60000, wait_until="domcontentloaded")
+    try:
+        with browser_steps.hold_profile("WhatsApp login"), sync_playwright() as p:
+            browser_steps.close_chrome(PROFILE_DIR)
+            context = get_browser_context(p)
+            page = context.pages[0] if context.pages else context.new_page()
+            page.goto(WA_URL, timeout=60000, wait_until="domcontentloaded")
+
+            try:
+                page.wait_for_event("close", timeout=300000)
+            except Exception:
+                pass
+
+            try:
+                context.close()
+            except Exception:
+                pass
+    except browser_steps.ProfileBusy as e:
+        print(f"[ERROR] {e} — try again when it is done.")
+        return
+
+    print("[OK] Session saved. You can now run without --login.")
+
 
+# ──────────────────────────────────────────────
+# SEND MESSAGE
+# ──────────────────────────────────────────────
+def open_whatsapp(p):
+    """Launch the browser, open WhatsApp Web and wait for the chat list.
+    Returns (context, page); raises if WhatsApp never becomes usable."""
+    context = get_browser_context(p)
+    page = context.pages[0] if context.pages else context.new_page()
+
+    # Navigate to WhatsApp Web — ERR_ABORTED on first try is normal (redirect)
+    # On failure: close entire context, wait, relaunch fresh
+    for attempt in range(3):
         try:
-            page.wait_for_event("close", timeout=300000)
+            print(f"[INFO] Navigating to WhatsApp Web (attempt {attempt+1}/3)...")
+            page.goto(WA_URL, timeout=300000, wait_until="domcontentloaded")
+            break
         except Exception:
-            pass
+            try:
+                context.close()
+            except Exception:
+                pass
+            if attempt == 2:
+                raise
+            print("[WARN] Navigation failed, relaunching browser in 5s...")
+            time.sleep(5)
+            # Relaunch fresh context + page
+            context = get_browser_context(p)
+            page = context.pages[0] if context.pages else context.new_page()
 
+    print("[INFO] Waiting for WhatsApp to load (up to 5 min for first-time session restore)...")
+    try:
+        page.wait_for_selector(CHAT_LIST_READY, timeout=300000)
+    except Exception:
         try:
             context.close()
         except Exception:
             pass
+        raise
+    page.locator(SEARCH_BOX).first.wait_for(state="visible", timeout=WAIT_MS["search"])
+    print("[OK] WhatsApp Web loaded.")
+    return context, page
+
+
+class StepTimer:
+    """Wall-clock time per send step, printed per message and summed per batch."""
+
+    def __init__(self):
+        self.steps = {}
+        self.totals = {}
+        self.count = 0
+        self._t = None
+
+    def start(self):
+        self.steps = {}
+        self._t = time.perf_counter()
+
+    def mark(self, step):
+        now = time.perf_counter()
+        self.steps[step] = now - self._t
+        self.totals[step] = self.totals.get(step, 0.0) + self.steps[step]
+        self._t = now
+
+    def report(self):
+        self.count += 1
+        parts = " · ".join(f"{k} {v:.1f}s" for k, v in self.steps.items())
+        print(f"[TIME] {parts} · total {sum(self.steps.values()):.1f}s")
+
+    def summary(self):
+        if not self.count:
+            return
+        parts = " · ".join(f"{k} {v / self.count:.1f}s" for k, v in self.totals.items())
+        print(f"[TIME] avg over {self.count} message(s): {parts}")
 
-    print("[OK] Session saved. You can now run without --login.")
+
+def contact_result_locator(page, contact):
+    """Search-result entry whose title is exactly contact. Prefix or highlighted
+    matches are not accepted — they can open a different chat."""
+    # json.dumps quotes and backslash-escapes the name, which is valid CSS
+    return page.locator(f"span[title={json.dumps(contact, ensure_ascii=False)}]")
+
+
+def no_contact_error(contact):
+    return RuntimeError(f"no chat titled exactly {contact!r} in the search results — not sent")
+
+
+def send_steps(page, contact, message, timer, log=print):
+    """Send one message on an already loaded WhatsApp Web page. Raises on failure.
+
+    Every step waits for a concrete DOM condition (bounded by WAIT_MS) instead
+    of sleeping a fixed time, so a send takes as long as WhatsApp needs.
+    A browser_steps generator — send_on_page() runs it on a sync page,
+    browser_pool on its async one.
+    """
+    timer.start()
+
+    # Search for contact
+    yield page.locator(SEARCH_BOX).first.click(timeout=WAIT_MS["search"])
+    # Clear previous search
+    yield page.keyboard.press("Control+a")
+    yield page.keyboard.press("Delete")
+    yield page.keyboard.type(contact, delay=50)
+
+    # Click contact result as soon as it is listed
+    contact_result = contact_result_locator(page, contact).first
+    try:
+        yield contact_result.wait_for(state="visible", timeout=WAIT_MS["search"])
+    except PwTimeout:
+        raise no_contact_error(contact) from None
+    timer.mark("search")
+    yield contact_result.click(timeout=WAIT_MS["search"])
+
+    # Chat is open once its compose box exists; focus it
+    msg_box = page.locator(MSG_BOX).first
+    yield msg_box.wait_for(state="visible", timeout=WAIT_MS["chat"])
+    yield msg_box.click(timeout=WAIT_MS["chat"])
+    yield page.wait_for_function(COMPOSE_FOCUSED_JS, timeout=WAIT_MS["chat"])
+    timer.mark("open chat")
+
+    for i, line in enumerate(message.split("\n")):
+        if i > 0:
+            yield page.keyboard.press("Shift+Enter")
+        yield page.keyboard.insert_text(line)
+    yield page.wait_for_function(COMPOSE_HAS_TEXT_JS, timeout=WAIT_MS["compose"])
+    timer.mark("type")
+
+    # Remember how many outgoing bubbles exist so we wait on the NEW one
+    before = yield page.locator(OUT_BUBBLE).count()
+    yield page.keyboard.press("Enter")
+    try:
+        yield page.wait_for_function(
+            NEW_BUBBLE_SENT_JS, arg=[OUT_BUBBLE, SENT_TICK, before], timeout=WAIT_MS["deliver"]
+        )
+    except PwTimeout as e:
+        # Enter was pressed and the compose box emptied — the message left our
+        # hands; don't fail (a retry would send a duplicate), just say so.
+        if (yield msg_box.inner_text(timeout=1000)).strip():
+            raise e
+        log(f"[WARN] No sent tick within {WAIT_MS['deliver'] / 1000:.0f}s — message left the compose box.")
+    timer.mark("deliver")
+    timer.report()
+
+
+def send_on_page(page, contact, message, timer=None):
+    """send_steps() on a sync page."""
+    browser_steps.run(send_steps(page, contact, message, timer or StepTimer()))
+
+
+def archive(job):
+    """Move a sent (claimed) message file to Done/."""
+    approval_queue.clear_claim(job)
+    dest = DONE_DIR / job.name
+    shutil.move(str(job.path), str(dest))
+    print(f"[OK] {job.name} moved to Done/")
+
+
+def claim_next():
+    """Claim the next due WA_*.md job from Approved/ with a valid To + Message.
+    Malformed files go straight to Dead_Letter/ — retrying them can't help.
+    Returns (job, contact, message) or None when the queue is empty."""
+    while True:
+        job = approval_queue.claim("WA_*.md", source=APPROVED_DIR)
+        if job is None:
+            return None
+        contact, message = parse_message_file(job.path)
+        if not contact:
+            approval_queue.fail(job, "no **To:** field found", retry=False)
+            continue
+        if not message:
+            approval_queue.fail(job, "no ## Message content found", retry=False)
+            continue
+        return job, contact, message
 
 
-# ──────────────────────────────────────────────
-# SEND MESSAGE
-# ──────────────────────────────────────────────
 def send_whatsapp(contact, message):
     """Launch browser and send a single WhatsApp message. Used for direct calls."""
     print(f"[INFO] Sending to '{contact}' via WhatsApp Web...")
 
-    with sync_playwright() as p:
-        try:
-            context = get_browser_context(p)
-        except Exception as e:
-            print(f"[ERROR] Could not launch browser: {e}")
-            return False
-
-        page = context.pages[0] if context.pages else context.new_page()
+    try:
+        with browser_steps.hold_profile("whatsapp_sender"), sync_playwright() as p:
+            browser_steps.close_chrome(PROFILE_DIR)
+            try:
+                context, page = open_whatsapp(p)
+            except Exception as e:
+                print(f"[ERROR] Could not open WhatsApp Web: {e}")
+                return False
 
-        try:
-            for attempt in range(3):
-                try:
-                    print(f"[INFO] Navigating to WhatsApp Web (attempt {attempt+1}/3)...")
-                    page.goto("https://web.whatsapp.com/", timeout=300000, wait_until="domcontentloaded")
-                    break
-                except Exception as nav_err:
-                    if attempt < 2:
-                        print(f"[WARN] Navigation failed, relaunching browser in 5s...")
-                        import time as _t
-                        try:
-                            context.close()
-                        except Exception:
-                            pass
-                        _t.sleep(5)
-                        try:
-                            context = get_browser_context(p)
-                            page = context.pages[0] if context.pages else context.new_page()
-                        except Exception:
-                            raise nav_err
-                    else:
-                        raise nav_err
-
-            print("[INFO] Waiting for WhatsApp to load (up to 5 min for first-time session restore)...")
-            page.wait_for_selector(
-                'div[contenteditable="true"][data-tab="3"], '
-                'div[title="Search input textbox"], '
-                'div[aria-label="Search input textbox"], '
-                '[data-testid="chat-list-search"]',
-                timeout=300000,
-            )
-            page.wait_for_timeout(2000)
-
-            search_box = page.locator(
-                'div[contenteditable="true"][data-tab="3"], '
-                'div[title="Search input textbox"], '
-                'div[aria-label="Search input textbox"]'
-            )
-            search_box.first.click(timeout=15000)
-            page.keyboard.press("Control+a")
-            page.keyboard.press("Delete")
-            page.keyboard.type(contact, delay=50)
-            page.wait_for_timeout(2500)
-
-            contact_result = page.locator(
-                f'span[title="{contact}"], span.matched-text'
-            )
-            contact_result.first.click(timeout=15000)
-            page.wait_for_timeout(1000)
-
-            msg_box = page.locator(
-                'div[contenteditable="true"][data-tab="10"], '
-                'div[title="Type a message"], '
-                'footer div[contenteditable="true"]'
-            )
-            msg_box.first.click(timeout=10000)
-
-            lines = message.split("\n")
-            for i, line in enumerate(lines):
-                if i > 0:
-                    page.keyboard.press("Shift+Enter")
-                page.keyboard.type(line, delay=10)
-
-            page.wait_for_timeout(500)
-            page.keyboard.press("Enter")
-            print("[INFO] Waiting 8s for message to deliver...")
-            page.wait_for_timeout(8000)
-            print(f"[OK] Message sent to {contact}!")
-            success = True
-
-        except PwTimeout as e:
-            print(f"[ERROR] Timeout: {e}")
-            print("[HINT] WhatsApp Web may have updated its UI. Check selectors.")
-            success = False
-        except Exception as e:
-            print(f"[ERROR] {e}")
-            success = False
-        finally:
             try:
-                context.close()
-            except Exception:
-                pass
+                send_on_page(page, contact, message)
+                print(f"[OK] Message sent to {contact}!")
+                success = True
+            except PwTimeout as e:
+                print(f"[ERROR] Timeout: {e}")
+                print("[HINT] WhatsApp Web may have updated its UI. Check selectors.")
+                success = False
+            except Exception as e:
+                print(f"[ERROR] {e}")
+                success = False
+            finally:
+                try:
+                    context.close()
+                except Exception:
+                    pass
 
-        return success
+            return success
+    except browser_steps.ProfileBusy as e:
+        print(f"[ERROR] {e}")
+        return False
 
 
 # ──────────────────────────────────────────────
@@ -242,7 +396,6 @@ def send_whatsapp(contact, message):
 # ──────────────────────────────────────────────
 def watch_loop():
     """Poll Approved/ every 60s and process new files."""
-    import time
     print("[INFO] Watch mode — polling Approved/ every 60s. Press Ctrl+C to stop.")
     while True:
         process_approved()
@@ -250,158 +403,217 @@ def watch_loop():
 
 
 # ──────────────────────────────────────────────
-# MAIN PROCESSING
+# DAEMON MODE (--daemon)
 # ──────────────────────────────────────────────
-def process_approved():
-    """Find all approved .md WA files and send — one browser session for all messages."""
-    files = sorted(APPROVED_DIR.glob("WA_*.md"))
-    if not files:
-        print("[INFO] No approved WA messages found.")
-        return
+def write_heartbeat(state, sent=0, failed=0):
+    """Record daemon liveness so the dashboard can skip spawning a sender.
+    Written by the Heartbeat thread below; call directly for one-off updates."""
+    tmp = DAEMON_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps({
+        "pid": os.getpid(),
+        "state": state,
+        "updated": time.time(),
+        "sent": sent,
+        "failed": failed,
+    }), encoding="utf-8")
+    os.replace(tmp, DAEMON_FILE)
+
+
+def daemon_status(max_age=HEARTBEAT_MAX_AGE):
+    """Return the daemon heartbeat dict if a daemon is alive, else None."""
+    try:
+        status = json.loads(DAEMON_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if time.time() - status.get("updated", 0) > max_age:
+        return None
+    return status
+
+
+class Heartbeat:
+    """Rewrites the heartbeat every HEARTBEAT_EVERY seconds from a thread, so
+    a five-minute WhatsApp load or a slow send never lets it go stale.
+    Set .state / .sent / .failed; each change is written right away."""
+
+    def __init__(self, state="starting"):
+        self.state, self.sent, self.failed = state, 0, 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="wa_heartbeat")
+
+    def __enter__(self):
+        self.beat()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        DAEMON_FILE.unlink(missing_ok=True)
+
+    def update(self, state, sent=None, failed=None):
+        self.state = state
+        self.sent = self.sent if sent is None else sent
+        self.failed = self.failed if failed is None else failed
+        self.beat()
+
+    def beat(self):
+        try:
+            write_heartbeat(self.state, self.sent, self.failed)
+        except OSError as e:
+            print(f"[WARN] Could not write heartbeat: {e}")
 
-    print(f"[INFO] Found {len(files)} approved message(s)\n")
+    def _run(self):
+        while not self._stop.wait(HEARTBEAT_EVERY):
+            self.beat()
+
+
+def _page_ready(page):
+    """True when the page is open and showing the chat list."""
+    try:
+        return not page.is_closed() and page.locator(SEARCH_BOX).first.is_visible()
+    except Exception:
+        return False
 
-    # Parse all files first, skip invalid
-    tasks = []
-    for f in files:
-        contact, message = parse_message_file(f)
-        if not contact:
-            print(f"  [SKIP] {f.name} — no **To:** field found")
-            continue
-        if not message:
-            print(f"  [SKIP] {f.name} — no ## Message content found")
-            continue
-        tasks.append((f, contact, message))
 
-    if not tasks:
-        print("[INFO] Nothing to send.")
+def run_daemon():
+    """Keep one WhatsApp Web page warm and send approved messages as they arrive."""
+    if daemon_status():
+        print("[INFO] A sender daemon is already running.")
         return
 
-    # Kill any stale Chrome to avoid profile lock
-    close_chrome()
+    timer = StepTimer()
 
-    # Open browser ONCE for all messages
-    sent = 0
-    with sync_playwright() as p:
-        try:
-            context = get_browser_context(p)
-        except Exception as e:
-            print(f"[ERROR] Could not launch browser: {e}")
-            return
+    # Heartbeat from the start: the dashboard must not spawn a sender while
+    # this one is closing Chrome and loading WhatsApp Web
+    try:
+        with Heartbeat("starting") as beat, browser_steps.hold_profile("WhatsApp daemon"), sync_playwright() as p:
+            browser_steps.close_chrome(PROFILE_DIR)
+            sent, failed = _daemon_loop(p, beat, timer)
+    except browser_steps.ProfileBusy as e:
+        print(f"[ERROR] {e} — daemon not started.")
+        return
 
-        page = context.pages[0] if context.pages else context.new_page()
+    timer.summary()
+    print(f"[DONE] Daemon sent {sent} message(s), {failed} failed.")
 
-        # Navigate to WhatsApp Web — ERR_ABORTED on first try is normal (redirect)
-        # On failure: close entire context, wait, relaunch fresh
-        loaded = False
-        for attempt in range(3):
-            try:
-                print(f"[INFO] Navigating to WhatsApp Web (attempt {attempt+1}/3)...")
-                page.goto("https://web.whatsapp.com/", timeout=300000, wait_until="domcontentloaded")
-                break
-            except Exception as nav_err:
-                if attempt < 2:
-                    print(f"[WARN] Navigation failed, relaunching browser in 5s...")
-                    import time as _t
+
+def _daemon_loop(p, beat, timer):
+    """Open WhatsApp Web and send approved messages until Ctrl+C. Returns (sent, failed)."""
+    sent = failed = 0
+    try:
+        context, page = open_whatsapp(p)
+    except Exception as e:
+        print(f"[ERROR] Could not open WhatsApp Web: {e}")
+        return sent, failed
+
+    print(f"[INFO] Daemon ready — watching Approved/WA_*.md every {DAEMON_POLL}s. Press Ctrl+C to stop.")
+    try:
+        while True:
+            beat.update("idle", sent, failed)
+            while True:
+                claimed = claim_next()
+                if claimed is None:
+                    break
+                job, contact, message = claimed
+
+                if not _page_ready(page):
+                    print("[WARN] WhatsApp page not ready — reopening...")
+                    beat.update("reopening")
                     try:
                         context.close()
                     except Exception:
                         pass
-                    _t.sleep(5)
-                    # Relaunch fresh context + page
                     try:
-                        context = get_browser_context(p)
-                        page = context.pages[0] if context.pages else context.new_page()
-                    except Exception as relaunch_err:
-                        print(f"[ERROR] Relaunch failed: {relaunch_err}")
-                        return
-                else:
-                    print(f"[ERROR] Could not reach WhatsApp Web: {nav_err}")
+                        context, page = open_whatsapp(p)
+                    except Exception as e:
+                        # transient (network, slow load) — nothing was sent, try again next tick
+                        print(f"[ERROR] Could not reopen WhatsApp Web: {e} — retrying in {DAEMON_POLL}s")
+                        approval_queue.release(job)
+                        break
+
+                print(f"\n--- Sending to: {contact} ({job.name}) ---")
+                beat.update("sending", sent, failed)
+                try:
+                    send_on_page(page, contact, message, timer)
+                    archive(job)
+                    sent += 1
+                except Exception as e:
+                    print(f"[ERROR] Failed for {contact}: {e}")
+                    approval_queue.fail(job, e)
+                    failed += 1
                     try:
-                        context.close()
+                        page.keyboard.press("Escape")  # close any half-open chat/search
                     except Exception:
                         pass
-                    return
-
-        print("[INFO] Waiting for WhatsApp to load (up to 5 min for first-time session restore)...")
+            time.sleep(DAEMON_POLL)
+    except KeyboardInterrupt:
+        print("\n[STOP] Daemon stopped by user.")
+    finally:
         try:
-            page.wait_for_selector(
-                'div[contenteditable="true"][data-tab="3"], '
-                'div[title="Search input textbox"], '
-                'div[aria-label="Search input textbox"], '
-                '[data-testid="chat-list-search"]',
-                timeout=300000,
-            )
-            page.wait_for_timeout(2000)
-            loaded = True
-            print("[OK] WhatsApp Web loaded.")
-        except Exception as e:
-            print(f"[ERROR] WhatsApp did not load in time: {e}")
             context.close()
-            return
+        except Exception:
+            pass
+    return sent, failed
 
-        # Send each message in the same session
-        for f, contact, message in tasks:
-            print(f"\n--- Sending to: {contact} ({f.name}) ---")
-            try:
-                # Search for contact
-                search_box = page.locator(
-                    'div[contenteditable="true"][data-tab="3"], '
-                    'div[title="Search input textbox"], '
-                    'div[aria-label="Search input textbox"]'
-                )
-                search_box.first.click(timeout=15000)
-                # Clear previous search
-                page.keyboard.press("Control+a")
-                page.keyboard.press("Delete")
-                page.keyboard.type(contact, delay=50)
-                page.wait_for_timeout(2500)
-
-                # Click contact result
-                contact_result = page.locator(
-                    f'span[title="{contact}"], '
-                    f'span[title^="{contact[:8]}"], '
-                    'span.matched-text'
-                )
-                contact_result.first.click(timeout=15000)
-                page.wait_for_timeout(1000)
-
-                # Type message
-                msg_box = page.locator(
-                    'div[contenteditable="true"][data-tab="10"], '
-                    'div[title="Type a message"], '
-                    'footer div[contenteditable="true"]'
-                )
-                msg_box.first.click(timeout=10000)
-
-                lines = message.split("\n")
-                for i, line in enumerate(lines):
-                    if i > 0:
-                        page.keyboard.press("Shift+Enter")
-                    page.keyboard.type(line, delay=10)
-
-                page.wait_for_timeout(500)
-                page.keyboard.press("Enter")
-                print(f"[INFO] Message sent — waiting 8s for delivery...")
-                page.wait_for_timeout(8000)
-
-                # Archive
-                dest = DONE_DIR / f.name
-                shutil.move(str(f), str(dest))
-                print(f"[OK] {f.name} moved to Done/")
-                sent += 1
 
-            except PwTimeout as e:
-                print(f"[ERROR] Timeout for {contact}: {e}")
+# ──────────────────────────────────────────────
+# MAIN PROCESSING
+# ──────────────────────────────────────────────
+def process_approved():
+    """Claim and send every due approved WA message — one browser session for all.
+    Jobs are claimed one at a time, so other senders can drain the queue in parallel."""
+    waiting = approval_queue.pending("WA_*.md", source=APPROVED_DIR)
+    if not waiting:
+        print("[INFO] No approved WA messages found.")
+        return
+
+    print(f"[INFO] Found {len(waiting)} approved message(s)\n")
+    if not playwright_ready():
+        return
+
+    # Open browser ONCE for all messages
+    sent = attempted = 0
+    timer = StepTimer()
+    try:
+        with browser_steps.hold_profile("whatsapp_sender"), sync_playwright() as p:
+            # Kill any Chromium left on the profile (it would hold the lock)
+            browser_steps.close_chrome(PROFILE_DIR)
+            try:
+                context, page = open_whatsapp(p)
             except Exception as e:
-                print(f"[ERROR] Failed for {contact}: {e}")
+                print(f"[ERROR] Could not reach WhatsApp Web: {e}")
+                return
 
-        try:
-            context.close()
-        except Exception:
-            pass
+            # Send each message in the same session
+            while True:
+                claimed = claim_next()
+                if claimed is None:
+                    break
+                job, contact, message = claimed
+                attempted += 1
+                print(f"\n--- Sending to: {contact} ({job.name}) ---")
+                try:
+                    send_on_page(page, contact, message, timer)
+                    archive(job)
+                    sent += 1
+
+                except PwTimeout as e:
+                    print(f"[ERROR] Timeout for {contact}: {e}")
+                    approval_queue.fail(job, e)
+                except Exception as e:
+                    print(f"[ERROR] Failed for {contact}: {e}")
+                    approval_queue.fail(job, e)
+
+            try:
+                context.close()
+            except Exception:
+                pass
+    except browser_steps.ProfileBusy as e:
+        print(f"[INFO] {e} — not sending now.")
+        return
 
-    print(f"\n[DONE] Sent {sent}/{len(tasks)} message(s).")
+    timer.summary()
+    print(f"\n[DONE] Sent {sent}/{attempted} message(s).")
 
 
 def main():
@@ -409,9 +621,16 @@ def main():
     print("  WhatsApp Sender — Browser Automation")
     print("=" * 50)
     print()
+    if not playwright_ready():
+        sys.exit(1)
 
     if "--login" in sys.argv:
         login_flow()
+    elif "--daemon" in sys.argv:
+        run_daemon()
+    elif daemon_status():
+        # The daemon owns the browser profile and sends Approved/ files itself
+        print(f"[INFO] Sender daemon is running (pid {daemon_status()['pid']}) — it will send Approved/ messages.")
     elif "--watch" in sys.argv:
         watch_loop()
     else: